@@ -0,0 +1,96 @@
+"""Job entry points for the heavy Algorithms page computations.
+
+Each function takes plain, picklable arguments, so it can run in the job
+pool (see jobs.py). It reports progress between stages, and those
+reports are also where a cancelled job stops. Outside the pool,
+`progress` does nothing and these are ordinary functions.
+"""
+import numpy as np
+
+from alignment import align
+from composition import genome_composition, simulated_bacterial_genome
+from jobs import progress
+from matrix_layouts import MATRIX_LAYOUTS, heatmap_image
+from recurrences import RECURRENCE_PRESETS, digit_summary, linear_term, ratio_convergence, term_log10
+from seqio import IndexedFasta
+from sorting import SORTING_ALGORITHMS, make_input, run_sort
+
+RECURRENCE_PLOT_POINTS = 400
+SIMULATED_GENOME_BASES = 5_000_000
+
+
+def sort_experiment(algorithm, size, distribution, seed):
+    """One sorting lab run on a generated input"""
+    values = make_input(size, distribution, seed)
+    progress(0.1, f"Sorting {size:,} elements")
+    return run_sort(algorithm, values)
+
+
+def compare_sorts(size, distribution, seed):
+    """Counters and wall time of every algorithm that accepts `size` elements, on the same input"""
+    values = make_input(size, distribution, seed)
+    names = [name for name, (_, limit) in SORTING_ALGORITHMS.items() if size <= limit]
+    rows = []
+    for done, name in enumerate(names):
+        progress(done / len(names), f"Running {name}")
+        result = run_sort(name, values)
+        rows.append({
+            "Algorithm": name,
+            "Comparisons": result.compares,
+            "Swaps": result.swaps,
+            "Writes": result.writes,
+            "Steps": result.steps,
+            "Wall Time (ms)": round(result.seconds * 1000, 2),
+        })
+    return rows
+
+
+def alignment(a, b, mode, matrix, gap_open, gap_extend, band):
+    """Pairwise alignment, reporting progress (and stopping if cancelled) every few hundred anti-diagonals"""
+    message = f"Aligning {len(a):,} × {len(b):,} residues"
+    progress(0.0, message)
+    return align(a, b, mode, matrix, gap_open, gap_extend, band,
+                 on_progress=lambda fraction: progress(0.95 * fraction, message))
+
+
+def layout_image(layout, size):
+    """Rank matrix of a layout rendered as one heatmap image"""
+    progress(0.1, f"Ordering {size * size:,} cells")
+    ranks = MATRIX_LAYOUTS[layout](size)
+    progress(0.6, "Rendering heatmap")
+    return heatmap_image(ranks)
+
+
+def recurrence_profile(recurrence, n):
+    """Sampled log10 terms, the last term's digits and ratio convergence for a recurrence"""
+    coefficients, initial = RECURRENCE_PRESETS[recurrence]
+    indices = np.unique(np.linspace(0, n - 1, min(n, RECURRENCE_PLOT_POINTS)).round().astype(np.int64))
+    progress(0.1, f"Sampling {len(indices):,} terms")
+    logs = term_log10(coefficients, initial, indices)
+    progress(0.5, f"Computing term #{n - 1:,} exactly")
+    digits, leading, trailing = digit_summary(linear_term(coefficients, initial, n - 1))
+    progress(0.9, "Checking ratio convergence")
+    ratios, errors, limit = ratio_convergence(coefficients, initial, min(n, 200))
+    return indices, logs, (digits, leading, trailing), ratios, errors, limit
+
+
+def _reported(chunks, total):
+    """Pass chunks through, reporting the share of `total` bases scanned before each one"""
+    scanned = 0
+    for chunk in chunks:
+        progress(scanned / total, f"Scanned {scanned:,} of {total:,} bases")
+        scanned += len(chunk)
+        yield chunk
+
+
+def composition_scan(path, mtime_ns, record, window, step, k):
+    """Genome composition of one record of a sequence file, or of the simulated genome when `path` is None.
+
+    `mtime_ns` is not used here; it is part of the job key, so an edited file is scanned again.
+    """
+    if path is None:
+        chunks = simulated_bacterial_genome(SIMULATED_GENOME_BASES)
+        return genome_composition(_reported(chunks, SIMULATED_GENOME_BASES), window, step, k)
+    with IndexedFasta(path) as reader:
+        total = max(1, reader.entries[record].length)
+        return genome_composition(_reported(reader.chunks(record), total), window, step, k)
@@ -0,0 +1,227 @@
+"""Pairwise sequence alignment (Needleman–Wunsch / Smith–Waterman) with affine gaps.
+
+The Gotoh recurrences are filled one anti-diagonal at a time: every cell on
+an anti-diagonal depends only on the two previous diagonals, so a whole
+diagonal is computed with a handful of NumPy operations. Only three
+diagonals of scores are kept in memory, plus one traceback byte per
+computed cell and a downsampled copy of the score matrix for plotting.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from substitution_matrices import encode, substitution_matrix
+
+NEG = -(1 << 28)
+PROGRESS_DIAGONALS = 512
+
+# Traceback byte layout: bits 0-1 say which state holds the best score of the
+# cell, bit 2 marks a vertical gap extension, bit 3 a horizontal one.
+FROM_MATCH, FROM_VGAP, FROM_HGAP, FROM_START = 0, 1, 2, 3
+VGAP_EXTENDED = 4
+HGAP_EXTENDED = 8
+
+ALIGNMENT_MODES = {"Global (Needleman–Wunsch)": "global", "Local (Smith–Waterman)": "local"}
+
+
+@dataclass
+class Alignment:
+    """Result of a pairwise alignment"""
+    mode: str
+    score: int
+    aligned_a: str
+    aligned_b: str
+    path: np.ndarray
+    identity: float
+    cells: int
+    seconds: float
+    preview: np.ndarray
+    preview_step: tuple
+
+
+def band_limits(d, n, m, band):
+    """Row range of anti-diagonal d (cells with i + j == d) inside the band, or None"""
+    lo, hi = max(0, d - m), min(n, d)
+    if band is not None:
+        ratio = 1 + m / max(n, 1)
+        lo = max(lo, int(np.ceil((d - band) / ratio)))
+        hi = min(hi, int(np.floor((d + band) / ratio)))
+    return (lo, hi) if lo <= hi else None
+
+
+def align(a, b, mode="global", matrix="BLOSUM62", gap_open=10, gap_extend=1, band=None, preview_size=300,
+          on_progress=None):
+    """Align sequences `a` (rows) and `b` (columns).
+
+    A gap of length L costs gap_open + (L - 1) * gap_extend. With `band`
+    set, only cells within that many columns of the main diagonal (scaled
+    for unequal lengths) are computed. `on_progress`, if given, is called
+    with the fraction of anti-diagonals done every PROGRESS_DIAGONALS.
+    """
+    if mode not in ("global", "local"):
+        raise ValueError(f"Unknown alignment mode: {mode}")
+    started = time.perf_counter()
+    alphabet, scores = substitution_matrix(matrix)
+    a_codes, b_codes = encode(a, alphabet), encode(b, alphabet)
+    n, m = len(a_codes), len(b_codes)
+    if band is not None:
+        band = max(int(band), 1)
+    local = mode == "local"
+
+    h = np.full((3, n + 1), NEG, dtype=np.int32)
+    vgap = np.full((3, n + 1), NEG, dtype=np.int32)
+    hgap = np.full((3, n + 1), NEG, dtype=np.int32)
+    written = [None, None, None]
+    trace = [None] * (n + m + 1)
+    trace_lo = np.zeros(n + m + 1, dtype=np.int64)
+
+    row_step = max(1, -(-(n + 1) // preview_size))
+    col_step = max(1, -(-(m + 1) // preview_size))
+    preview = np.full(((n // row_step) + 1, (m // col_step) + 1), np.nan, dtype=np.float32)
+
+    best_score, best_cell = 0, (0, 0)
+    cells = 0
+    h[0, 0] = 0
+    written[0] = (0, 0)
+    preview[0, 0] = 0
+
+    for d in range(1, n + m + 1):
+        if on_progress is not None and d % PROGRESS_DIAGONALS == 0:
+            on_progress(d / (n + m))
+        cur, prev, prev2 = d % 3, (d - 1) % 3, (d - 2) % 3
+        if written[cur] is not None:
+            lo_old, hi_old = written[cur]
+            h[cur, lo_old:hi_old + 1] = NEG
+            vgap[cur, lo_old:hi_old + 1] = NEG
+            hgap[cur, lo_old:hi_old + 1] = NEG
+            written[cur] = None
+        limits = band_limits(d, n, m, band)
+        if limits is None:
+            continue
+        lo, hi = limits
+
+        # Boundary cells: first row (i = 0) and first column (j = 0)
+        if lo == 0:
+            h[cur, 0] = 0 if local else -(gap_open + (d - 1) * gap_extend)
+            hgap[cur, 0] = NEG if local else h[cur, 0]
+        if hi == d:
+            h[cur, d] = 0 if local else -(gap_open + (d - 1) * gap_extend)
+            vgap[cur, d] = NEG if local else h[cur, d]
+        written[cur] = (lo, hi)
+
+        ilo, ihi = max(lo, 1), min(hi, d - 1)
+        if ilo <= ihi:
+            rows = np.arange(ilo, ihi + 1)
+            cols = d - rows
+            match = scores[a_codes[rows - 1], b_codes[cols - 1]] + h[prev2, ilo - 1:ihi]
+            v_open = h[prev, ilo - 1:ihi] - gap_open
+            v_ext = vgap[prev, ilo - 1:ihi] - gap_extend
+            h_open = h[prev, ilo:ihi + 1] - gap_open
+            h_ext = hgap[prev, ilo:ihi + 1] - gap_extend
+            v_best = np.maximum(np.maximum(v_open, v_ext), NEG)
+            h_best = np.maximum(np.maximum(h_open, h_ext), NEG)
+
+            best = np.maximum(match, np.maximum(v_best, h_best))
+            source = np.where(best == match, FROM_MATCH, np.where(best == v_best, FROM_VGAP, FROM_HGAP))
+            if local:
+                started_here = best <= 0
+                best = np.where(started_here, 0, best)
+                source = np.where(started_here, FROM_START, source)
+                top = int(best.argmax())
+                if best[top] > best_score:
+                    best_score, best_cell = int(best[top]), (int(rows[top]), int(cols[top]))
+
+            h[cur, ilo:ihi + 1] = best
+            vgap[cur, ilo:ihi + 1] = v_best
+            hgap[cur, ilo:ihi + 1] = h_best
+            trace[d] = (source
+                        | np.where(v_ext > v_open, VGAP_EXTENDED, 0)
+                        | np.where(h_ext > h_open, HGAP_EXTENDED, 0)).astype(np.uint8)
+            trace_lo[d] = ilo
+            cells += len(rows)
+
+        rows = np.arange(lo, hi + 1)
+        sampled = (rows % row_step == 0) & ((d - rows) % col_step == 0)
+        if sampled.any():
+            rows = rows[sampled]
+            preview[rows // row_step, (d - rows) // col_step] = h[cur, rows]
+
+    if local:
+        score, end = best_score, best_cell
+    else:
+        score, end = int(h[(n + m) % 3, n]), (n, m)
+    aligned_a, aligned_b, path = _traceback(a, b, trace, trace_lo, end, local)
+    matches = sum(x.upper() == y.upper() for x, y in zip(aligned_a, aligned_b))
+    return Alignment(
+        mode=mode,
+        score=score,
+        aligned_a=aligned_a,
+        aligned_b=aligned_b,
+        path=path,
+        identity=matches / max(len(aligned_a), 1),
+        cells=cells,
+        seconds=time.perf_counter() - started,
+        preview=preview,
+        preview_step=(row_step, col_step),
+    )
+
+
+def _traceback(a, b, trace, trace_lo, end, local):
+    """Walk the traceback bytes from `end` back to the start of the alignment"""
+    def cell(i, j):
+        return int(trace[i + j][i - trace_lo[i + j]])
+
+    i, j = end
+    top, bottom, path = [], [], [(i, j)]
+    state = FROM_START if (i == 0 or j == 0) else cell(i, j) & 3
+    while True:
+        if i == 0 or j == 0:
+            if not local:
+                top.extend(reversed(a[:i]))
+                bottom.extend("-" * i)
+                top.extend("-" * j)
+                bottom.extend(reversed(b[:j]))
+                path.extend((k, 0) for k in range(i - 1, -1, -1))
+                path.extend((0, k) for k in range(j - 1, -1, -1))
+            break
+        if state == FROM_START:
+            break
+        code = cell(i, j)
+        if state == FROM_MATCH:
+            top.append(a[i - 1])
+            bottom.append(b[j - 1])
+            i, j = i - 1, j - 1
+            state = None
+        elif state == FROM_VGAP:
+            top.append(a[i - 1])
+            bottom.append("-")
+            i -= 1
+            state = FROM_VGAP if code & VGAP_EXTENDED else None
+        else:
+            top.append("-")
+            bottom.append(b[j - 1])
+            j -= 1
+            state = FROM_HGAP if code & HGAP_EXTENDED else None
+        path.append((i, j))
+        if state is None and i > 0 and j > 0:
+            state = cell(i, j) & 3
+    return "".join(reversed(top)), "".join(reversed(bottom)), np.array(path[::-1], dtype=np.int64)
+
+
+def random_sequence(length, alphabet="ACDEFGHIKLMNPQRSTVWY", seed=0):
+    """Random sequence over `alphabet`"""
+    rng = np.random.default_rng(seed)
+    letters = np.frombuffer(alphabet.encode(), dtype=np.uint8)
+    return letters[rng.integers(0, len(letters), length)].tobytes().decode()
+
+
+def mutate_sequence(sequence, rate=0.1, alphabet="ACDEFGHIKLMNPQRSTVWY", seed=1):
+    """Copy of `sequence` with point substitutions and small indels at the given rate"""
+    rng = np.random.default_rng(seed)
+    letters = np.frombuffer(alphabet.encode(), dtype=np.uint8)
+    raw = np.frombuffer(sequence.encode(), dtype=np.uint8).copy()
+    substituted = rng.random(len(raw)) < rate
+    raw[substituted] = letters[rng.integers(0, len(letters), substituted.sum())]
+    keep = rng.random(len(raw)) >= rate / 4
+    return raw[keep].tobytes().decode()
@@ -0,0 +1,232 @@
+"""Portfolio analytics: page views, sessions and clicks in a local SQLite store.
+
+Recording an event only puts a tuple on an in-memory queue, so it never
+touches the disk during a rerun. A background thread drains the queue
+in batches. It inserts the raw events and updates the rollup tables
+(daily page views, daily clicks, one row per session) in one transaction
+on a WAL-mode database. Reports read only the rollups, so raw events are
+deleted after EVENT_RETENTION_DAYS. If the database cannot be opened,
+the writer drops events and retries with backoff instead of dying.
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from asset_store import APP_DIR
+
+ANALYTICS_DB = APP_DIR / ".cache" / "analytics.sqlite3"
+BATCH_SIZE = 500
+FLUSH_SECONDS = 1.0
+QUEUE_LIMIT = 100_000
+EVENT_RETENTION_DAYS = 90
+PRUNE_SECONDS = 3600
+CONNECT_RETRY_SECONDS = 5.0
+CONNECT_RETRY_MAX_SECONDS = 300.0
+PAGE_VIEW = "page_view"
+CLICK = "click"
+SESSION_START = "session_start"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL, session_id TEXT NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_page_views (
+    day TEXT NOT NULL, page TEXT NOT NULL, views INTEGER NOT NULL, PRIMARY KEY (day, page)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_clicks (
+    day TEXT NOT NULL, target TEXT NOT NULL, clicks INTEGER NOT NULL, PRIMARY KEY (day, target)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY, first_seen REAL NOT NULL, last_seen REAL NOT NULL, page_views INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen);
+"""
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class AnalyticsSummary:
+    """Totals of one reporting period, with the previous period for comparison"""
+    days: int
+    views: int = 0
+    previous_views: int = 0
+    visitors: int = 0
+    previous_visitors: int = 0
+    average_seconds: float = 0.0
+    previous_average_seconds: float = 0.0
+    daily_views: list = field(default_factory=list)  # (day, views)
+    top_pages: list = field(default_factory=list)  # (page, views)
+    top_clicks: list = field(default_factory=list)  # (target, clicks)
+
+
+def _day(ts):
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+def connect(path=ANALYTICS_DB):
+    """Connection to the analytics database in WAL mode, creating the tables if needed"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def write_batch(connection, events):
+    """Insert raw events and fold them into the rollup tables in one transaction"""
+    page_views, clicks, sessions = Counter(), Counter(), {}
+    for ts, session_id, kind, name in events:
+        first, last, views = sessions.get(session_id, (ts, ts, 0))
+        sessions[session_id] = (min(first, ts), max(last, ts), views + (kind == PAGE_VIEW))
+        if kind == PAGE_VIEW:
+            page_views[_day(ts), name] += 1
+        elif kind == CLICK:
+            clicks[_day(ts), name] += 1
+    with connection:
+        connection.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", events)
+        connection.executemany(
+            "INSERT INTO daily_page_views VALUES (?, ?, ?) "
+            "ON CONFLICT (day, page) DO UPDATE SET views = views + excluded.views",
+            [(day, page, count) for (day, page), count in page_views.items()])
+        connection.executemany(
+            "INSERT INTO daily_clicks VALUES (?, ?, ?) "
+            "ON CONFLICT (day, target) DO UPDATE SET clicks = clicks + excluded.clicks",
+            [(day, target, count) for (day, target), count in clicks.items()])
+        connection.executemany(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?) ON CONFLICT (session_id) DO UPDATE SET "
+            "first_seen = min(first_seen, excluded.first_seen), last_seen = max(last_seen, excluded.last_seen), "
+            "page_views = page_views + excluded.page_views",
+            [(session_id, *values) for session_id, values in sessions.items()])
+
+
+def prune_events(connection, now=None, days=EVENT_RETENTION_DAYS):
+    """Delete raw events older than `days`; the rollups keep their counts"""
+    now = time.time() if now is None else now
+    with connection:
+        return connection.execute("DELETE FROM events WHERE ts < ?", (now - days * 86400,)).rowcount
+
+
+class EventStore:
+    """Non-blocking event recorder with a background writer thread"""
+
+    def __init__(self, path=ANALYTICS_DB, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=QUEUE_LIMIT)
+        self._writer = threading.Thread(target=self._drain, name="analytics-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, kind, name, session_id):
+        """Queue one event; drops it rather than wait when the queue is full"""
+        try:
+            self._queue.put_nowait((time.time(), session_id, kind, name))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout=10.0):
+        """Block until every event queued so far is written"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10.0):
+        """Write every event queued so far, then stop the writer thread"""
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_seconds
+        while (len(batch) < self.batch_size and batch[-1] is not None
+               and not isinstance(batch[-1], threading.Event)):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        connection, delay, retry_at, pruned_at = None, CONNECT_RETRY_SECONDS, 0.0, 0.0
+        while True:
+            batch = self._next_batch()
+            events = [item for item in batch if item is not None and not isinstance(item, threading.Event)]
+            if connection is None and time.monotonic() >= retry_at:
+                try:
+                    connection = connect(self.path)
+                    delay = CONNECT_RETRY_SECONDS
+                except (sqlite3.Error, OSError) as error:
+                    log.warning("analytics database %s unavailable, retrying in %.0f s: %s", self.path, delay, error)
+                    retry_at = time.monotonic() + delay
+                    delay = min(2 * delay, CONNECT_RETRY_MAX_SECONDS)
+            if events and connection is None:
+                self.dropped += len(events)
+            elif events:
+                try:
+                    write_batch(connection, events)
+                    self.written += len(events)
+                except sqlite3.Error:
+                    self.dropped += len(events)
+                if time.monotonic() - pruned_at >= PRUNE_SECONDS:
+                    pruned_at = time.monotonic()
+                    try:
+                        prune_events(connection)
+                    except sqlite3.Error:
+                        log.exception("pruning analytics events failed")
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if batch[-1] is None:
+                if connection is not None:
+                    connection.close()
+                return
+
+
+def summarize(days=30, path=ANALYTICS_DB, top=5, now=None):
+    """Views, visitors and average visit length of the last `days` days and the period before, from the rollups"""
+    summary = AnalyticsSummary(days=days)
+    if not path.exists():
+        return summary
+    now = time.time() if now is None else now
+    start, previous_start = now - days * 86400, now - 2 * days * 86400
+    try:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=10)
+    except sqlite3.Error:
+        return summary
+    try:
+        def period(lower, upper):
+            views = connection.execute("SELECT COALESCE(SUM(views), 0) FROM daily_page_views "
+                                       "WHERE day >= ? AND day < ?", (_day(lower), _day(upper))).fetchone()[0]
+            visitors, average = connection.execute(
+                "SELECT COUNT(*), COALESCE(AVG(last_seen - first_seen), 0) FROM sessions "
+                "WHERE last_seen >= ? AND last_seen < ?", (lower, upper)).fetchone()
+            return views, visitors, average
+
+        summary.views, summary.visitors, summary.average_seconds = period(start, now + 86400)
+        summary.previous_views, summary.previous_visitors, summary.previous_average_seconds = period(
+            previous_start, start)
+        summary.daily_views = connection.execute(
+            "SELECT day, SUM(views) FROM daily_page_views WHERE day >= ? GROUP BY day ORDER BY day",
+            (_day(start),)).fetchall()
+        summary.top_pages = connection.execute(
+            "SELECT page, SUM(views) AS total FROM daily_page_views WHERE day >= ? "
+            "GROUP BY page ORDER BY total DESC LIMIT ?", (_day(start), top)).fetchall()
+        summary.top_clicks = connection.execute(
+            "SELECT target, SUM(clicks) AS total FROM daily_clicks WHERE day >= ? "
+            "GROUP BY target ORDER BY total DESC LIMIT ?", (_day(start), top)).fetchall()
+    except sqlite3.OperationalError:
+        # The writer has not created the tables yet
+        pass
+    finally:
+        connection.close()
+    return summary
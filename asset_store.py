@@ -0,0 +1,86 @@
+"""Process-wide delivery layer for the files shipped in the Assets/ folder"""
+import mimetypes
+from pathlib import Path
+
+import streamlit as st
+
+APP_DIR = Path(__file__).resolve().parent
+ASSETS_DIR = APP_DIR / "Assets"
+
+DOCUMENT_SUFFIXES = (".pdf",)
+
+
+def list_assets(suffixes=DOCUMENT_SUFFIXES):
+    """List asset files with the given suffixes, sorted by name"""
+    if not ASSETS_DIR.is_dir():
+        return []
+    return sorted(
+        (path for path in ASSETS_DIR.iterdir()
+         if path.is_file() and not path.name.startswith(".") and path.suffix.lower() in suffixes),
+        key=lambda path: path.name.lower(),
+    )
+
+
+def resolve_asset(relative_path):
+    """Resolve a path relative to the app folder, matching each part case-insensitively.
+
+    Raises FileNotFoundError when no matching file exists.
+    """
+    current = APP_DIR
+    for part in Path(relative_path).parts:
+        candidate = current / part
+        if not candidate.exists():
+            lowered = part.lower()
+            matches = sorted(child for child in current.iterdir() if child.name.lower() == lowered) \
+                if current.is_dir() else []
+            if not matches:
+                raise FileNotFoundError(relative_path)
+            candidate = matches[0]
+        current = candidate
+    if not current.is_file():
+        raise FileNotFoundError(relative_path)
+    return current
+
+
+def asset_title(path):
+    """Human readable title for an asset file"""
+    return Path(path).stem.replace("_", " ").strip()
+
+
+def asset_mime(path):
+    """Guess the MIME type used when serving an asset"""
+    mime, _ = mimetypes.guess_type(str(path))
+    return mime or "application/octet-stream"
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+def _read_asset(path, mtime_ns, size):
+    """Read an asset once per process; mtime and size make edits invalidate the entry"""
+    return Path(path).read_bytes()
+
+
+def load_asset(path):
+    """Return the bytes of an asset, served from the process cache while unchanged"""
+    stat = Path(path).stat()
+    return _read_asset(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def asset_download_button(path, label=None, key=None):
+    """Render a download button for an asset.
+
+    The bytes are registered with Streamlit's media file manager, which serves
+    them from a content-addressed URL instead of inlining them in the page.
+    """
+    path = Path(path)
+    try:
+        data = load_asset(path)
+    except OSError:
+        st.warning(f"📄 {path.name} is not available right now.")
+        return False
+    return st.download_button(
+        label or f"📄 {asset_title(path)}",
+        data=data,
+        file_name=path.name,
+        mime=asset_mime(path),
+        key=key or f"asset_{path.name}",
+    )
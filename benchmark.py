@@ -0,0 +1,292 @@
+"""Headless rerun benchmarks for every page of the portfolio.
+
+Each page, and each option of the Algorithms page picker, is run through
+Streamlit's AppTest and measured for:
+
+- cold rerun time: the first visit in a fresh session with empty
+  st.cache_data / st.cache_resource and the app's own modules re-imported
+  (third-party libraries stay imported). The job pool, analytics writer
+  and outbox worker of the previous case are shut down first;
+- warm rerun time: the median of repeated reruns of the same session,
+  once the background jobs the first visit started have finished;
+- job time: the seconds the workers spent on those background jobs,
+  which neither rerun time includes;
+- the number of elements on the page;
+- the serialized size of the delta messages the cold run and a warm run
+  send to the browser.
+
+Results are written as JSON. Given a baseline file from an earlier
+commit, every case is compared and the script exits with status 1 when
+a metric got slower (or bigger) by more than the threshold.
+
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json --threshold 0.25
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+from jobs import DONE
+
+APP_DIR = Path(__file__).resolve().parent
+MAIN_SCRIPT = APP_DIR / "pythonmainfile.py"
+RESULTS_DIR = APP_DIR / ".cache" / "benchmarks"
+PAGES = {
+    "Home": "views/home.py",
+    "Projects": "views/projects.py",
+    "Skills Lab": "views/skills_lab.py",
+    "Algorithms": "views/algorithms.py",
+    "Credentials": "views/credentials.py",
+    "Contact": "views/contact.py",
+}
+ALGORITHM_PICKER = "Choose Algorithm to Visualize:"
+COMPARED_METRICS = ("cold_s", "warm_s", "job_s", "cold_delta_bytes", "delta_bytes")
+MIN_SECONDS_CHANGE = 0.01  # differences below this are timer noise, never a regression
+TIMEOUT = 300
+JOB_POLL_SECONDS = 0.1
+JOB_PROGRESS_PREFIX = "⚙️ "  # text of a job progress bar, as opposed to a static one (skill levels)
+# Process-wide services kept in st.cache_resource that own worker processes or threads
+SERVICES = (("jobs", "JobScheduler"), ("analytics", "EventStore"), ("outbox", "Outbox"))
+
+_real_sleep = time.sleep
+
+
+def _skip_app_sleeps(seconds):
+    """time.sleep replacement that returns at once when called from the app's own code"""
+    if not sys._getframe(1).f_code.co_filename.startswith(str(APP_DIR)):
+        _real_sleep(seconds)
+
+
+class DeltaMeter:
+    """Records the serialized size of the delta messages of every AppTest run"""
+
+    def __init__(self):
+        self.runs = []
+        original = LocalScriptRunner.forward_msgs
+
+        def forward_msgs(runner):
+            messages = original(runner)
+            self.runs.append(sum(message.ByteSize() for message in messages if message.WhichOneof("type") == "delta"))
+            return messages
+
+        self._patch = mock.patch.object(LocalScriptRunner, "forward_msgs", forward_msgs)
+
+    @property
+    def last(self):
+        return self.runs[-1] if self.runs else 0
+
+    def __enter__(self):
+        self._patch.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._patch.stop()
+
+
+def count_elements(node):
+    """Number of leaf elements below an AppTest tree node"""
+    children = getattr(node, "children", None)
+    if children is None:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def forget_app_modules():
+    """Drop the app's modules from sys.modules so the next run imports them again"""
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name != "__main__" and path and Path(path).resolve().is_relative_to(APP_DIR):
+            del sys.modules[name]
+
+
+def close_services():
+    """Stop the pools and threads of the cached services, which clearing st.cache_resource would leak"""
+    classes = tuple(getattr(sys.modules[name], cls) for name, cls in SERVICES if name in sys.modules)
+    for service in [obj for obj in gc.get_objects() if isinstance(obj, classes)]:
+        service.close()
+
+
+def fresh_session(page):
+    """AppTest that has run once and switched to `page`, with all caches emptied and services stopped first"""
+    close_services()
+    forget_app_modules()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(MAIN_SCRIPT), default_timeout=TIMEOUT)
+    if page != "Home":
+        at.run()
+        at.switch_page(PAGES[page])
+    return at
+
+
+def timed_run(at):
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"the app raised: {at.exception[0].value}")
+    return elapsed
+
+
+def algorithm_picker(at):
+    return next(box for box in at.selectbox if box.label == ALGORITHM_PICKER)
+
+
+def settle_jobs(at, timeout=TIMEOUT):
+    """Rerun until no job progress bar is left; AppTest does not run the polling fragments itself"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and any(bar.proto.text.startswith(JOB_PROGRESS_PREFIX)
+                                              for bar in at.get("progress")):
+        # time.sleep itself is patched to skip the app's sleeps, and this module is part of the app
+        _real_sleep(JOB_POLL_SECONDS)
+        timed_run(at)
+
+
+def job_seconds(at):
+    """Worker time of the background jobs this session ran; fresh_session makes them all computed, not cached"""
+    jobs = at.session_state["jobs"] if "jobs" in at.session_state else {}
+    return sum(job.seconds for job in jobs.values() if job.status == DONE)
+
+
+def measure_case(meter, page, algorithm=None, repeats=5):
+    """Cold and warm rerun times, element count and delta bytes of one page or algorithm"""
+    at = fresh_session(page)
+    if algorithm is not None:
+        at.run()
+        algorithm_picker(at).set_value(algorithm)
+    cold = timed_run(at)
+    cold_bytes = meter.last
+    settle_jobs(at)
+    warm = [timed_run(at) for _ in range(repeats)]
+    return {
+        "page": page,
+        "algorithm": algorithm,
+        "cold_s": round(cold, 4),
+        "warm_s": round(statistics.median(warm), 4),
+        "warm_min_s": round(min(warm), 4),
+        "job_s": round(job_seconds(at), 4),
+        "elements": count_elements(at.main) + count_elements(at.sidebar),
+        "cold_delta_bytes": cold_bytes,
+        "delta_bytes": meter.last,
+    }
+
+
+def algorithm_options():
+    at = fresh_session("Algorithms")
+    at.run()
+    return list(algorithm_picker(at).options)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(pages, repeats=5, algorithms=True):
+    """Measure every selected page, and every algorithm when the Algorithms page is selected"""
+    cases = []
+    with DeltaMeter() as meter:
+        for page in pages:
+            print(f"· {page}", flush=True)
+            cases.append(measure_case(meter, page, repeats=repeats))
+            if page == "Algorithms" and algorithms:
+                for algorithm in algorithm_options():
+                    print(f"  · {algorithm}", flush=True)
+                    cases.append(measure_case(meter, page, algorithm, repeats))
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "streamlit": st.__version__,
+        "repeats": repeats,
+        "cases": cases,
+    }
+
+
+def case_key(case):
+    return f"{case['page']} / {case['algorithm']}" if case["algorithm"] else case["page"]
+
+
+def compare(results, baseline, threshold):
+    """Per-case ratios against a baseline; returns (rows, regressions)"""
+    previous = {case_key(case): case for case in baseline["cases"]}
+    rows, regressions = [], []
+    for case in results["cases"]:
+        key = case_key(case)
+        old = previous.get(key)
+        if old is None:
+            rows.append((key, "new case", ""))
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = old.get(metric), case[metric]
+            if not before:
+                continue
+            ratio = after / before
+            noise = metric.endswith("_s") and abs(after - before) < MIN_SECONDS_CHANGE
+            if ratio > 1 + threshold and not noise:
+                status = "REGRESSION"
+                regressions.append((key, metric, before, after))
+            elif ratio < 1 - threshold and not noise:
+                status = "faster" if metric.endswith("_s") else "smaller"
+            else:
+                status = ""
+            rows.append((key, f"{metric}: {before:g} -> {after:g} ({ratio:.2f}x)", status))
+    return rows, regressions
+
+
+def print_results(results):
+    print(f"\n{'Case':<42}{'Cold (s)':>10}{'Warm (s)':>10}{'Job (s)':>10}{'Elements':>10}"
+          f"{'Cold bytes':>13}{'Delta bytes':>13}")
+    for case in results["cases"]:
+        print(f"{case_key(case):<42}{case['cold_s']:>10.3f}{case['warm_s']:>10.3f}{case['job_s']:>10.3f}"
+              f"{case['elements']:>10}{case['cold_delta_bytes']:>13,}{case['delta_bytes']:>13,}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--repeats", type=int, default=5, help="warm reruns per case")
+    parser.add_argument("--no-algorithms", action="store_true", help="skip the per-algorithm cases")
+    parser.add_argument("--with-sleep", action="store_true", help="keep the app's time.sleep calls (chat streaming)")
+    parser.add_argument("--output", type=Path, help="JSON results file (default: .cache/benchmarks/<commit>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    with mock.patch("time.sleep", _real_sleep if args.with_sleep else _skip_app_sleeps):
+        results = run_benchmarks(args.pages, args.repeats, algorithms=not args.no_algorithms)
+    print_results(results)
+
+    output = args.output or RESULTS_DIR / f"{results['commit'] or 'results'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        rows, regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+        for key, change, status in rows:
+            print(f"  {key:<42}{change:<52}{status}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Pascal's triangle, exact or modulo p, computed one NumPy row at a time"""
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from matrix_layouts import HEATMAP_TABLE
+
+
+def pascal_rows(rows):
+    """Exact rows of Pascal's triangle as object arrays of Python ints"""
+    triangle = []
+    row = np.array([1], dtype=object)
+    for _ in range(rows):
+        triangle.append(row)
+        row = np.concatenate(([1], row[:-1] + row[1:], [1]))
+    return triangle
+
+
+def pascal_text(triangle):
+    """Centred text block for a list of triangle rows"""
+    width = max(len(str(value)) for value in triangle[-1]) if triangle else 1
+    lines = [" ".join(str(value).center(width) for value in row) for row in triangle]
+    longest = len(lines[-1]) if lines else 0
+    return "\n".join(line.center(longest).rstrip() for line in lines)
+
+
+def pascal_mod(rows, modulus):
+    """(rows, rows) lower-triangular array of C(i, j) mod `modulus`"""
+    dtype = np.uint8 if modulus <= 256 else np.uint32
+    residues = np.zeros((rows, rows), dtype=dtype)
+    residues[:, 0] = 1 % modulus
+    for i in range(1, rows):
+        previous = residues[i - 1, :i + 1].astype(np.uint32)
+        residues[i, 1:i + 1] = (previous[:-1] + previous[1:]) % modulus
+    return residues
+
+
+def triangle_image(residues, modulus, fmt="PNG"):
+    """Rasterize a mod-p triangle as an isosceles palette image, two pixels per cell"""
+    rows = residues.shape[0]
+    canvas = np.zeros((rows, 2 * rows), dtype=np.uint8)
+    for i in range(rows):
+        start = rows - 1 - i
+        # Palette index 0 is the background; residue r uses index r + 1
+        shades = residues[i, :i + 1].astype(np.uint8) + 1
+        canvas[i, start:start + 2 * (i + 1):2] = shades
+        canvas[i, start + 1:start + 2 * (i + 1):2] = shades
+
+    levels = min(modulus, 255)
+    table = HEATMAP_TABLE[np.linspace(0, len(HEATMAP_TABLE) - 1, levels + 1).astype(np.int64)[1:]]
+    palette = np.vstack([[255, 255, 255], table]).astype(np.uint8)
+    image = Image.fromarray(canvas)
+    image.putpalette(palette.ravel().tolist())
+    buffer = BytesIO()
+    image.save(buffer, format=fmt, optimize=True)
+    return buffer.getvalue()
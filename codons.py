@@ -0,0 +1,269 @@
+"""Genetic code tables and vectorized six-frame translation.
+
+Bases are mapped to 2-bit codes in NCBI's TCAG order, so a codon's code
+(16 * first + 4 * second + third) indexes the 64-letter amino acid string
+of a translation table directly. A whole reading frame is translated with
+one reshape and one lookup.
+"""
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+# NCBI translation tables in TCAG codon order: (name, amino acids, start codons)
+NCBI_TABLES = {
+    1: ("Standard",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M----------------------------"),
+    2: ("Vertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+        "--------------------------------MMMM---------------M------------"),
+    3: ("Yeast Mitochondrial",
+        "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "----------------------------------MM---------------M------------"),
+    4: ("Mold Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--MM---------------M------------MMMM---------------M------------"),
+    5: ("Invertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",
+        "---M----------------------------MMMM---------------M------------"),
+    6: ("Ciliate Nuclear",
+        "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    9: ("Echinoderm Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M---------------M------------"),
+    10: ("Euplotid Nuclear",
+        "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    11: ("Bacterial",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M------------MMMM---------------M------------"),
+    12: ("Alternative Yeast Nuclear",
+        "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-------------------M---------------M----------------------------"),
+    13: ("Ascidian Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG",
+        "---M------------------------------MM---------------M------------"),
+    14: ("Alternative Flatworm Mitochondrial",
+        "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    15: ("Blepharisma Macronuclear",
+        "FFLLSSSSYY*QCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    16: ("Chlorophycean Mitochondrial",
+        "FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    21: ("Trematode Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M---------------M------------"),
+    22: ("Scenedesmus obliquus Mitochondrial",
+        "FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    23: ("Thraustochytrium Mitochondrial",
+        "FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--------------------------------M--M---------------M------------"),
+    24: ("Pterobranchia Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M---------------M------------"),
+    25: ("Candidate Division SR1",
+        "FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M-------------------------------M---------------M------------"),
+    26: ("Pachysolen tannophilus Nuclear",
+        "FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-------------------M---------------M----------------------------"),
+    27: ("Karyorelict Nuclear",
+        "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    28: ("Condylostoma Nuclear",
+        "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    29: ("Mesodinium Nuclear",
+        "FFLLSSSSYYYYCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    30: ("Peritrich Nuclear",
+        "FFLLSSSSYYEECC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    31: ("Blastocrithidia Nuclear",
+        "FFLLSSSSYYEECCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    32: ("Balanophoraceae Plastid",
+        "FFLLSSSSYY*WCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M------------MMMM---------------M------------"),
+    33: ("Cephalodiscidae Mitochondrial",
+        "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M---------------M------------"),
+}
+
+BASES = "TCAG"
+INVALID_BASE = 4
+INVALID_CODON = 64
+
+_BASE_CODES = np.full(256, INVALID_BASE, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _BASE_CODES[ord(_base)] = _BASE_CODES[ord(_base.lower())] = _code
+_BASE_CODES[ord("U")] = _BASE_CODES[ord("u")] = 0
+
+FRAMES = ("+1", "+2", "+3", "-1", "-2", "-3")
+
+
+@dataclass
+class CodonLookup:
+    """65-entry lookup arrays for one table; entry 64 is any codon containing an unknown base"""
+    amino_acids: np.ndarray
+    starts: np.ndarray
+    stops: np.ndarray
+
+
+@lru_cache(maxsize=None)
+def codon_lookup(table_id=1):
+    """Lookup arrays for an NCBI table id"""
+    _, amino_acids, starts = NCBI_TABLES[table_id]
+    letters = np.frombuffer((amino_acids + "X").encode(), dtype=np.uint8).copy()
+    return CodonLookup(
+        amino_acids=letters,
+        starts=np.frombuffer((starts + "-").encode(), dtype=np.uint8) == ord("M"),
+        stops=letters == ord("*"),
+    )
+
+
+def codon_table_frame(table_id=1):
+    """The classic 16 x 4 codon table: rows are first + third base, columns the second base"""
+    _, amino_acids, starts = NCBI_TABLES[table_id]
+    rows = {}
+    for first in BASES:
+        for third in BASES:
+            cells = []
+            for second in BASES:
+                index = 16 * BASES.index(first) + 4 * BASES.index(second) + BASES.index(third)
+                marker = " ▶" if starts[index] == "M" else ""
+                cells.append(f"{first}{second}{third} {amino_acids[index]}{marker}")
+            rows[f"{first}··{third}"] = cells
+    return rows
+
+
+def encode_bases(sequence):
+    """Map a DNA/RNA sequence (str or bytes) to 2-bit base codes; anything else becomes INVALID_BASE"""
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii", "replace")
+    return _BASE_CODES[np.frombuffer(sequence, dtype=np.uint8)]
+
+
+def reverse_complement_codes(codes):
+    """Reverse complement of base codes (T<->A and C<->G are code ^ 2 in TCAG order)"""
+    return np.where(codes < INVALID_BASE, codes ^ 2, INVALID_BASE).astype(np.uint8)[::-1]
+
+
+def codon_indices(codes, frame):
+    """Codon indices (0-63, or INVALID_CODON) of one forward reading frame"""
+    count = max(0, (len(codes) - frame) // 3)
+    triplets = codes[frame:frame + 3 * count].reshape(count, 3)
+    indices = (triplets[:, 0] << 4) | (triplets[:, 1] << 2) | triplets[:, 2]
+    indices[(triplets == INVALID_BASE).any(axis=1)] = INVALID_CODON
+    return indices
+
+
+def translate_codes(codes, frame=0, table_id=1):
+    """Translate one forward frame of base codes into a protein string"""
+    return codon_lookup(table_id).amino_acids[codon_indices(codes, frame)].tobytes().decode()
+
+
+def six_frame_translation(sequence, table_id=1):
+    """Translations of all six reading frames, keyed +1 to -3"""
+    forward = encode_bases(sequence)
+    reverse = reverse_complement_codes(forward)
+    return {
+        label: translate_codes(forward if label[0] == "+" else reverse, int(label[1]) - 1, table_id)
+        for label in FRAMES
+    }
+
+
+def find_orfs(sequence, table_id=1, min_length=100):
+    """Open reading frames on both strands, longest first.
+
+    An ORF runs from the first start codon after a stop to the next
+    in-frame stop and must encode at least `min_length` amino acids.
+    Returns a dict of arrays: strand, frame, start and end (0-based,
+    end-exclusive forward-strand coordinates including the stop codon)
+    and length in amino acids.
+    """
+    lookup = codon_lookup(table_id)
+    forward = encode_bases(sequence)
+    reverse = reverse_complement_codes(forward)
+    total = len(forward)
+    found = {"strand": [], "frame": [], "start": [], "end": [], "length": []}
+
+    for label in FRAMES:
+        frame = int(label[1]) - 1
+        indices = codon_indices(forward if label[0] == "+" else reverse, frame)
+        stops = np.flatnonzero(lookup.stops[indices])
+        starts = np.flatnonzero(lookup.starts[indices])
+        following = np.searchsorted(stops, starts)
+        closed = following < len(stops)
+        starts, following = starts[closed], following[closed]
+        # The earliest start before each stop opens that stop's ORF
+        _, first = np.unique(following, return_index=True)
+        starts, ends = starts[first], stops[following[first]]
+        lengths = ends - starts
+        keep = lengths >= min_length
+        starts, ends, lengths = starts[keep], ends[keep], lengths[keep]
+
+        nt_start = frame + 3 * starts
+        nt_end = frame + 3 * (ends + 1)
+        if label[0] == "-":
+            nt_start, nt_end = total - nt_end, total - nt_start
+        found["strand"].append(np.full(len(starts), label[0]))
+        found["frame"].append(np.full(len(starts), label))
+        found["start"].append(nt_start)
+        found["end"].append(nt_end)
+        found["length"].append(lengths)
+
+    orfs = {key: np.concatenate(parts) for key, parts in found.items()}
+    order = np.argsort(-orfs["length"], kind="stable")
+    return {key: values[order] for key, values in orfs.items()}
+
+
+def orf_protein(sequence, strand, start, end, table_id=1):
+    """Protein encoded by one ORF returned from `find_orfs`; alternative start codons still initiate with M"""
+    codes = encode_bases(sequence)[start:end]
+    if strand == "-":
+        codes = reverse_complement_codes(codes)
+    protein = translate_codes(codes, 0, table_id)
+    return "M" + protein[1:] if protein else protein
+
+
+def analyze_records(records, table_id=1, min_length=100, top=20, preview=60):
+    """Translate and scan (header, sequence) records one at a time.
+
+    Returns per-record summaries, the `top` longest ORFs of each record with
+    a protein preview, and six-frame previews of the first record.
+    """
+    summaries, orf_rows, frames = [], [], None
+    for header, sequence in records:
+        started = time.perf_counter()
+        orfs = find_orfs(sequence, table_id, min_length)
+        summaries.append({
+            "Record": header.split()[0] if header else "sequence",
+            "Length (bp)": len(sequence),
+            "GC %": round(100 * sum(sequence.upper().count(b) for b in (b"G", b"C")) / max(len(sequence), 1), 2),
+            "ORFs": len(orfs["start"]),
+            "Time (ms)": round((time.perf_counter() - started) * 1000, 1),
+        })
+        for k in range(min(top, len(orfs["start"]))):
+            protein = orf_protein(sequence, orfs["strand"][k], orfs["start"][k], orfs["end"][k], table_id)
+            orf_rows.append({
+                "Record": summaries[-1]["Record"],
+                "Frame": str(orfs["frame"][k]),
+                "Start": int(orfs["start"][k]) + 1,
+                "End": int(orfs["end"][k]),
+                "Length (aa)": int(orfs["length"][k]),
+                "Protein": protein[:preview] + ("…" if len(protein) > preview else ""),
+            })
+        if frames is None:
+            # Forward frames start at the beginning of the record, reverse frames at its end
+            window = 3 * preview + 2
+            head = six_frame_translation(sequence[:window], table_id)
+            tail = six_frame_translation(sequence[-window:], table_id)
+            frames = {label: (head if label[0] == "+" else tail)[label] for label in FRAMES}
+    return summaries, orf_rows, frames or {}
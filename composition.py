@@ -0,0 +1,143 @@
+"""Single-pass genome composition: sliding-window GC, skew and entropy plus k-mer spectra.
+
+The sequence arrives as a stream of chunks. Each chunk is appended to the
+few bases carried over from the previous one (the unfinished windows and
+the last k - 1 bases), so windows and k-mers that straddle a chunk
+boundary are counted exactly once. Windows are differences of cumulative
+base counts sampled at strided positions; k-mers are packed into 2-bit
+integer codes and counted with np.bincount into one running spectrum.
+Memory is bounded by the chunk size and the 4**k spectrum, not the
+sequence length.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from codons import BASES, INVALID_BASE, encode_bases
+
+MAX_K = 12
+CHUNK_BASES = 1 << 20
+_T, _C, _A, _G = range(4)
+
+
+@dataclass
+class CompositionResult:
+    """Window statistics and k-mer spectrum summary of one sequence"""
+    window: int
+    step: int
+    k: int
+    starts: np.ndarray
+    gc: np.ndarray
+    skew: np.ndarray
+    entropy: np.ndarray
+    top_kmers: list
+    multiplicity: np.ndarray
+    distinct_kmers: int
+    total_kmers: int
+    bases: int
+    chunks: int
+    seconds: float
+
+
+def _window_stats(codes, starts, window):
+    """GC fraction, GC skew and base entropy (bits) of the windows starting at `starts`"""
+    one_hot = codes[:, None] == np.arange(4, dtype=np.uint8)[None, :]
+    cumulative = np.vstack([np.zeros((1, 4), dtype=np.int32), np.cumsum(one_hot, axis=0, dtype=np.int32)])
+    counts = cumulative[starts + window] - cumulative[starts]
+    valid = counts.sum(axis=1)
+    g, c = counts[:, _G], counts[:, _C]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gc = (g + c) / valid
+        skew = (g - c) / (g + c)
+        p = counts / valid[:, None]
+        entropy = -np.sum(np.where(p > 0, p * np.log2(p), 0.0), axis=1)
+    entropy[valid == 0] = np.nan
+    return gc, skew, entropy
+
+
+def kmer_codes(codes, k):
+    """Packed codes of every k-mer without an unknown base"""
+    count = len(codes) - k + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64)
+    packed = np.zeros(count, dtype=np.int64)
+    for offset in range(k):
+        packed = (packed << 2) | codes[offset:offset + count]
+    invalid = np.concatenate(([0], np.cumsum(codes >= INVALID_BASE)))
+    return packed[invalid[k:k + count] == invalid[:count]]
+
+
+def kmer_strings(codes, k):
+    """Decode packed k-mer codes to strings"""
+    shifts = np.arange(2 * (k - 1), -1, -2)
+    letters = np.frombuffer(BASES.encode(), dtype=np.uint8)[(np.asarray(codes)[:, None] >> shifts) & 3]
+    return [row.tobytes().decode() for row in letters]
+
+
+def genome_composition(chunks, window=1000, step=500, k=6, top=20):
+    """Stream sequence chunks (bytes or uint8 arrays) through the window and k-mer counters in one pass"""
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    if window < 1 or step < 1:
+        raise ValueError("window and step must be positive")
+    started = time.perf_counter()
+    spectrum = np.zeros(4 ** k, dtype=np.int64)
+    carry = np.zeros(0, dtype=np.uint8)
+    carry_start = 0  # sequence position of carry[0]
+    next_window = 0  # start of the next window to emit
+    parts = {"starts": [], "gc": [], "skew": [], "entropy": []}
+    bases = chunk_count = 0
+    for chunk in chunks:
+        codes = encode_bases(chunk.tobytes() if isinstance(chunk, np.ndarray) else chunk)
+        bases += len(codes)
+        chunk_count += 1
+        buffer = np.concatenate((carry, codes))
+
+        # k-mers ending in the new chunk; the carry always ends with the previous k - 1 bases
+        kmer_buffer = buffer[max(0, len(carry) - (k - 1)):]
+        spectrum += np.bincount(kmer_codes(kmer_buffer, k), minlength=len(spectrum))
+
+        local = np.arange(next_window - carry_start, len(buffer) - window + 1, step)
+        if len(local):
+            gc, skew, entropy = _window_stats(buffer, local, window)
+            for key, values in zip(parts, (local + carry_start, gc, skew, entropy)):
+                parts[key].append(values)
+            next_window = int(local[-1]) + carry_start + step
+
+        keep_from = min(next_window - carry_start, max(0, len(buffer) - (k - 1)))
+        carry, carry_start = buffer[keep_from:], carry_start + keep_from
+
+    observed = spectrum[spectrum > 0]
+    order = np.argsort(-spectrum, kind="stable")[:top]
+    order = order[spectrum[order] > 0]
+    top_kmers = list(zip(kmer_strings(order, k), spectrum[order].tolist()))
+    joined = {key: np.concatenate(values) if values else np.zeros(0) for key, values in parts.items()}
+    return CompositionResult(
+        window=window, step=step, k=k,
+        starts=joined["starts"].astype(np.int64), gc=joined["gc"], skew=joined["skew"], entropy=joined["entropy"],
+        top_kmers=top_kmers,
+        multiplicity=np.bincount(observed) if len(observed) else np.zeros(1, dtype=np.int64),
+        distinct_kmers=int(len(observed)),
+        total_kmers=int(observed.sum()),
+        bases=bases,
+        chunks=chunk_count,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def simulated_bacterial_genome(length=5_000_000, chunk_bases=CHUNK_BASES, seed=0):
+    """Yield chunks of a random circular-style genome with G/C strand bias flipping at the terminus and GC islands"""
+    rng = np.random.default_rng(seed)
+    letters = np.frombuffer(b"ACGT", dtype=np.uint8)
+    islands = rng.integers(0, length, 12)
+    for start in range(0, length, chunk_bases):
+        positions = np.arange(start, min(length, start + chunk_bases))
+        leading = positions < length // 2
+        gc = np.full(len(positions), 0.50)
+        for island in islands:
+            gc[np.abs(positions - island) < 20_000] = 0.62
+        g_share = np.where(leading, 0.53, 0.47)
+        probabilities = np.stack([(1 - gc) / 2, gc * (1 - g_share), gc * g_share, (1 - gc) / 2], axis=1)
+        draws = (rng.random(len(positions))[:, None] > np.cumsum(probabilities, axis=1)).sum(axis=1)
+        yield letters[np.minimum(draws, 3)].tobytes()
@@ -0,0 +1,306 @@
+"""CRISPR-Cas9 guide design with an on-disk, memory-mapped off-target index.
+
+Protospacers are packed two bits per base (TCAG codes, as in codons) into
+one uint64 per site. An index holds every NGG/NAG-adjacent 20-mer of a
+reference on both strands, plus four seed tables that order the sites by
+each 5-nt quarter of the protospacer. A site within three mismatches of a
+guide matches at least one quarter exactly, so a query only verifies the
+sites in four small buckets instead of rescanning the reference.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from asset_store import APP_DIR
+from codons import BASES, INVALID_BASE, encode_bases
+
+INDEX_DIR = APP_DIR / ".cache" / "kmer_index"
+INDEX_VERSION = 1
+
+PROTOSPACER = 20
+SEEDS = 4
+SEED_LENGTH = PROTOSPACER // SEEDS
+SEED_BUCKETS = 4 ** SEED_LENGTH
+MAX_MISMATCHES = SEEDS - 1
+PAMS = ("NGG", "NAG")
+
+# Hsu et al. (2013) mismatch weights, PAM-distal position 1 to PAM-proximal position 20
+MIT_WEIGHTS = np.array([0, 0, 0.014, 0, 0, 0.395, 0.317, 0, 0.389, 0.079,
+                        0.445, 0.508, 0.613, 0.851, 0.732, 0.828, 0.615, 0.804, 0.685, 0.583])
+# Cleavage of NAG sites relative to NGG (CFD PAM score)
+NAG_ACTIVITY = 0.26
+
+_T, _C, _A, _G = range(4)
+_BIT_COUNTS = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+_LOW_BITS = np.uint64(int("01" * PROTOSPACER, 2))
+_SHIFTS = np.arange(2 * (PROTOSPACER - 1), -1, -2, dtype=np.uint64)
+_COMPLEMENT = str.maketrans("ACGTNacgtn", "TGCANtgcan")
+
+
+@dataclass
+class KmerIndex:
+    """Memory-mapped PAM-adjacent sites of a reference and their seed tables"""
+    directory: object
+    sites: np.ndarray
+    positions: np.ndarray
+    strands: np.ndarray
+    pams: np.ndarray
+    records: np.ndarray
+    seed_order: np.ndarray
+    seed_offsets: np.ndarray
+    names: list
+    pam_names: tuple
+    bases: int
+
+
+def reverse_complement(sequence):
+    """Reverse complement of a DNA string"""
+    return sequence.translate(_COMPLEMENT)[::-1]
+
+
+def pack_kmers(codes, starts):
+    """Pack the 20-mers starting at `starts` two bits per base, first base in the high bits"""
+    packed = np.zeros(len(starts), dtype=np.uint64)
+    for offset in range(PROTOSPACER):
+        packed = (packed << np.uint64(2)) | codes[starts + offset].astype(np.uint64)
+    return packed
+
+
+def unpack_kmers(packed):
+    """(count, 20) base-code matrix of packed 20-mers"""
+    packed = np.asarray(packed, dtype=np.uint64)
+    return ((packed[:, None] >> _SHIFTS[None, :]) & np.uint64(3)).astype(np.uint8)
+
+
+def kmer_strings(packed):
+    """Decode packed 20-mers to strings"""
+    letters = np.frombuffer(BASES.encode(), dtype=np.uint8)[unpack_kmers(packed)]
+    return [row.tobytes().decode() for row in letters]
+
+
+def _strand_sites(codes, pams):
+    """Protospacer starts followed by each PAM on the given strand"""
+    count = len(codes) - PROTOSPACER - 3 + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8)
+    invalid = np.concatenate(([0], np.cumsum(codes >= INVALID_BASE)))
+    starts, kinds = [], []
+    for kind, pam in enumerate(pams):
+        match = np.ones(count, dtype=bool)
+        for offset, base in enumerate(pam):
+            if base != "N":
+                match &= codes[PROTOSPACER + offset:PROTOSPACER + offset + count] == BASES.index(base)
+        found = np.flatnonzero(match)
+        found = found[invalid[found + PROTOSPACER] == invalid[found]]
+        starts.append(found)
+        kinds.append(np.full(len(found), kind, dtype=np.int8))
+    return np.concatenate(starts), np.concatenate(kinds)
+
+
+def find_sites(codes, pams=PAMS):
+    """Every protospacer next to an allowed PAM on either strand.
+
+    Returns the packed 20-mers (5'->3' on their own strand), the 0-based
+    plus-strand start of each protospacer, its strand (+1/-1) and the index
+    of its PAM in `pams`.
+    """
+    plus_starts, plus_kinds = _strand_sites(codes, pams)
+    reverse = np.where(codes < INVALID_BASE, codes ^ 2, INVALID_BASE).astype(np.uint8)[::-1].copy()
+    minus_starts, minus_kinds = _strand_sites(reverse, pams)
+    sites = np.concatenate((pack_kmers(codes, plus_starts), pack_kmers(reverse, minus_starts)))
+    positions = np.concatenate((plus_starts, len(codes) - minus_starts - PROTOSPACER))
+    strands = np.concatenate((np.ones(len(plus_starts), dtype=np.int8), -np.ones(len(minus_starts), dtype=np.int8)))
+    return sites, positions, strands, np.concatenate((plus_kinds, minus_kinds))
+
+
+def seed_values(packed, quarter):
+    """Value of one 5-nt quarter of packed 20-mers"""
+    shift = np.uint64(2 * SEED_LENGTH * (SEEDS - 1 - quarter))
+    return (np.asarray(packed, dtype=np.uint64) >> shift) & np.uint64(SEED_BUCKETS - 1)
+
+
+def build_index(records, directory, pams=PAMS):
+    """Write the site arrays and seed tables of a reference to `directory`"""
+    columns = {"sites": [], "positions": [], "strands": [], "pams": [], "records": []}
+    names, bases = [], 0
+    for record, (name, sequence) in enumerate(records):
+        codes = encode_bases(sequence)
+        for key, values in zip(("sites", "positions", "strands", "pams"), find_sites(codes, pams)):
+            columns[key].append(values)
+        columns["records"].append(np.full(len(columns["sites"][-1]), record, dtype=np.uint32))
+        names.append(name)
+        bases += len(codes)
+    arrays = {
+        "sites": np.concatenate(columns["sites"] or [np.zeros(0, dtype=np.uint64)]),
+        "positions": np.concatenate(columns["positions"] or [np.zeros(0, dtype=np.int64)]).astype(np.int64),
+        "strands": np.concatenate(columns["strands"] or [np.zeros(0, dtype=np.int8)]),
+        "pams": np.concatenate(columns["pams"] or [np.zeros(0, dtype=np.int8)]),
+        "records": np.concatenate(columns["records"] or [np.zeros(0, dtype=np.uint32)]),
+    }
+    seed_order = np.empty((SEEDS, len(arrays["sites"])), dtype=np.uint32)
+    seed_offsets = np.empty((SEEDS, SEED_BUCKETS + 1), dtype=np.int64)
+    for quarter in range(SEEDS):
+        seeds = seed_values(arrays["sites"], quarter)
+        seed_order[quarter] = np.argsort(seeds, kind="stable")
+        seed_offsets[quarter] = np.searchsorted(seeds[seed_order[quarter]], np.arange(SEED_BUCKETS + 1))
+    arrays["seed_order"] = seed_order
+    arrays["seed_offsets"] = seed_offsets
+
+    # Build next to the final directory and move it in place, so readers never see a partial index
+    tmp = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for key, values in arrays.items():
+        np.save(tmp / f"{key}.npy", values)
+    meta = {"version": INDEX_VERSION, "names": names, "pams": list(pams), "bases": bases}
+    (tmp / "meta.json").write_text(json.dumps(meta))
+    try:
+        os.replace(tmp, directory)
+    except OSError:
+        # Another process finished the same index first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_index(directory):
+    """Open an index directory with every array memory-mapped"""
+    meta = json.loads((directory / "meta.json").read_text())
+    arrays = {key: np.load(directory / f"{key}.npy", mmap_mode="r") for key in
+              ("sites", "positions", "strands", "pams", "records", "seed_order", "seed_offsets")}
+    return KmerIndex(directory=directory, names=meta["names"], pam_names=tuple(meta["pams"]),
+                     bases=meta["bases"], **arrays)
+
+
+def open_index(key, records, pams=PAMS):
+    """Memory-map the index stored for `key`, building it from `records()` on first use"""
+    digest = hashlib.sha1(f"{INDEX_VERSION}|{key}|{','.join(pams)}".encode()).hexdigest()[:20]
+    directory = INDEX_DIR / digest
+    if not (directory / "meta.json").exists():
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        build_index(records(), directory, pams)
+    return load_index(directory)
+
+
+def mismatch_counts(guide, sites):
+    """Number of mismatching bases between one packed guide and packed sites"""
+    diff = np.ascontiguousarray(np.asarray(sites, dtype=np.uint64) ^ np.uint64(guide))
+    folded = (diff | (diff >> np.uint64(1))) & _LOW_BITS
+    return _BIT_COUNTS[folded.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def query_index(index, guide, max_mismatches=MAX_MISMATCHES):
+    """Site ids within `max_mismatches` of a packed guide and their mismatch counts"""
+    if max_mismatches > MAX_MISMATCHES:
+        raise ValueError(f"the seed index guarantees at most {MAX_MISMATCHES} mismatches")
+    buckets = []
+    for quarter in range(SEEDS):
+        seed = int(seed_values(guide, quarter))
+        start, end = index.seed_offsets[quarter, seed], index.seed_offsets[quarter, seed + 1]
+        buckets.append(index.seed_order[quarter, start:end])
+    candidates = np.unique(np.concatenate(buckets)).astype(np.int64)
+    mismatches = mismatch_counts(guide, index.sites[candidates])
+    keep = mismatches <= max_mismatches
+    return candidates[keep], mismatches[keep]
+
+
+def mit_scores(guide, sites, pams):
+    """Hsu et al. (2013) cleavage likelihood of each site, scaled down for NAG PAMs"""
+    sites = np.asarray(sites, dtype=np.uint64)
+    mismatched = (unpack_kmers(sites) != unpack_kmers([guide])).astype(bool)
+    count = mismatched.sum(axis=1)
+    weight = np.prod(np.where(mismatched, 1.0 - MIT_WEIGHTS, 1.0), axis=1)
+    positions = np.arange(PROTOSPACER)
+    first = np.where(mismatched, positions, PROTOSPACER).min(axis=1)
+    last = np.where(mismatched, positions, -1).max(axis=1)
+    spacing = np.where(count > 1, (last - first) / np.maximum(count - 1, 1), PROTOSPACER - 1)
+    score = weight / ((PROTOSPACER - 1 - spacing) / (PROTOSPACER - 1) * 4 + 1) / np.maximum(count, 1) ** 2
+    return score * np.where(np.asarray(pams) == PAMS.index("NAG"), NAG_ACTIVITY, 1.0)
+
+
+def on_target_scores(sites, pams):
+    """Rule-based 0-100 activity estimate of each guide.
+
+    Penalizes GC content outside 40-70 %, TTTT runs (a Pol III terminator),
+    5-base homopolymers and NAG PAMs, and favours a G next to the PAM.
+    """
+    codes = unpack_kmers(sites)
+    gc = np.isin(codes, (_C, _G)).mean(axis=1)
+    score = 100.0 - 200.0 * np.maximum(0.0, np.maximum(0.40 - gc, gc - 0.70))
+    tttt = (sliding_window_view(codes, 4, axis=1) == _T).all(axis=2).any(axis=1)
+    fives = sliding_window_view(codes, 5, axis=1)
+    homopolymer = (fives == fives[:, :, :1]).all(axis=2).any(axis=1)
+    score -= 40.0 * tttt + 15.0 * homopolymer
+    score += 5.0 * (codes[:, -1] == _G)
+    score *= np.where(np.asarray(pams) == PAMS.index("NAG"), NAG_ACTIVITY, 1.0)
+    return np.clip(score, 0.0, 100.0), gc
+
+
+def specificity(scores, mismatches):
+    """MIT guide specificity (0-100), 100·100 / (100 + Σ 100·score) over the off-target hits.
+
+    One perfect match is taken to be the target site itself and left out.
+    """
+    total = float(np.sum(scores))
+    if np.any(mismatches == 0):
+        total -= float(np.max(scores[mismatches == 0]))
+    return 100.0 / (1.0 + max(total, 0.0))
+
+
+def design_guides(sequence, index=None, pams=PAMS, max_mismatches=MAX_MISMATCHES, limit=100):
+    """Best-scoring guides of a sequence, with off-target counts when an index is given"""
+    if isinstance(sequence, bytes):
+        sequence = sequence.decode("ascii", "replace")
+    sequence = sequence.upper()
+    sites, positions, strands, kinds = find_sites(encode_bases(sequence), pams)
+    scores, gc = on_target_scores(sites, kinds)
+    rows = []
+    for site in np.argsort(-scores, kind="stable")[:limit]:
+        start, strand = int(positions[site]), int(strands[site])
+        if strand > 0:
+            pam, cut = sequence[start + PROTOSPACER:start + PROTOSPACER + 3], start + PROTOSPACER - 3
+        else:
+            pam, cut = reverse_complement(sequence[start - 3:start]), start + 3
+        row = {
+            "Guide": kmer_strings([sites[site]])[0],
+            "PAM": pam,
+            "Strand": "+" if strand > 0 else "-",
+            "Start": start + 1,
+            "Cut After": cut,
+            "GC %": round(100 * float(gc[site]), 1),
+            "On-target": round(float(scores[site]), 1),
+        }
+        if index is not None:
+            started = time.perf_counter()
+            hits, mismatches = query_index(index, int(sites[site]), max_mismatches)
+            hit_scores = mit_scores(int(sites[site]), index.sites[hits], index.pams[hits])
+            row.update({f"{k} mm": int(np.sum(mismatches == k)) for k in range(max_mismatches + 1)})
+            row["Specificity"] = round(specificity(hit_scores, mismatches), 1)
+            row["Query ms"] = round(1000 * (time.perf_counter() - started), 2)
+        rows.append(row)
+    return rows
+
+
+def off_target_hits(index, guide, max_mismatches=MAX_MISMATCHES, top=50):
+    """Reference sites of one guide string, most likely to be cut first; mismatched bases are lowercase"""
+    packed = int(pack_kmers(encode_bases(guide), np.array([0]))[0])
+    hits, mismatches = query_index(index, packed, max_mismatches)
+    scores = mit_scores(packed, index.sites[hits], index.pams[hits])
+    order = np.lexsort((-scores, mismatches))[:top]
+    hits, mismatches, scores = hits[order], mismatches[order], scores[order]
+    return [
+        {
+            "Record": index.names[int(index.records[hit])],
+            "Start": int(index.positions[hit]) + 1,
+            "Strand": "+" if index.strands[hit] > 0 else "-",
+            "PAM": index.pam_names[int(index.pams[hit])],
+            "Site": "".join(b if b == g else b.lower() for b, g in zip(site, guide)),
+            "Mismatches": int(count),
+            "MIT Score": round(float(score), 4),
+        }
+        for hit, site, count, score in zip(hits, kmer_strings(index.sites[hits]), mismatches, scores)
+    ]
@@ -0,0 +1,273 @@
+"""Full-text search over the documents in Assets/.
+
+Each PDF is opened once to extract its title, metadata and text layer.
+Scanned pages have no text layer, so those documents are found by their
+title and metadata only. The extracted text is stored with the index, so
+a rebuild re-extracts only the files whose mtime or size changed and
+never reopens the others.
+
+The index is an inverted file in CSR layout. `term_ptr` splits the
+posting arrays by term, and each posting holds the document, the term
+frequency and the character offset of the first occurrence, which
+anchors the snippet. Each build goes to a new generation directory.
+The CURRENT pointer file is then replaced atomically, so readers always
+see a complete index. Queries are BM25 over the memory-mapped postings
+and never touch a PDF.
+"""
+import bisect
+import json
+import os
+import re
+import shutil
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+
+from asset_store import APP_DIR, asset_title, list_assets
+
+SEARCH_DIR = APP_DIR / ".cache" / "search"
+INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_EXPANSIONS = 20
+SNIPPET_CHARS = 180
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+@dataclass
+class SearchIndex:
+    """Memory-mapped inverted index and the stored document texts"""
+    directory: object
+    documents: list
+    texts: list
+    vocabulary: list
+    term_ids: dict
+    term_ptr: np.ndarray
+    post_doc: np.ndarray
+    post_tf: np.ndarray
+    post_offset: np.ndarray
+    lengths: np.ndarray
+
+
+@dataclass
+class SearchHit:
+    """One ranked document with a snippet around its best-matching term"""
+    name: str
+    title: str
+    pages: int
+    score: float
+    snippet: str
+
+
+def tokenize(text):
+    """Lowercased word tokens of a text with their character offsets"""
+    return [(match.group().lower(), match.start()) for match in _TOKEN.finditer(text)]
+
+
+def extract_document(path):
+    """Title, page count and searchable text of one PDF"""
+    title = asset_title(path)
+    parts, pages = [title], 0
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PyPdfError
+
+        reader = PdfReader(path)
+        pages = len(reader.pages)
+        metadata = reader.metadata or {}
+        parts += [str(metadata[key]) for key in ("/Title", "/Subject", "/Keywords", "/Author") if metadata.get(key)]
+        parts += [page.extract_text() or "" for page in reader.pages]
+    except ImportError:
+        # Without pypdf only titles are searchable
+        pass
+    except (PyPdfError, OSError, ValueError):
+        # Damaged or encrypted files are still found by title
+        pass
+    return {"name": path.name, "title": title, "pages": pages}, "\n".join(part for part in parts if part.strip())
+
+
+def build_generation(documents, texts, directory):
+    """Write the postings of `texts` to `directory`"""
+    rows = []
+    lengths = np.zeros(len(texts), dtype=np.int32)
+    for doc, text in enumerate(texts):
+        tokens = tokenize(text)
+        lengths[doc] = len(tokens)
+        counts, first = Counter(), {}
+        for term, offset in tokens:
+            counts[term] += 1
+            first.setdefault(term, offset)
+        rows += [(term, doc, count, first[term]) for term, count in counts.items()]
+    rows.sort()
+    per_term = Counter(term for term, *_ in rows)
+    vocabulary = sorted(per_term)
+    term_ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    term_ptr[1:] = np.cumsum([per_term[term] for term in vocabulary])
+    columns = list(zip(*rows)) or [(), (), (), ()]
+    arrays = {
+        "term_ptr": term_ptr,
+        "post_doc": np.array(columns[1], dtype=np.int32),
+        "post_tf": np.array(columns[2], dtype=np.int32),
+        "post_offset": np.array(columns[3], dtype=np.int32),
+        "lengths": lengths,
+    }
+    directory.mkdir(parents=True)
+    for key, values in arrays.items():
+        np.save(directory / f"{key}.npy", values)
+    (directory / "texts.json").write_text(json.dumps(texts))
+    meta = {"version": INDEX_VERSION, "documents": documents, "vocabulary": vocabulary}
+    (directory / "meta.json").write_text(json.dumps(meta))
+
+
+def load_index(directory):
+    """Open an index generation with its posting arrays memory-mapped"""
+    meta = json.loads((directory / "meta.json").read_text())
+    if meta.get("version") != INDEX_VERSION:
+        raise ValueError(f"search index version {meta.get('version')} is not {INDEX_VERSION}")
+    arrays = {key: np.load(directory / f"{key}.npy", mmap_mode="r")
+              for key in ("term_ptr", "post_doc", "post_tf", "post_offset", "lengths")}
+    return SearchIndex(directory=directory, documents=meta["documents"],
+                       texts=json.loads((directory / "texts.json").read_text()), vocabulary=meta["vocabulary"],
+                       term_ids={term: k for k, term in enumerate(meta["vocabulary"])}, **arrays)
+
+
+def current_index(search_dir=SEARCH_DIR):
+    """The index generation named by the CURRENT file, or None"""
+    try:
+        return load_index(search_dir / (search_dir / "CURRENT").read_text().strip())
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _building(directory):
+    """Whether a generation is still being written by a live process (meta.json is written last)"""
+    if (directory / "meta.json").exists():
+        return False
+    try:
+        os.kill(int(directory.name[1:].split("-")[0]), 0)
+    except ValueError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _prune_generations(search_dir, keep):
+    """Delete generations older than the kept ones and than any build still in progress.
+
+    A reader in another process may still have the previous generation
+    open, and a concurrent build may be about to point CURRENT at its own
+    directory, so only directories older than all of those are removed.
+    """
+    generations = {}
+    for path in search_dir.iterdir():
+        try:
+            if path.is_dir():
+                generations[path] = path.stat().st_mtime_ns
+        except OSError:
+            # Removed by another process meanwhile
+            pass
+    protected = [path for path in generations if path.name in keep or _building(path)]
+    if not protected:
+        return
+    cutoff = min(generations[path] for path in protected)
+    for old, mtime in generations.items():
+        if old not in protected and mtime < cutoff:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def update_index(paths=None, search_dir=SEARCH_DIR):
+    """Bring the index up to date with `paths` (default: the Assets/ documents).
+
+    Unchanged files keep their stored text; new or modified files are
+    extracted; removed files are dropped. Nothing is written when no file
+    changed. Returns the current index and the number of files extracted.
+    """
+    paths = list_assets() if paths is None else paths
+    current = current_index(search_dir)
+    previous = {}
+    if current is not None:
+        previous = {doc["name"]: (doc, text) for doc, text in zip(current.documents, current.texts)}
+    documents, texts, extracted = [], [], 0
+    for path in paths:
+        stat = path.stat()
+        known = previous.get(path.name)
+        if known and (known[0]["mtime_ns"], known[0]["size"]) == (stat.st_mtime_ns, stat.st_size):
+            doc, text = known
+        else:
+            doc, text = extract_document(path)
+            doc.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            extracted += 1
+        documents.append(doc)
+        texts.append(text)
+    if current is not None and not extracted and len(documents) == len(previous):
+        return current, 0
+
+    generation = f"g{os.getpid()}-{os.urandom(4).hex()}"
+    build_generation(documents, texts, search_dir / generation)
+    pointer = search_dir / f"CURRENT.{generation}.tmp"
+    pointer.write_text(generation)
+    pointer.replace(search_dir / "CURRENT")
+    _prune_generations(search_dir, keep={generation, current.directory.name if current is not None else None})
+    return load_index(search_dir / generation), extracted
+
+
+def _query_terms(index, query):
+    """Term ids of the query words; the last word also matches as a prefix while it is being typed"""
+    words = [term for term, _ in tokenize(query)]
+    ids = {index.term_ids[word] for word in words if word in index.term_ids}
+    if words:
+        start = bisect.bisect_left(index.vocabulary, words[-1])
+        for k in range(start, min(start + PREFIX_EXPANSIONS, len(index.vocabulary))):
+            if not index.vocabulary[k].startswith(words[-1]):
+                break
+            ids.add(k)
+    return sorted(ids)
+
+
+def snippet(text, offset, terms, width=SNIPPET_CHARS):
+    """A window of `text` around `offset` with the matched words in bold"""
+    start = max(0, offset - width // 3)
+    end = min(len(text), start + width)
+    if start:
+        start = text.find(" ", start, offset) + 1 or start
+    window = " ".join(text[start:end].split())
+    if terms:
+        pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\w*", re.IGNORECASE)
+        window = pattern.sub(lambda match: f"**{match.group()}**", window)
+    return f"{'…' if start else ''}{window}{'…' if end < len(text) else ''}"
+
+
+def search(index, query, limit=10):
+    """BM25-ranked documents for a free-text query"""
+    term_ids = _query_terms(index, query)
+    count = len(index.documents)
+    if not term_ids or not count:
+        return []
+    lengths = np.asarray(index.lengths, dtype=float)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+    scores = np.zeros(count)
+    best = np.zeros(count)
+    anchor = np.zeros(count, dtype=np.int64)
+    for term in term_ids:
+        lo, hi = index.term_ptr[term], index.term_ptr[term + 1]
+        docs, tf = index.post_doc[lo:hi], index.post_tf[lo:hi].astype(float)
+        idf = np.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+        gain = idf * tf * (BM25_K1 + 1) / (tf + norm[docs])
+        scores[docs] += gain
+        # The snippet is anchored at the term that contributes most to each document
+        better = gain > best[docs]
+        best[docs[better]] = gain[better]
+        anchor[docs[better]] = index.post_offset[lo:hi][better]
+    words = [term for term, _ in tokenize(query)]
+    hits = []
+    for doc in np.argsort(-scores, kind="stable")[:limit]:
+        if scores[doc] <= 0:
+            break
+        meta = index.documents[doc]
+        hits.append(SearchHit(name=meta["name"], title=meta["title"], pages=meta["pages"], score=float(scores[doc]),
+                              snippet=snippet(index.texts[doc], int(anchor[doc]), words)))
+    return hits
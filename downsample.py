@@ -0,0 +1,42 @@
+"""Largest-Triangle-Three-Buckets downsampling for long chart series.
+
+Charts never need more points than the screen has pixels. LTTB keeps the
+first and last points and, from every bucket in between, the point that
+spans the largest triangle with the previously kept point and the mean of
+the next bucket, so peaks and troughs survive the reduction.
+"""
+import numpy as np
+import pandas as pd
+
+
+def lttb(y, threshold, x=None):
+    """Sorted indices of at most `threshold` points of a finite series chosen by LTTB"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        following = slice(end, edges[bucket + 2] if bucket + 2 < len(edges) else n)
+        mean_x, mean_y = x[following].mean(), y[following].mean()
+        area = np.abs((x[previous] - mean_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (mean_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        keep[bucket + 1] = previous
+    return keep
+
+
+def downsample_series(series, threshold=1000):
+    """Series (or single-column frame) reduced to at most `threshold` points with LTTB; NaNs are dropped"""
+    series = series.dropna()
+    values = series.to_numpy(dtype=float).reshape(len(series), -1)[:, 0]
+    index = series.index
+    x = index.to_numpy(dtype=float) if pd.api.types.is_numeric_dtype(index) else None
+    return series.iloc[lttb(values, threshold, x)]
@@ -0,0 +1,67 @@
+"""Shared image loader with a process-wide decode cache and on-disk display renditions"""
+import hashlib
+import os
+from io import BytesIO
+
+import streamlit as st
+from PIL import Image, features
+
+from asset_store import APP_DIR, resolve_asset
+
+RENDITION_DIR = APP_DIR / ".cache" / "renditions"
+
+RENDITION_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _decode_image(path, mtime_ns, size):
+    """Decode an image once per process; mtime and size make edits invalidate the entry"""
+    with Image.open(path) as img:
+        img.load()
+        return img.copy()
+
+
+def load_image(relative_path):
+    """Return the decoded image for a path, resolved case-insensitively"""
+    path = resolve_asset(relative_path)
+    stat = path.stat()
+    return _decode_image(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _encode_rendition(img, width, fmt):
+    """Downscale an image to the display width and encode it"""
+    if img.width > width:
+        height = max(1, round(img.height * width / img.width))
+        img = img.resize((width, height), Image.LANCZOS)
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buffer = BytesIO()
+    img.save(buffer, format=fmt, quality=85)
+    return buffer.getvalue()
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _rendition_bytes(path, mtime_ns, size, width, fmt):
+    """Load a rendition from the disk cache, creating it from the decoded image on a miss"""
+    key = hashlib.sha1(f"{path}|{mtime_ns}|{size}|{width}|{fmt}".encode()).hexdigest()
+    cached = RENDITION_DIR / f"{key}.{fmt.lower()}"
+    if cached.exists():
+        return cached.read_bytes()
+
+    data = _encode_rendition(_decode_image(path, mtime_ns, size), width, fmt)
+    try:
+        RENDITION_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(cached)
+    except OSError:
+        # A read-only deployment still serves the in-memory rendition
+        pass
+    return data
+
+
+def image_rendition(relative_path, width=300, fmt=RENDITION_FORMAT):
+    """Return encoded bytes of an image resized for display at the given width"""
+    path = resolve_asset(relative_path)
+    stat = path.stat()
+    return _rendition_bytes(str(path), stat.st_mtime_ns, stat.st_size, width, fmt)
@@ -0,0 +1,218 @@
+"""Opt-in timing spans for the render path, exported as Prometheus metrics or a JSON log.
+
+Instrumentation is off unless one of these environment variables is set
+when the app starts:
+
+- PORTFOLIO_METRICS_PORT: serve Prometheus text format on
+  http://127.0.0.1:<port>/metrics
+- PORTFOLIO_METRICS_LOG: append a JSON snapshot of all spans to this file
+  every PORTFOLIO_METRICS_INTERVAL seconds (default 60)
+
+A span records its wall time, the number of elements it sent to the
+browser and their serialized size. Element counts come from one hook on
+Streamlit's message queue that adds each delta to the spans open on the
+script thread, so nested spans include their children. Observations go
+into fixed-bucket histograms per span name.
+
+When disabled, `instrument` returns the function unchanged and `span`
+returns one shared no-op context manager.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+METRICS_PORT = int(os.environ.get("PORTFOLIO_METRICS_PORT") or 0)
+METRICS_LOG = os.environ.get("PORTFOLIO_METRICS_LOG")
+METRICS_INTERVAL = float(os.environ.get("PORTFOLIO_METRICS_INTERVAL") or 60)
+ENABLED = bool(METRICS_PORT or METRICS_LOG)
+
+# Prometheus-style upper bounds, each with an implicit +Inf bucket
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ELEMENTS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+METRICS = {
+    "seconds": ("portfolio_span_seconds", "Wall time of a render span", SECONDS_BUCKETS),
+    "elements": ("portfolio_span_elements", "Elements sent to the browser during a span", ELEMENTS_BUCKETS),
+    "bytes": ("portfolio_span_payload_bytes", "Serialized delta bytes sent during a span", BYTES_BUCKETS),
+}
+
+log = logging.getLogger(__name__)
+_NULL_SPAN = contextlib.nullcontext()
+_active = threading.local()
+_lock = threading.Lock()
+_started = False
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a running sum and count"""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = next((k for k, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total, buckets = 0, []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+
+_histograms = {}  # span name -> {metric: Histogram}
+
+
+class _Span:
+    def __init__(self, name):
+        self.name = name
+        self.elements = 0
+        self.bytes = 0
+
+    def __enter__(self):
+        stack = getattr(_active, "stack", None)
+        if stack is None:
+            stack = _active.stack = []
+        stack.append(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self._started
+        _active.stack.remove(self)
+        observe(self.name, seconds=seconds, elements=self.elements, bytes=self.bytes)
+
+
+def observe(name, **values):
+    """Add one observation per metric (seconds, elements, bytes) to the histograms of `name`"""
+    with _lock:
+        histograms = _histograms.get(name)
+        if histograms is None:
+            histograms = _histograms[name] = {metric: Histogram(METRICS[metric][2]) for metric in METRICS}
+        for metric, value in values.items():
+            histograms[metric].observe(value)
+
+
+def span(name):
+    """Context manager timing a block of the render path under `name`"""
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def instrument(func):
+    """Decorator recording a span named after the function for every call"""
+    if not ENABLED:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _Span(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _count_deltas(enqueue):
+    """Wrap ScriptRunContext.enqueue so deltas are added to the spans open on this thread"""
+
+    @functools.wraps(enqueue)
+    def wrapper(self, msg):
+        stack = getattr(_active, "stack", None)
+        if stack and msg.WhichOneof("type") == "delta":
+            size = msg.ByteSize()
+            for open_span in stack:
+                open_span.elements += 1
+                open_span.bytes += size
+        return enqueue(self, msg)
+
+    return wrapper
+
+
+def snapshot():
+    """Copy of every histogram as plain data"""
+    with _lock:
+        return {
+            name: {metric: {"buckets": [["+Inf" if bound == float("inf") else bound, count]
+                                        for bound, count in histogram.cumulative()],
+                            "sum": histogram.sum, "count": histogram.count}
+                   for metric, histogram in histograms.items()}
+            for name, histograms in sorted(_histograms.items())
+        }
+
+
+def prometheus_text():
+    """All histograms in the Prometheus text exposition format"""
+    data = snapshot()
+    lines = []
+    for metric, (family, help_text, _) in METRICS.items():
+        lines += [f"# HELP {family} {help_text}", f"# TYPE {family} histogram"]
+        for name, histograms in data.items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            histogram = histograms[metric]
+            for bound, count in histogram["buckets"]:
+                le = bound if bound == "+Inf" else f"{bound:g}"
+                lines.append(f'{family}_bucket{{span="{label}",le="{le}"}} {count}')
+            lines.append(f'{family}_sum{{span="{label}"}} {histogram["sum"]:g}')
+            lines.append(f'{family}_count{{span="{label}"}} {histogram["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_log(path, interval):
+    while True:
+        time.sleep(interval)
+        record = {"time": time.time(), "spans": snapshot()}
+        with open(path, "a") as handle:
+            handle.write(json.dumps(record) + "\n")
+
+
+def start():
+    """Hook the message queue and start the exporters once per process; does nothing when disabled"""
+    global _started
+    if not ENABLED:
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+
+    ScriptRunContext.enqueue = _count_deltas(ScriptRunContext.enqueue)
+    if METRICS_PORT:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", METRICS_PORT), _MetricsHandler)
+        except OSError as error:
+            # Port taken, e.g. by a second instance or a restart before the old one let go; the log still runs
+            log.error("metrics endpoint not started on port %s: %s", METRICS_PORT, error)
+        else:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    if METRICS_LOG:
+        Path(METRICS_LOG).parent.mkdir(parents=True, exist_ok=True)
+        threading.Thread(target=_write_log, args=(METRICS_LOG, METRICS_INTERVAL), name="metrics-log",
+                         daemon=True).start()
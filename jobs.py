@@ -0,0 +1,285 @@
+"""Background jobs: CPU-heavy computations in a process pool shared by every session.
+
+A job runs `func(*args)` in a worker process, so a long computation
+neither holds the session's script thread nor the GIL other sessions
+need. `func` must be importable from a module, since it is pickled by
+name. Each job gets a handle that sessions keep in their state and poll.
+
+Inside a job, `progress(fraction, message)` reports how far it is. The
+report is sent over a queue that a thread in the server process reads.
+The same call is where cancellation takes effect. A queued job is
+dropped at once. A running job raises JobCancelled at its next
+`progress` call, because a worker process cannot be interrupted
+mid-computation; until then it still counts towards its owner's cap.
+
+Each owner (one visitor) can have at most `per_owner` jobs queued or
+running, so one visitor cannot fill the pool. Short tasks without a
+job handle (page thumbnails) go through `run`, which keeps at most
+`max_tasks` of them in the pool and queues the rest outside it, so a
+burst of them never lines up ahead of everyone's jobs. Finished results
+are kept in a small LRU and shared, so a repeated request returns
+without computing again.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import instrumentation
+
+JOB_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MAX_JOBS_PER_OWNER = 2
+MAX_POOL_TASKS = max(1, JOB_WORKERS // 2)
+RESULT_CACHE_SIZE = 32
+CANCEL_SLOTS = 4096
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+# Worker-process state, set by the pool initializer and `_run`
+_progress_queue = None
+_cancel_flags = None
+_current = None  # (job id, cancel slot) of the job running in this worker
+
+
+class JobCancelled(Exception):
+    """Raised inside a job that was cancelled while running"""
+
+
+def _init_worker(progress_queue, cancel_flags):
+    global _progress_queue, _cancel_flags
+    _progress_queue, _cancel_flags = progress_queue, cancel_flags
+
+
+def _run(job_id, slot, func, args):
+    """`func(*args)` and the seconds the worker spent on it"""
+    global _current
+    _current = (job_id, slot)
+    try:
+        progress(0.0)
+        started = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - started
+    finally:
+        _current = None
+
+
+def progress(fraction, message=""):
+    """Report progress of the running job (0 to 1) and stop it if it was cancelled; no-op outside a job"""
+    if _current is None:
+        return
+    job_id, slot = _current
+    if _cancel_flags[slot]:
+        raise JobCancelled()
+    _progress_queue.put((job_id, fraction, message))
+
+
+class Job:
+    """Handle of one submitted computation"""
+
+    def __init__(self, job_id, slot, key, label, owner):
+        self.id = job_id
+        self.slot = slot  # cancel flag, owned by this job until its worker has stopped
+        self.key = key
+        self.label = label
+        self.owner = owner
+        self.future = None
+        self.progress = 0.0
+        self.message = ""
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.cancelled = False
+
+    @property
+    def status(self):
+        # A future can also be cancelled without `cancel`, e.g. when the scheduler is closed
+        if self.cancelled or self.future.cancelled():
+            return CANCELLED
+        if self.future.done():
+            error = self.future.exception()
+            if error is None:
+                return DONE
+            return CANCELLED if isinstance(error, JobCancelled) else FAILED
+        return RUNNING if self.started else QUEUED
+
+    @property
+    def error(self):
+        """Description of the failure of a FAILED job"""
+        if self.status != FAILED:
+            return None
+        error = self.future.exception()
+        return f"{type(error).__name__}: {error}"
+
+    def result(self):
+        return self.future.result()[0]
+
+    @property
+    def seconds(self):
+        """Time the worker spent computing a DONE job, without queueing and transfer"""
+        return self.future.result()[1]
+
+    def elapsed(self):
+        return (self.finished or time.time()) - (self.started or self.submitted)
+
+
+class JobScheduler:
+    """Submits jobs to a shared process pool, with per-owner caps, progress and cancellation"""
+
+    def __init__(self, workers=JOB_WORKERS, per_owner=MAX_JOBS_PER_OWNER, cache_size=RESULT_CACHE_SIZE,
+                 max_tasks=MAX_POOL_TASKS):
+        self.workers = workers
+        self.per_owner = per_owner
+        self.cache_size = cache_size
+        self.max_tasks = max_tasks
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = self._context.Queue()
+        self._cancel_flags = self._context.RawArray("b", CANCEL_SLOTS)
+        self.pool = self._new_pool()
+        self._active = {}  # job id -> Job queued or running
+        self._results = OrderedDict()  # key -> finished Job, least recently used first
+        self._free_slots = list(range(CANCEL_SLOTS))
+        self._tasks = deque()  # (Future, func, args) of `run` tasks waiting for room in the pool
+        self._tasks_running = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_progress, name="job-progress", daemon=True)
+        self._reader.start()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(self.workers, mp_context=self._context, initializer=_init_worker,
+                                   initargs=(self._progress, self._cancel_flags))
+
+    @staticmethod
+    def key(func, args):
+        return func.__module__, func.__qualname__, args
+
+    def active(self, owner):
+        """Number of jobs of `owner` that are queued or running"""
+        with self._lock:
+            return sum(job.owner == owner for job in self._active.values())
+
+    def _pool_submit(self, func, *args):
+        """Submit to the pool, replacing it if a worker died (out of memory, killed); caller holds the lock"""
+        try:
+            return self.pool.submit(func, *args)
+        except BrokenProcessPool:
+            self.pool = self._new_pool()
+            return self.pool.submit(func, *args)
+
+    def run(self, func, *args):
+        """Future of `func(*args)` on the shared pool, for short tasks that need no job handle or progress.
+
+        At most `max_tasks` such tasks are in the pool at once; the others wait here in order.
+        """
+        future = Future()
+        with self._lock:
+            self._tasks.append((future, func, args))
+        self._start_tasks()
+        return future
+
+    def _start_tasks(self):
+        started = []
+        with self._lock:
+            while self._tasks and self._tasks_running < self.max_tasks:
+                future, func, args = self._tasks.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    started.append((future, self._pool_submit(func, *args)))
+                except RuntimeError as error:
+                    # The pool was shut down
+                    future.set_exception(error)
+                    continue
+                self._tasks_running += 1
+        for future, pool_future in started:
+            pool_future.add_done_callback(lambda done, future=future: self._task_done(future, done))
+
+    def _task_done(self, future, done):
+        with self._lock:
+            self._tasks_running -= 1
+        if done.cancelled():
+            future.set_exception(CancelledError())
+        elif done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            future.set_result(done.result())
+        self._start_tasks()
+
+    def submit(self, owner, func, *args, label=None):
+        """Handle of a job computing `func(*args)` for `owner`; None when the owner is at the cap.
+
+        A result that is still cached comes back as an already finished job.
+        """
+        key = self.key(func, args)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+            if sum(job.owner == owner for job in self._active.values()) >= self.per_owner or not self._free_slots:
+                return None
+            job = Job(next(self._ids), self._free_slots.pop(), key, label or func.__name__, owner)
+            self._cancel_flags[job.slot] = 0
+            job.future = self._pool_submit(_run, job.id, job.slot, func, args)
+            self._active[job.id] = job
+        job.future.add_done_callback(lambda future: self._finished(job))
+        return job
+
+    def cancel(self, job):
+        """Drop a queued job at once, or ask a running one to stop at its next progress report.
+
+        The job stays active, and counts towards its owner's cap, until its
+        worker has actually stopped.
+        """
+        with self._lock:
+            if job.future.done():
+                return
+            job.cancelled = True
+            job.finished = time.time()
+            self._cancel_flags[job.slot] = 1
+        # Outside the lock: cancelling a queued future runs `_finished` right away
+        job.future.cancel()
+
+    def close(self):
+        """Stop the pool and the progress reader; running jobs are cancelled at their next progress report"""
+        with self._lock:
+            for job in self._active.values():
+                self._cancel_flags[job.slot] = 1
+            waiting, self._tasks = self._tasks, deque()
+        for future, _, _ in waiting:
+            future.cancel()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self._progress.put(None)
+        self._reader.join()
+        self._progress.close()
+
+    def _finished(self, job):
+        with self._lock:
+            self._active.pop(job.id, None)
+            # The worker has stopped, so no one reads this flag any more
+            self._free_slots.append(job.slot)
+            job.finished = job.finished or time.time()
+            if job.cancelled or job.future.cancelled() or job.future.exception() is not None:
+                return
+            job.progress = 1.0
+            self._results[job.key] = job
+            if instrumentation.ENABLED:
+                # Time of the computation in the worker, not of the rerun that submitted it
+                instrumentation.observe(f"job: {job.label}", seconds=job.seconds)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+
+    def _read_progress(self):
+        while True:
+            report = self._progress.get()
+            if report is None:
+                return
+            job_id, fraction, message = report
+            with self._lock:
+                job = self._active.get(job_id)
+                if job is not None:
+                    job.started = job.started or time.time()
+                    job.progress, job.message = fraction, message
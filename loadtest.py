@@ -0,0 +1,274 @@
+"""Concurrent-session load test of the portfolio against a local Streamlit server.
+
+Starts `streamlit run pythonmainfile.py` on localhost and connects N
+simulated browsers to its websocket (/_stcore/stream). Each session
+speaks the same protobuf protocol as the frontend: it sends BackMsg
+rerun requests and reads ForwardMsgs until the script_finished message.
+A session loads the home page, navigates through every page, then
+switches the Algorithms page picker through each visualization (a
+fragment rerun, as the browser sends it). When a rerun leaves a job
+progress bar on the page, the session polls that fragment like the
+browser does until the background job has finished.
+
+For each concurrency level the tool reports throughput, p50/p95/p99
+rerun latency, p95 time until background jobs finished, and the
+resident memory of the server plus its job worker processes.
+
+    python loadtest.py --sessions 1 5 10 25 --rounds 2
+
+The simulated browsers need the `websockets` package, a development
+dependency the app itself does not use: `pip install websockets`.
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+APP_DIR = Path(__file__).resolve().parent
+MAIN_SCRIPT = APP_DIR / "pythonmainfile.py"
+ALGORITHM_PICKER = "Choose Algorithm to Visualize:"
+ALGORITHMS_PAGE = "algorithms"
+STARTUP_TIMEOUT = 60
+RERUN_TIMEOUT = 300
+JOB_POLL_SECONDS = 0.5  # run_every of the job progress fragment
+JOB_PROGRESS_PREFIX = "⚙️ "  # text of a job progress bar, as opposed to a static one (skill levels)
+
+
+class SimulatedSession:
+    """One browser tab: a websocket connection that requests reruns and waits for them to finish"""
+
+    def __init__(self, url):
+        self.url = url
+        self.pages = {}  # url pathname -> page script hash, from the navigation message
+        self.selectboxes = {}  # label -> (widget id, options, fragment id)
+        self.latencies = []  # (action, seconds)
+        self.job_waits = []  # (action, seconds until its background jobs finished)
+        self.errors = 0
+        self._polling = set()  # fragment ids that drew a job progress bar in the last rerun
+
+    async def __aenter__(self):
+        self._socket = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._socket.close()
+
+    def _read(self, message):
+        kind = message.WhichOneof("type")
+        if kind == "navigation":
+            self.pages = {page.url_pathname: page.page_script_hash for page in message.navigation.app_pages}
+        elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+            element = message.delta.new_element
+            if element.WhichOneof("type") == "selectbox":
+                box = element.selectbox
+                self.selectboxes[box.label] = (box.id, list(box.options), message.delta.fragment_id)
+            elif element.WhichOneof("type") == "exception":
+                self.errors += 1
+            elif element.WhichOneof("type") == "progress" and element.progress.text.startswith(JOB_PROGRESS_PREFIX):
+                self._polling.add(message.delta.fragment_id)
+
+    async def rerun(self, action, page="", widgets=(), fragment_id=""):
+        """Request a rerun and wait until the server reports the script finished"""
+        request = BackMsg()
+        state = request.rerun_script
+        state.page_script_hash = self.pages.get(page, "")
+        state.widget_states.widgets.extend(widgets)
+        state.fragment_id = fragment_id
+        self._polling = set()
+        started = time.perf_counter()
+        await self._socket.send(request.SerializeToString())
+        while True:
+            message = ForwardMsg.FromString(await asyncio.wait_for(self._socket.recv(), RERUN_TIMEOUT))
+            self._read(message)
+            if (message.WhichOneof("type") == "script_finished"
+                    and message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN):
+                break
+        self.latencies.append((action, time.perf_counter() - started))
+
+    async def settle(self, action, page="", widgets=()):
+        """Poll the job progress fragments of the last rerun, as the browser does, until none is left"""
+        if not self._polling:
+            return
+        started = time.perf_counter()
+        deadline = started + RERUN_TIMEOUT
+        while self._polling and time.perf_counter() < deadline:
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            for fragment_id in list(self._polling):
+                await self.rerun(f"poll {action}", page, widgets, fragment_id)
+        self.job_waits.append((action, time.perf_counter() - started))
+
+    async def act(self, action, page="", widgets=(), fragment_id=""):
+        """A rerun followed by waiting for the background jobs it started"""
+        await self.rerun(action, page, widgets, fragment_id)
+        await self.settle(action, page, widgets)
+
+    async def browse(self):
+        """Home, every page in navigation order, then each algorithm of the picker"""
+        await self.act("load")
+        for page in list(self.pages)[1:]:
+            await self.act(f"page {page}", page)
+        if ALGORITHMS_PAGE in self.pages:
+            await self.act(f"page {ALGORITHMS_PAGE}", ALGORITHMS_PAGE)
+            widget_id, options, fragment_id = self.selectboxes[ALGORITHM_PICKER]
+            for option in options:
+                await self.act(f"algorithm {option}", ALGORITHMS_PAGE,
+                               [WidgetState(id=widget_id, string_value=option)], fragment_id)
+
+
+async def run_session(url, rounds):
+    async with SimulatedSession(url) as session:
+        for _ in range(rounds):
+            await session.browse()
+    return session
+
+
+async def run_level(url, sessions, rounds):
+    """Run `sessions` concurrent sessions; returns them and the wall time"""
+    started = time.perf_counter()
+    finished = await asyncio.gather(*(run_session(url, rounds) for _ in range(sessions)))
+    return finished, time.perf_counter() - started
+
+
+def process_tree(pid):
+    """`pid` and all its descendants (the spawned job and thumbnail workers), from /proc on Linux"""
+    children = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # The command name may contain spaces and parentheses; the parent pid follows its closing ")"
+            parent = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(stat.parent.name))
+    tree, stack = [], [pid]
+    while stack:
+        tree.append(stack.pop())
+        stack.extend(children.get(tree[-1], []))
+    return tree
+
+
+def process_memory(pid):
+    """Current and peak resident set size (MB) of a process and its descendants, from /proc on Linux.
+
+    The peak is the sum of each process's own peak, so it can exceed what
+    was ever resident at one time.
+    """
+    rss = peak = None
+    for member in process_tree(pid):
+        try:
+            fields = dict(line.split(":", 1) for line in Path(f"/proc/{member}/status").read_text().splitlines())
+        except OSError:
+            continue
+        if "VmRSS" in fields:
+            rss = (rss or 0) + int(fields["VmRSS"].split()[0]) / 1024
+        if "VmHWM" in fields:
+            peak = (peak or 0) + int(fields["VmHWM"].split()[0]) / 1024
+    return rss, peak
+
+
+def start_server(port):
+    """Launch the app headless on localhost and wait until its health check answers"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(MAIN_SCRIPT), "--server.headless=true",
+         f"--server.port={port}", "--server.address=127.0.0.1", "--server.fileWatcherType=none",
+         "--browser.gatherUsageStats=false"],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not answer on port {port} within {STARTUP_TIMEOUT} s")
+
+
+def summarize(sessions, seconds, level, pid):
+    latencies = np.array([latency for session in sessions for _, latency in session.latencies])
+    job_waits = [wait for session in sessions for _, wait in session.job_waits]
+    rss, peak = process_memory(pid)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "sessions": level,
+        "reruns": len(latencies),
+        "errors": sum(session.errors for session in sessions),
+        "seconds": round(seconds, 3),
+        "reruns_per_s": round(len(latencies) / seconds, 2),
+        "p50_ms": round(p50, 1),
+        "p95_ms": round(p95, 1),
+        "p99_ms": round(p99, 1),
+        "jobs": len(job_waits),
+        "job_p95_ms": round(float(np.percentile(job_waits, 95)) * 1000, 1) if job_waits else None,
+        "rss_mb": rss and round(rss, 1),
+        "peak_rss_mb": peak and round(peak, 1),
+    }
+
+
+def slowest_actions(sessions, top=5):
+    by_action = {}
+    for session in sessions:
+        for action, latency in session.latencies:
+            by_action.setdefault(action, []).append(latency)
+    medians = sorted(((float(np.median(values)), action) for action, values in by_action.items()), reverse=True)
+    return [(action, round(1000 * median, 1)) for median, action in medians[:top]]
+
+
+async def load_test(port, levels, rounds, warmup):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    server = start_server(port)
+    try:
+        if warmup:
+            # Fill the app's caches so the first level is not dominated by one-off work
+            await run_level(url, 1, warmup)
+        print(f"{'Sessions':>8}{'Reruns':>8}{'Errors':>8}{'Rerun/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'Jobs':>6}{'Job p95':>9}{'RSS MB':>9}{'Peak MB':>9}")
+        rows = []
+        for level in levels:
+            sessions, seconds = await run_level(url, level, rounds)
+            row = summarize(sessions, seconds, level, server.pid)
+            row["slowest"] = slowest_actions(sessions)
+            rows.append(row)
+            print(f"{row['sessions']:>8}{row['reruns']:>8}{row['errors']:>8}{row['reruns_per_s']:>9}"
+                  f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['jobs']:>6}"
+                  f"{row['job_p95_ms'] or '-':>9}{row['rss_mb'] or '-':>9}"
+                  f"{row['peak_rss_mb'] or '-':>9}", flush=True)
+        return rows
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25], help="concurrency levels")
+    parser.add_argument("--rounds", type=int, default=1, help="walks through the app per session")
+    parser.add_argument("--warmup", type=int, default=1, help="single-session walks before measuring")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    rows = asyncio.run(load_test(args.port, args.sessions, args.rounds, args.warmup))
+    print("\nSlowest actions at the highest level (median ms):")
+    for action, median in rows[-1]["slowest"]:
+        print(f"  {action:<40}{median:>10}")
+    if args.output:
+        args.output.write_text(json.dumps(rows, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+    return 1 if any(row["errors"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
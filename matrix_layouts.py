@@ -0,0 +1,113 @@
+"""Cell orderings used by the genomic matrix visualizations.
+
+Every layout returns a (size, size) matrix holding the 1-based rank of each
+cell along the path, computed with whole-array NumPy operations instead of
+walking the path one cell at a time.
+"""
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+# Colour stops of the portfolio theme, from the first cell to the last
+HEATMAP_STOPS = ["#F5F5F5", "#B2DFDB", "#26A69A", "#2E7D32", "#7B1FA2"]
+
+
+def spiral_order(size):
+    """Clockwise spiral starting at the top-left corner.
+
+    A cell on ring k (its distance to the nearest border) comes after the
+    size² - (size - 2k)² cells of the outer rings; its offset inside the
+    ring depends on which side of the ring it sits on.
+    """
+    i, j = np.indices((size, size), dtype=np.int64)
+    ring = np.minimum(np.minimum(i, j), np.minimum(size - 1 - i, size - 1 - j))
+    side = size - 2 * ring
+    edge = side - 1
+    far = size - 1 - ring
+    offset = np.select(
+        [i == ring, j == far, i == far],
+        [j - ring, edge + (i - ring), 2 * edge + (far - j)],
+        default=3 * edge + (far - i),
+    )
+    return size * size - side * side + offset + 1
+
+
+def _diagonal_start(d, size):
+    """Number of cells on the anti-diagonals before anti-diagonal d"""
+    upper = d * (d + 1) // 2
+    remaining = 2 * size - 1 - d
+    lower = size * size - remaining * (remaining + 1) // 2
+    return np.where(d < size, upper, lower)
+
+
+def diagonal_order(size):
+    """Anti-diagonals from the top-left corner, each walked top to bottom"""
+    i, j = np.indices((size, size), dtype=np.int64)
+    d = i + j
+    first_row = np.maximum(0, d - size + 1)
+    return _diagonal_start(d, size) + (i - first_row) + 1
+
+
+def zigzag_order(size):
+    """JPEG-style zigzag: anti-diagonals with alternating direction"""
+    i, j = np.indices((size, size), dtype=np.int64)
+    d = i + j
+    first_row = np.maximum(0, d - size + 1)
+    last_row = np.minimum(d, size - 1)
+    within = np.where(d % 2 == 0, last_row - i, i - first_row)
+    return _diagonal_start(d, size) + within + 1
+
+
+def hilbert_order(size):
+    """Hilbert curve; sizes that are not a power of two use the curve of the enclosing power of two"""
+    side = 1 << max(0, int(size - 1).bit_length())
+    y, x = np.indices((size, size), dtype=np.int64)
+    distance = np.zeros((size, size), dtype=np.int64)
+    s = side // 2
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        distance += s * s * ((3 * rx) ^ ry)
+        flip = rx & ~ry
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s //= 2
+    if side == size:
+        return distance + 1
+    ranks = np.empty(size * size, dtype=np.int64)
+    ranks[np.argsort(distance, axis=None)] = np.arange(1, size * size + 1)
+    return ranks.reshape(size, size)
+
+
+MATRIX_LAYOUTS = {
+    "Spiral": spiral_order,
+    "Diagonal": diagonal_order,
+    "Zigzag": zigzag_order,
+    "Hilbert Curve": hilbert_order,
+}
+
+
+def _color_table(stops, levels=256):
+    """Linear RGB lookup table through the given hex colour stops"""
+    rgb = np.array([[int(stop[k:k + 2], 16) for k in (1, 3, 5)] for stop in stops], dtype=float)
+    positions = np.linspace(0, 1, len(stops))
+    samples = np.linspace(0, 1, levels)
+    return np.stack([np.interp(samples, positions, rgb[:, c]) for c in range(3)], axis=1).astype(np.uint8)
+
+
+HEATMAP_TABLE = _color_table(HEATMAP_STOPS)
+
+
+def heatmap_image(values, max_side=1000, fmt="PNG"):
+    """Encode a matrix as a single colour-mapped image, downsampled to at most `max_side` pixels"""
+    values = np.asarray(values, dtype=float)
+    step = max(1, -(-max(values.shape) // max_side))
+    values = values[::step, ::step]
+    low, high = np.nanmin(values), np.nanmax(values)
+    scaled = (values - low) / ((high - low) or 1.0)
+    levels = np.nan_to_num(scaled * (len(HEATMAP_TABLE) - 1)).astype(np.int64)
+    buffer = BytesIO()
+    Image.fromarray(HEATMAP_TABLE[levels]).save(buffer, format=fmt)
+    return buffer.getvalue()
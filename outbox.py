@@ -0,0 +1,305 @@
+"""Durable outbox for contact form messages, delivered over SMTP in the background.
+
+Submitting a message only writes a row to a local SQLite outbox, so the
+form returns at once. An asyncio worker on its own thread claims due
+messages and sends them through smtplib in worker threads. A failure is
+retried with exponential backoff and jitter, until the message is marked
+failed after MAX_ATTEMPTS. Pending messages survive restarts. Identical
+messages (same sender, subject and text) within DEDUPE_SECONDS are
+stored once, and a token bucket per client limits how often the form
+can be used.
+
+SMTP settings come from CONTACT_SMTP_* environment variables. The
+default is localhost:8025, where `python outbox.py` starts an aiosmtpd
+server that prints every message it receives. aiosmtpd is a development
+dependency only: `pip install aiosmtpd`.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from email.message import EmailMessage
+
+from asset_store import APP_DIR
+
+OUTBOX_DB = APP_DIR / ".cache" / "outbox.sqlite3"
+DEDUPE_SECONDS = 24 * 3600
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 30.0
+RETRY_MAX_SECONDS = 3600.0
+POLL_SECONDS = 30.0
+CLAIM_LIMIT = 20
+QUEUED, DUPLICATE = "queued", "duplicate"
+log = logging.getLogger(__name__)
+PENDING, SENT, FAILED = "pending", "sent", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL,
+    created REAL NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS messages_digest ON messages (digest, created);
+CREATE INDEX IF NOT EXISTS messages_due ON messages (status, next_attempt);
+"""
+
+
+@dataclass
+class SmtpSettings:
+    """Where and as whom contact messages are delivered"""
+    host: str = "localhost"
+    port: int = 8025
+    username: str = None
+    password: str = None
+    starttls: bool = False
+    sender: str = "portfolio@localhost"
+    recipient: str = "ziyadabdelaal1@gmail.com"
+    timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ.get
+        return cls(
+            host=env("CONTACT_SMTP_HOST", cls.host),
+            port=int(env("CONTACT_SMTP_PORT", cls.port)),
+            username=env("CONTACT_SMTP_USER"),
+            password=env("CONTACT_SMTP_PASSWORD"),
+            starttls=env("CONTACT_SMTP_STARTTLS", "").lower() in ("1", "true", "yes"),
+            sender=env("CONTACT_SMTP_FROM", cls.sender),
+            recipient=env("CONTACT_TO", cls.recipient),
+        )
+
+
+class TokenBucket:
+    """Per-key token buckets: `capacity` requests at once, refilled over `period` seconds"""
+
+    def __init__(self, capacity=3, period=600.0, max_keys=10_000):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.max_keys = max_keys
+        self._buckets = {}  # key -> (tokens, last update)
+        self._lock = threading.Lock()
+
+    def allow(self, key, now=None):
+        """Take a token for `key`; returns (allowed, seconds until the next token)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                # Full buckets carry no state worth keeping
+                self._buckets = {k: v for k, v in self._buckets.items()
+                                 if v[0] + (now - v[1]) * self.rate < self.capacity}
+        return allowed, 0.0 if allowed else (1 - tokens) / self.rate
+
+
+def message_digest(email, subject, body):
+    """Content hash used for dedupe: case-insensitive sender, subject and whitespace-normalized text"""
+    normalized = "\x1f".join((email.strip().lower(), subject.strip(), " ".join(body.split())))
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def retry_delay(attempts):
+    """Exponential backoff with ±20% jitter"""
+    return min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+
+
+def build_email(row, settings):
+    message = EmailMessage()
+    message["From"] = settings.sender
+    message["To"] = settings.recipient
+    message["Reply-To"] = f"{row['name']} <{row['email']}>"
+    message["Subject"] = f"[Portfolio] {row['subject']} from {row['name']}"
+    message.set_content(f"{row['body']}\n\n-- \n{row['name']} <{row['email']}>")
+    return message
+
+
+def send_email(message, settings):
+    """Blocking SMTP delivery of one message"""
+    with smtplib.SMTP(settings.host, settings.port, timeout=settings.timeout) as client:
+        if settings.starttls:
+            client.starttls()
+        if settings.username:
+            client.login(settings.username, settings.password)
+        client.send_message(message)
+
+
+def connect(path=OUTBOX_DB):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class Outbox:
+    """SQLite outbox with a background asyncio delivery worker"""
+
+    def __init__(self, path=OUTBOX_DB, settings=None, send=send_email):
+        self.path = path
+        self.settings = settings or SmtpSettings.from_env()
+        self.send = send
+        connect(path).close()
+        self._loop = asyncio.new_event_loop()
+        self._wake = None
+        self._stopping = False
+        self._ready = threading.Event()
+        self._worker = threading.Thread(target=self._loop.run_forever, name="outbox-worker", daemon=True)
+        self._worker.start()
+        self._running = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+        self._ready.wait()
+
+    def close(self, timeout=30.0):
+        """Stop the delivery worker after the deliveries in flight; undelivered messages stay in the outbox"""
+        # A flag rather than cancelling the task: asyncio.wait_for can swallow a cancellation before Python 3.12
+        self._stopping = True
+        self._loop.call_soon_threadsafe(self._wake.set)
+        self._running.result(timeout)
+        asyncio.run_coroutine_threadsafe(self._loop.shutdown_default_executor(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._worker.join(timeout)
+        self._loop.close()
+
+    @staticmethod
+    def _find_duplicate(connection, digest, now):
+        return connection.execute("SELECT id FROM messages WHERE digest = ? AND created > ?",
+                                  (digest, now - DEDUPE_SECONDS)).fetchone()
+
+    def is_duplicate(self, email, subject, body, now=None):
+        """Whether the same message was stored within DEDUPE_SECONDS"""
+        now = time.time() if now is None else now
+        connection = connect(self.path)
+        try:
+            return self._find_duplicate(connection, message_digest(email, subject, body), now) is not None
+        finally:
+            connection.close()
+
+    def submit(self, name, email, subject, body, now=None):
+        """Store a message for delivery; returns (QUEUED or DUPLICATE, message id)"""
+        now = time.time() if now is None else now
+        digest = message_digest(email, subject, body)
+        connection = connect(self.path)
+        try:
+            with connection:
+                existing = self._find_duplicate(connection, digest, now)
+                if existing:
+                    return DUPLICATE, existing["id"]
+                cursor = connection.execute(
+                    "INSERT INTO messages (digest, created, name, email, subject, body, next_attempt) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", (digest, now, name, email, subject, body, now))
+        finally:
+            connection.close()
+        self._loop.call_soon_threadsafe(self._wake.set)
+        return QUEUED, cursor.lastrowid
+
+    def counts(self):
+        """Number of messages per status"""
+        connection = connect(self.path)
+        try:
+            return dict(connection.execute("SELECT status, COUNT(*) FROM messages GROUP BY status").fetchall())
+        finally:
+            connection.close()
+
+    def _claim(self, connection, now):
+        """Due pending messages, leased so a slow delivery is not picked up twice"""
+        with connection:
+            rows = connection.execute(
+                "SELECT * FROM messages WHERE status = ? AND next_attempt <= ? ORDER BY next_attempt LIMIT ?",
+                (PENDING, now, CLAIM_LIMIT)).fetchall()
+            lease = now + 2 * self.settings.timeout
+            connection.executemany("UPDATE messages SET next_attempt = ? WHERE id = ?",
+                                   [(lease, row["id"]) for row in rows])
+        return rows
+
+    def _next_due(self, connection):
+        row = connection.execute("SELECT MIN(next_attempt) FROM messages WHERE status = ?", (PENDING,)).fetchone()
+        return row[0]
+
+    async def _deliver(self, connection, row):
+        try:
+            await asyncio.to_thread(self.send, build_email(row, self.settings), self.settings)
+        except Exception as error:
+            # SMTP and network errors are expected; anything else is a bug, but it still only fails this attempt
+            if not isinstance(error, (smtplib.SMTPException, OSError)):
+                log.exception("delivering message %s failed", row["id"])
+            attempts = row["attempts"] + 1
+            status = FAILED if attempts >= MAX_ATTEMPTS else PENDING
+            with connection:
+                connection.execute(
+                    "UPDATE messages SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                    (status, attempts, time.time() + retry_delay(attempts), f"{type(error).__name__}: {error}",
+                     row["id"]))
+        else:
+            with connection:
+                connection.execute("UPDATE messages SET status = ?, attempts = attempts + 1, sent_at = ?, "
+                                   "last_error = NULL WHERE id = ?", (SENT, time.time(), row["id"]))
+
+    async def _run(self):
+        self._wake = asyncio.Event()
+        self._ready.set()
+        connection = connect(self.path)
+        try:
+            while not self._stopping:
+                self._wake.clear()
+                try:
+                    rows = self._claim(connection, time.time())
+                    if rows:
+                        results = await asyncio.gather(*(self._deliver(connection, row) for row in rows),
+                                                       return_exceptions=True)
+                        for error in results:
+                            if isinstance(error, Exception):
+                                log.error("outbox delivery step failed", exc_info=error)
+                        continue
+                    due = self._next_due(connection)
+                except sqlite3.Error:
+                    # Claimed rows keep their lease and are retried once it expires
+                    log.exception("outbox database error")
+                    due = None
+                timeout = POLL_SECONDS if due is None else min(POLL_SECONDS, max(0.0, due - time.time()))
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            connection.close()
+
+
+def debug_server(host="localhost", port=8025):
+    """Run a local aiosmtpd server that prints every message it receives (Ctrl+C to stop)"""
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.handlers import Debugging
+
+    controller = Controller(Debugging(), hostname=host, port=port)
+    controller.start()
+    print(f"SMTP stand-in listening on {host}:{port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    settings = SmtpSettings.from_env()
+    debug_server(settings.host, settings.port)
@@ -0,0 +1,151 @@
+"""Client-side frame playback for the algorithm visualizations.
+
+Each visualization precomputes its whole frame trace as a NumPy array and
+ships it once as a Plotly animated figure; play, pause and scrubbing then
+run in the browser without further reruns or websocket deltas.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+PRIMARY_COLOR = "#26A69A"
+HIGHLIGHT_COLOR = "#7B1FA2"
+DONE_COLOR = "#2E7D32"
+
+
+def frame_indices(n_frames, budget):
+    """Pick at most `budget` evenly spaced frame indices, always keeping the last frame"""
+    if n_frames <= budget:
+        return np.arange(n_frames)
+    return np.unique(np.linspace(0, n_frames - 1, budget).round().astype(np.int64))
+
+
+def reveal_frames(order, budget=200):
+    """Trace that progressively reveals a grid in the order given by `order` (1-based ranks).
+
+    Returns a float array of shape (n_frames, rows, cols) with unrevealed cells as NaN.
+    """
+    order = np.asarray(order)
+    total = int(order.max()) if order.size else 0
+    thresholds = np.unique(np.linspace(1, total, min(budget, total)).round().astype(np.int64))
+    return np.where(order[None, :, :] <= thresholds[:, None, None], order[None, :, :], np.nan)
+
+
+def playback_controls(frame_names, frame_duration=100):
+    """Play/pause buttons and a scrub slider for a figure with the given frame names"""
+    play_args = [None, {"frame": {"duration": frame_duration, "redraw": True},
+                        "transition": {"duration": 0}, "fromcurrent": True, "mode": "immediate"}]
+    pause_args = [[None], {"frame": {"duration": 0, "redraw": False},
+                           "transition": {"duration": 0}, "mode": "immediate"}]
+    updatemenus = [{
+        "type": "buttons",
+        "direction": "left",
+        "showactive": False,
+        "x": 0.0, "y": -0.12, "xanchor": "left", "yanchor": "top",
+        "pad": {"r": 10, "t": 10},
+        "buttons": [
+            {"label": "▶ Play", "method": "animate", "args": play_args},
+            {"label": "⏸ Pause", "method": "animate", "args": pause_args},
+        ],
+    }]
+    sliders = [{
+        "active": 0,
+        "x": 0.18, "y": -0.12, "len": 0.82, "xanchor": "left", "yanchor": "top",
+        "pad": {"t": 10},
+        "currentvalue": {"prefix": "Step: "},
+        "steps": [
+            {"label": str(name), "method": "animate",
+             "args": [[str(name)], {"frame": {"duration": 0, "redraw": True},
+                                    "transition": {"duration": 0}, "mode": "immediate"}]}
+            for name in frame_names
+        ],
+    }]
+    return updatemenus, sliders
+
+
+def _finish_layout(fig, frame_names, frame_duration, title, x_title, y_title):
+    """Attach playback controls and the shared layout to an animated figure"""
+    updatemenus, sliders = playback_controls(frame_names, frame_duration)
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        updatemenus=updatemenus,
+        sliders=sliders,
+        margin={"l": 40, "r": 20, "t": 50, "b": 110},
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
+def animated_bar_figure(frames, highlights=None, x=None, title="", x_title="Position", y_title="Value",
+                        frame_duration=100, frame_budget=300):
+    """Animated bar chart from a (n_frames, n_bars) trace.
+
+    `highlights` is an optional (n_frames, k) array of bar indices to colour
+    for each frame, e.g. the pair being compared; -1 entries are ignored.
+    `x` gives the bar positions when the frames are a sample of a larger array.
+    """
+    frames = np.asarray(frames)
+    keep = frame_indices(len(frames), frame_budget)
+    x = np.arange(frames.shape[1]) if x is None else np.asarray(x)
+    y_max = float(frames.max()) if frames.size else 1.0
+
+    def colors(i):
+        shade = np.full(frames.shape[1], PRIMARY_COLOR, dtype=object)
+        if highlights is not None:
+            marked = highlights[i][highlights[i] >= 0]
+            shade[marked] = HIGHLIGHT_COLOR
+        if i == len(frames) - 1:
+            shade[:] = DONE_COLOR
+        return shade.tolist()
+
+    fig = go.Figure(
+        data=[go.Bar(x=x, y=frames[keep[0]], marker_color=colors(keep[0]))],
+        frames=[go.Frame(name=str(i), data=[go.Bar(y=frames[i], marker_color=colors(i))]) for i in keep],
+    )
+    fig.update_yaxes(range=[0, y_max * 1.05])
+    return _finish_layout(fig, keep, frame_duration, title, x_title, y_title)
+
+
+def animated_heatmap_figure(frames, title="", frame_duration=100, frame_budget=200,
+                            colorscale="Tealgrn", show_values=False):
+    """Animated heatmap from a (n_frames, rows, cols) trace; NaN cells render empty"""
+    frames = np.asarray(frames, dtype=float)
+    keep = frame_indices(len(frames), frame_budget)
+    finite = frames[np.isfinite(frames)]
+    zmin, zmax = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+    text_args = {"texttemplate": "%{z:.0f}"} if show_values else {}
+
+    def heatmap(i):
+        return go.Heatmap(z=frames[i], zmin=zmin, zmax=zmax, colorscale=colorscale, **text_args)
+
+    fig = go.Figure(
+        data=[heatmap(keep[0])],
+        frames=[go.Frame(name=str(i), data=[heatmap(i)]) for i in keep],
+    )
+    fig.update_yaxes(autorange="reversed", scaleanchor="x")
+    return _finish_layout(fig, keep, frame_duration, title, "", "")
+
+
+def animated_line_figure(values, x=None, title="", x_title="Index", y_title="Value",
+                         frame_duration=200, frame_budget=200, log_y=False):
+    """Animated line chart revealing `values` one prefix at a time"""
+    values = np.asarray(values, dtype=float)
+    x = np.arange(len(values)) if x is None else np.asarray(x)
+    keep = frame_indices(len(values), frame_budget)
+    keep = keep[keep > 0] if len(keep) > 1 else keep
+
+    fig = go.Figure(
+        data=[go.Scatter(x=x[:keep[0] + 1], y=values[:keep[0] + 1], mode="lines+markers",
+                         line={"color": PRIMARY_COLOR})],
+        frames=[go.Frame(name=str(i), data=[go.Scatter(x=x[:i + 1], y=values[:i + 1])]) for i in keep],
+    )
+    positive = values[values > 0]
+    if log_y and positive.size:
+        fig.update_yaxes(type="log", range=[np.log10(positive.min()), np.log10(positive.max()) + 0.1])
+    elif values.size:
+        span = float(values.max() - values.min()) or 1.0
+        fig.update_yaxes(range=[float(values.min()) - 0.05 * span, float(values.max()) + 0.05 * span])
+    if len(x):
+        fig.update_xaxes(range=[float(x[0]) - 0.5, float(x[-1]) + 0.5])
+    return _finish_layout(fig, keep, frame_duration, title, x_title, y_title)
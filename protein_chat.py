@@ -0,0 +1,226 @@
+"""Local responders for the Protein AI chat and a shared response cache.
+
+A responder is any callable taking (prompt, history) and returning an
+iterator of text tokens, so answers can be rendered while they are still
+being produced. Finished answers are stored in a bounded LRU cache keyed by
+responder and normalized prompt; the cache is thread-safe so every
+session of the app can share one instance.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+
+from codons import find_orfs, orf_protein
+from protein_profile import profile_proteins
+
+GREETING = ("Hello! I'm a protein modeling assistant running locally. Ask me about protein structure, "
+            "or paste a protein or DNA sequence and I'll profile it.")
+TOKEN_DELAY = 0.015
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_PROTEIN_PATTERN = re.compile(r"[ACDEFGHIKLMNPQRSTVWY]{15,}")
+_PROTEIN_BLOCK = re.compile(r"[ACDEFGHIKLMNPQRSTVWY]{10,}")
+SEQUENCE_COVERAGE = 0.9
+_DNA_PATTERN = re.compile(r"[ACGTN]{30,}")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+KNOWLEDGE_BASE = {
+    "alpha helix": (("helix", "helices", "helical"),
+                    "An **α-helix** is a right-handed coil with 3.6 residues per turn and a 1.5 Å rise per "
+                    "residue. Each backbone C=O accepts a hydrogen bond from the N-H four residues later. Ala, "
+                    "Leu, Glu and Met favour helices, while Pro and Gly break them. In amphipathic helices the "
+                    "hydrophobic residues line up on one face, which a helical-wheel projection makes visible."),
+    "beta sheet": (("sheet", "strand", "beta"),
+                   "**β-sheets** are built from extended strands linked by backbone hydrogen bonds between "
+                   "neighbouring strands, in parallel or antiparallel arrangements. Side chains alternate above "
+                   "and below the sheet. Val, Ile, Tyr, Phe and Thr are enriched in strands. Aggregation-prone "
+                   "sheets underlie amyloid fibrils."),
+    "folding": (("fold", "folding", "misfold", "chaperone"),
+                "Protein **folding** is driven mainly by burying hydrophobic side chains, refined by hydrogen "
+                "bonds, salt bridges and packing. Anfinsen showed that the sequence encodes the native fold. "
+                "In cells, chaperones such as Hsp70 and GroEL/ES prevent aggregation while folding happens. "
+                "The folding funnel picture explains how proteins avoid a random search of conformations."),
+    "structure prediction": (("alphafold", "predict", "prediction", "rosetta", "esmfold", "model", "modeling"),
+                             "Modern **structure prediction** (AlphaFold2, RoseTTAFold, ESMFold) learns "
+                             "residue-residue geometry from multiple sequence alignments or protein language "
+                             "models. It reaches near-experimental accuracy for many single domains. Confidence "
+                             "is reported per residue as pLDDT, and the PAE matrix tells how reliably two "
+                             "domains are placed relative to each other."),
+    "hydrophobicity": (("hydrophobic", "hydrophobicity", "hydropathy", "gravy", "kyte"),
+                       "The **Kyte-Doolittle** scale gives every residue a hydropathy value from -4.5 (Arg) to "
+                       "+4.5 (Ile). Sliding-window averages (about 19 residues) above roughly 1.6 suggest "
+                       "transmembrane helices. GRAVY is the mean over the whole sequence; positive values "
+                       "indicate an overall hydrophobic protein."),
+    "isoelectric point": (("pi", "isoelectric", "charge", "pka", "ph"),
+                          "The **isoelectric point (pI)** is the pH at which a protein's net charge is zero. "
+                          "It is estimated from the pKa values of the termini and of the Asp, Glu, Cys, Tyr, "
+                          "His, Lys and Arg side chains, solving for zero charge by bisection. Proteins are "
+                          "least soluble near their pI, which matters for purification and crystallization."),
+    "hemoglobin": (("hemoglobin", "haemoglobin", "oxygen", "heme", "myoglobin"),
+                   "**Hemoglobin** is an α2β2 tetramer. Each globin chain holds a heme that binds O₂. "
+                   "Cooperative binding comes from the T-to-R quaternary switch, which gives the sigmoidal "
+                   "saturation curve. Sickle-cell disease is caused by the β-chain Glu6Val substitution, "
+                   "which makes deoxy-hemoglobin polymerize."),
+    "crispr": (("crispr", "cas9", "guide", "sgrna", "grna", "off-target"),
+               "**Cas9** is guided by a 20-nt spacer that pairs with a protospacer next to an NGG PAM. It "
+               "makes a blunt cut 3 bp upstream of the PAM. Guides are ranked by predicted on-target "
+               "activity and specificity. Mismatches near the PAM (the seed region) are least tolerated, "
+               "which is why off-target scores weight those positions most."),
+    "enzymes": (("enzyme", "catalysis", "active", "kinetics", "michaelis", "km", "kcat"),
+                "**Enzymes** speed up reactions by stabilizing the transition state. Michaelis-Menten kinetics "
+                "describes them with v = Vmax·[S]/(Km + [S]). kcat is the turnover number, and kcat/Km "
+                "measures catalytic efficiency, which diffusion limits at about 10⁸-10⁹ M⁻¹s⁻¹."),
+    "pdb": (("pdb", "crystal", "crystallography", "cryo", "nmr", "experimental"),
+            "Experimental structures are deposited in the **Protein Data Bank (PDB)**. X-ray crystallography "
+            "gives high resolution from crystals. Cryo-EM handles large, flexible complexes without "
+            "crystals. NMR reports on the dynamics of smaller proteins in solution."),
+    "molecular dynamics": (("dynamics", "simulation", "md", "gromacs", "amber", "force"),
+                           "**Molecular dynamics** integrates Newton's equations over a force field such as "
+                           "AMBER or CHARMM, typically with a 2 fs time step. It samples conformational "
+                           "changes, ligand binding and stability. Enhanced sampling methods such as "
+                           "metadynamics reach rare events beyond the microsecond range."),
+    "mutations": (("mutation", "mutant", "variant", "substitution", "stability", "ddg"),
+                  "The effect of a **mutation** on stability is summarized as ΔΔG of folding. Changes that "
+                  "bury polar groups, add Pro inside helices or remove core hydrophobics are usually "
+                  "destabilizing. Substitution matrices such as BLOSUM62 capture which replacements evolution "
+                  "tolerates."),
+}
+
+
+def normalize_prompt(prompt):
+    """Cache key form of a prompt: lowercase words, collapsed whitespace, no trailing punctuation"""
+    return " ".join(prompt.lower().split()).strip(" ?!.")
+
+
+def stream_text(text, delay=TOKEN_DELAY):
+    """Yield a finished answer word by word, the way a generating model would"""
+    for token in re.findall(r"\S+\s*", text):
+        yield token
+        if delay:
+            time.sleep(delay)
+
+
+def _sequence_report(prompt):
+    """Profile of a protein or DNA sequence pasted into the prompt, or None"""
+    compact = re.sub(r"\s+", "", prompt.upper())
+    dna = _DNA_PATTERN.search(compact)
+    if dna and len(dna.group()) >= SEQUENCE_COVERAGE * len(compact):
+        sequence = dna.group()
+        gc = (sequence.count("G") + sequence.count("C")) / len(sequence)
+        orfs = find_orfs(sequence, min_length=30)
+        lines = [f"That looks like **DNA**: {len(sequence):,} bp with {100 * gc:.1f}% GC."]
+        if len(orfs["length"]):
+            protein = orf_protein(sequence, orfs["strand"][0], int(orfs["start"][0]), int(orfs["end"][0]))
+            lines.append(f"The longest ORF ({orfs['frame'][0]} frame, {int(orfs['length'][0])} aa) encodes "
+                         f"`{protein[:60]}{'…' if len(protein) > 60 else ''}`.")
+        else:
+            lines.append("I found no ORF of at least 30 codons.")
+        return "\n\n".join(lines)
+    # Most questions are spelled in the amino-acid alphabet, so a protein must make up nearly the whole
+    # prompt and include an unbroken block of residues, as pasted sequences do and words rarely do
+    protein = _PROTEIN_PATTERN.search(compact)
+    if (protein and len(protein.group()) >= SEQUENCE_COVERAGE * len(compact)
+            and _PROTEIN_BLOCK.search(prompt.upper())):
+        sequence = protein.group()
+        table = profile_proteins(["query"], [sequence])
+        charge = next(value for key, value in table.items() if key.startswith("Charge"))[0]
+        return (f"That looks like a **protein** of {len(sequence)} residues. Its isoelectric point is about "
+                f"{table['pI'][0]:.2f}, with a net charge of {charge:+.1f} at pH 7 and a GRAVY of "
+                f"{table['GRAVY'][0]:+.3f} "
+                f"({'hydrophobic' if table['GRAVY'][0] > 0 else 'hydrophilic'} overall). The strongest helical "
+                f"hydrophobic moment is {table['Max Hydrophobic Moment'][0]:.2f}. Open *Protein Pattern → "
+                f"Protein Spiral* for the full hydropathy profile and helical wheel.")
+    return None
+
+
+def rule_based_responder(prompt, history):
+    """Sequence profiling for pasted sequences, otherwise keyword matching against the knowledge base"""
+    report = _sequence_report(prompt)
+    if report:
+        return stream_text(report)
+    words = set(_WORD_PATTERN.findall(prompt.lower()))
+    matches = [answer for keywords, answer in KNOWLEDGE_BASE.values() if words & set(keywords)]
+    if not matches:
+        topics = ", ".join(KNOWLEDGE_BASE)
+        return stream_text(f"I don't have a note on that yet. I can talk about: {topics}. "
+                           "You can also paste a protein or DNA sequence.")
+    return stream_text("\n\n".join(matches[:2]))
+
+
+def _term_vector(text):
+    return Counter(_WORD_PATTERN.findall(text.lower()))
+
+
+_DOCUMENT_VECTORS = {topic: _term_vector(f"{topic} {' '.join(keywords)} {answer}")
+                     for topic, (keywords, answer) in KNOWLEDGE_BASE.items()}
+_DOCUMENT_FREQUENCY = Counter(term for vector in _DOCUMENT_VECTORS.values() for term in vector)
+
+
+def retrieval_responder(prompt, history):
+    """TF-IDF cosine retrieval over the knowledge base, a stand-in for a small local model"""
+    report = _sequence_report(prompt)
+    if report:
+        return stream_text(report)
+    total = len(_DOCUMENT_VECTORS)
+
+    def weights(vector):
+        return {term: count * math.log((1 + total) / (1 + _DOCUMENT_FREQUENCY[term])) for term, count in vector.items()}
+
+    query = weights(_term_vector(prompt))
+    scores = []
+    for topic, vector in _DOCUMENT_VECTORS.items():
+        document = weights(vector)
+        dot = sum(value * document.get(term, 0.0) for term, value in query.items())
+        norm = math.sqrt(sum(v * v for v in query.values()) * sum(v * v for v in document.values()))
+        scores.append((dot / norm if norm else 0.0, topic))
+    score, topic = max(scores)
+    if score < 0.05:
+        return rule_based_responder(prompt, history)
+    return stream_text(f"{KNOWLEDGE_BASE[topic][1]}\n\n*(closest note: {topic}, similarity {score:.2f})*")
+
+
+RESPONDERS = {
+    "Rule-based": rule_based_responder,
+    "Retrieval (TF-IDF)": retrieval_responder,
+}
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of finished answers"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, key, answer):
+        with self._lock:
+            self._entries[key] = answer
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stream(self, key, tokens):
+        """Pass tokens through and store the answer once the stream has completed"""
+        parts = []
+        for token in tokens:
+            parts.append(token)
+            yield token
+        self.put(key, "".join(parts))
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
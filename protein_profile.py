@@ -0,0 +1,154 @@
+"""Batched protein property profiles: hydropathy windows, charge, pI and helical wheels.
+
+Sequences are encoded into a padded residue-code matrix so every property
+is computed for a whole batch at once. Batches are formed from sequences
+of similar length, which keeps the padding small even when a FASTA file
+mixes short peptides with very long proteins.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+PAD = len(AMINO_ACIDS)
+
+_RESIDUE_CODES = np.full(256, PAD, dtype=np.uint8)
+for _code, _residue in enumerate(AMINO_ACIDS):
+    _RESIDUE_CODES[ord(_residue)] = _RESIDUE_CODES[ord(_residue.lower())] = _code
+
+KYTE_DOOLITTLE = {
+    "A": 1.8, "R": -4.5, "N": -3.5, "D": -3.5, "C": 2.5, "Q": -3.5, "E": -3.5, "G": -0.4, "H": -3.2, "I": 4.5,
+    "L": 3.8, "K": -3.9, "M": 1.9, "F": 2.8, "P": -1.6, "S": -0.8, "T": -0.7, "W": -0.9, "Y": -1.3, "V": 4.2,
+}
+HYDROPATHY = np.array([KYTE_DOOLITTLE[residue] for residue in AMINO_ACIDS] + [0.0])
+
+# EMBOSS pKa values for the ionizable side chains and termini
+POSITIVE_PKA = {"K": 10.8, "R": 12.5, "H": 6.5}
+NEGATIVE_PKA = {"D": 3.9, "E": 4.1, "C": 8.5, "Y": 10.1}
+N_TERMINUS_PKA = 8.6
+C_TERMINUS_PKA = 3.6
+
+HELIX_ANGLE = np.deg2rad(100.0)
+
+
+@dataclass
+class ProteinBatch:
+    """Residue codes of a batch of sequences, right-padded with PAD"""
+    codes: np.ndarray
+    lengths: np.ndarray
+
+
+def encode_batch(sequences):
+    """Encode sequences into a (count, max_length) residue-code matrix"""
+    lengths = np.array([len(sequence) for sequence in sequences], dtype=np.int64)
+    codes = np.full((len(sequences), int(lengths.max(initial=0))), PAD, dtype=np.uint8)
+    for row, sequence in enumerate(sequences):
+        if isinstance(sequence, str):
+            sequence = sequence.encode("ascii", "replace")
+        codes[row, :len(sequence)] = _RESIDUE_CODES[np.frombuffer(sequence, dtype=np.uint8)]
+    return ProteinBatch(codes=codes, lengths=lengths)
+
+
+def residue_counts(batch):
+    """(count, 21) residue composition of every sequence; the last column counts unknown residues"""
+    rows = np.arange(len(batch.codes), dtype=np.int64)[:, None]
+    flat = (batch.codes.astype(np.int64) + rows * (PAD + 1)).ravel()
+    counts = np.bincount(flat, minlength=len(batch.codes) * (PAD + 1)).reshape(-1, PAD + 1)
+    padding = batch.codes.shape[1] - batch.lengths
+    counts[:, PAD] -= padding
+    return counts
+
+
+def hydropathy_windows(batch, window=9):
+    """Kyte–Doolittle window means for every sequence.
+
+    A box-filter convolution done with cumulative sums along the residue
+    axis; windows that run into the padding are NaN.
+    """
+    values = HYDROPATHY[batch.codes]
+    cumulative = np.concatenate([np.zeros((len(values), 1)), np.cumsum(values, axis=1)], axis=1)
+    sums = cumulative[:, window:] - cumulative[:, :-window]
+    means = sums / window
+    positions = np.arange(means.shape[1])
+    means[positions[None, :] + window > batch.lengths[:, None]] = np.nan
+    return means
+
+
+def gravy(batch):
+    """Grand average of hydropathy per sequence"""
+    return HYDROPATHY[batch.codes].sum(axis=1) / np.maximum(batch.lengths, 1)
+
+
+def net_charge(counts, ph):
+    """Net charge of every sequence at the given pH (a scalar or one value per sequence)"""
+    ph = np.broadcast_to(np.asarray(ph, dtype=float), (len(counts),))
+    charge = 1.0 / (1.0 + 10.0 ** (ph - N_TERMINUS_PKA)) - 1.0 / (1.0 + 10.0 ** (C_TERMINUS_PKA - ph))
+    for residue, pka in POSITIVE_PKA.items():
+        charge = charge + counts[:, AMINO_ACIDS.index(residue)] / (1.0 + 10.0 ** (ph - pka))
+    for residue, pka in NEGATIVE_PKA.items():
+        charge = charge - counts[:, AMINO_ACIDS.index(residue)] / (1.0 + 10.0 ** (pka - ph))
+    return charge
+
+
+def isoelectric_point(counts, iterations=40):
+    """pI of every sequence by a bisection run on all sequences at once"""
+    low = np.zeros(len(counts))
+    high = np.full(len(counts), 14.0)
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        charge = net_charge(counts, middle)
+        low = np.where(charge > 0, middle, low)
+        high = np.where(charge > 0, high, middle)
+    return (low + high) / 2
+
+
+def _row_max(values):
+    """Row maxima ignoring NaN; rows without any value give NaN"""
+    best = np.max(np.where(np.isnan(values), -np.inf, values), axis=1, initial=-np.inf)
+    return np.where(np.isfinite(best), best, np.nan)
+
+
+def hydrophobic_moments(batch, window=11):
+    """Maximum windowed hydrophobic moment per sequence for an ideal α-helix (100° per residue)"""
+    values = HYDROPATHY[batch.codes]
+    phases = np.exp(1j * HELIX_ANGLE * np.arange(values.shape[1]))
+    cumulative = np.concatenate([np.zeros((len(values), 1), dtype=complex),
+                                 np.cumsum(values * phases[None, :], axis=1)], axis=1)
+    moments = np.abs(cumulative[:, window:] - cumulative[:, :-window]) / window
+    positions = np.arange(moments.shape[1])
+    moments[positions[None, :] + window > batch.lengths[:, None]] = np.nan
+    return _row_max(moments)
+
+
+def helical_wheel(sequence, residues=18):
+    """Angles (degrees) and hydropathy of the first residues of a sequence projected on a helical wheel"""
+    sequence = sequence[:residues]
+    codes = _RESIDUE_CODES[np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)]
+    angles = (np.arange(len(sequence)) * 100.0) % 360.0
+    return angles, HYDROPATHY[codes], list(sequence)
+
+
+def profile_proteins(names, sequences, window=9, ph=7.0, batch_size=1024):
+    """Property table for many sequences, computed in length-sorted vectorized batches"""
+    order = np.argsort([len(sequence) for sequence in sequences], kind="stable")
+    columns = {key: np.full(len(sequences), np.nan) for key in
+               ("gravy", "charge", "pi", "moment", "max_window")}
+    for start in range(0, len(order), batch_size):
+        chosen = order[start:start + batch_size]
+        batch = encode_batch([sequences[i] for i in chosen])
+        counts = residue_counts(batch)
+        columns["gravy"][chosen] = gravy(batch)
+        columns["charge"][chosen] = net_charge(counts, ph)
+        columns["pi"][chosen] = isoelectric_point(counts)
+        columns["moment"][chosen] = hydrophobic_moments(batch)
+        if batch.codes.shape[1] >= window:
+            columns["max_window"][chosen] = _row_max(hydropathy_windows(batch, window))
+    return {
+        "Protein": list(names),
+        "Length": [len(sequence) for sequence in sequences],
+        "GRAVY": columns["gravy"].round(3),
+        f"Charge @ pH {ph:g}": columns["charge"].round(2),
+        "pI": columns["pi"].round(2),
+        "Max Hydrophobic Moment": columns["moment"].round(3),
+        f"Max {window}-Window Hydropathy": columns["max_window"].round(2),
+    }
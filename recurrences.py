@@ -0,0 +1,165 @@
+"""Integer recurrences behind the gene expression sequence visualization.
+
+Single terms are computed directly in O(log n) big-integer steps: fast
+doubling for Fibonacci and companion-matrix exponentiation for any other
+linear recurrence. Results are memoized process-wide in bounded LRU caches,
+and everything that gets plotted is reduced to float log10 values first,
+so n = 10^5 never builds a list of enormous integers.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+MEMO_SIZE = 4096
+
+# coefficients (c1, ..., ck) of a(n) = c1 a(n-1) + ... + ck a(n-k) and initial terms (a0, ..., a(k-1))
+RECURRENCE_PRESETS = {
+    "Fibonacci": ((1, 1), (0, 1)),
+    "Lucas": ((1, 1), (2, 1)),
+    "Pell": ((2, 1), (0, 1)),
+    "Jacobsthal": ((1, 2), (0, 1)),
+    "Tribonacci": ((1, 1, 1), (0, 0, 1)),
+    "Padovan": ((0, 1, 1), (1, 1, 1)),
+}
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _fibonacci_pair(n):
+    """(F(n), F(n + 1)) by fast doubling"""
+    if n == 0:
+        return 0, 1
+    a, b = _fibonacci_pair(n >> 1)
+    c = a * (2 * b - a)
+    d = a * a + b * b
+    return (d, c + d) if n & 1 else (c, d)
+
+
+def fibonacci(n):
+    """n-th Fibonacci number in O(log n) big-integer multiplications"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return _fibonacci_pair(n)[0]
+
+
+def _mat_mult(x, y):
+    size = len(x)
+    return tuple(
+        tuple(sum(x[r][k] * y[k][c] for k in range(size)) for c in range(size))
+        for r in range(size)
+    )
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _companion_power(coefficients, n):
+    """n-th power of the companion matrix of a recurrence"""
+    size = len(coefficients)
+    if n == 0:
+        return tuple(tuple(int(r == c) for c in range(size)) for r in range(size))
+    if n == 1:
+        return (tuple(coefficients),) + tuple(
+            tuple(int(c == r - 1) for c in range(size)) for r in range(1, size)
+        )
+    half = _companion_power(coefficients, n >> 1)
+    square = _mat_mult(half, half)
+    return _mat_mult(square, _companion_power(coefficients, 1)) if n & 1 else square
+
+
+def linear_term(coefficients, initial, n):
+    """n-th term of a linear recurrence via matrix exponentiation"""
+    coefficients, initial = tuple(coefficients), tuple(initial)
+    k = len(coefficients)
+    if len(initial) != k:
+        raise ValueError("need one initial term per coefficient")
+    if n < k:
+        return initial[n]
+    if coefficients == (1, 1) and initial == (0, 1):
+        return fibonacci(n)
+    power = _companion_power(coefficients, n - k + 1)
+    state = initial[::-1]
+    return sum(power[0][c] * state[c] for c in range(k))
+
+
+def linear_sequence(coefficients, initial, n):
+    """First `n` terms of a linear recurrence, iteratively"""
+    terms = list(initial[:n])
+    k = len(coefficients)
+    while len(terms) < n:
+        terms.append(sum(c * terms[-1 - i] for i, c in enumerate(coefficients[:k])))
+    return terms
+
+
+def int_log10(value):
+    """log10 of a non-negative Python int of any size (-inf for zero)"""
+    value = abs(value)
+    return math.log10(value) if value else -math.inf
+
+
+def sampled_terms(coefficients, initial, indices):
+    """Exact terms at sorted indices.
+
+    The state vector (a(j + k - 1), ..., a(j)) is stepped from one index to
+    the next by a memoized companion-matrix power; evenly spaced indices
+    reuse the same power for every step.
+    """
+    coefficients = tuple(coefficients)
+    k = len(coefficients)
+    state = list(initial[::-1])
+    position = 0
+    for index in indices:
+        gap = int(index) - position
+        if gap < 0:
+            raise ValueError("indices must be sorted")
+        if gap:
+            power = _companion_power(coefficients, gap)
+            state = [sum(power[r][c] * state[c] for c in range(k)) for r in range(k)]
+            position += gap
+        yield state[-1]
+
+
+def term_log10(coefficients, initial, indices):
+    """log10 of the terms at the given sorted indices"""
+    return np.array([int_log10(term) for term in sampled_terms(coefficients, initial, indices)])
+
+
+def digit_summary(value, edge=20):
+    """(digit count, leading digits, trailing digits) without converting a huge int to a string"""
+    value = abs(value)
+    if value < 10 ** (2 * edge):
+        text = str(value)
+        return len(text), text[:edge], text[-edge:]
+    log = int_log10(value)
+    digits = int(math.floor(log)) + 1
+    # Adjust for float rounding right at a power of ten
+    if value < 10 ** (digits - 1):
+        digits -= 1
+    elif value >= 10 ** digits:
+        digits += 1
+    leading = str(value // 10 ** (digits - edge))
+    trailing = str(value % 10 ** edge).zfill(edge)
+    return digits, leading, trailing
+
+
+def dominant_root(coefficients):
+    """Largest-modulus root of the characteristic polynomial (the limiting term ratio)"""
+    roots = np.roots([1, *(-c for c in coefficients)])
+    return float(roots[np.argmax(np.abs(roots))].real)
+
+
+def ratio_convergence(coefficients, initial, count=200):
+    """Ratios a(k + 1) / a(k) for the first `count` terms and their distance to the limit.
+
+    The ratios come from differences of log10 terms, so the whole series is
+    one vectorized operation; zero terms give NaN ratios.
+    """
+    terms = linear_sequence(coefficients, initial, count + 1)
+    logs = np.array([int_log10(t) for t in terms])
+    with np.errstate(invalid="ignore"):
+        ratios = np.where(np.isfinite(logs[:-1]) & np.isfinite(logs[1:]), 10.0 ** (logs[1:] - logs[:-1]), np.nan)
+    limit = dominant_root(coefficients)
+    return ratios, np.abs(ratios - limit), limit
+
+
+def memo_info():
+    """Hit/miss statistics of the process-wide memo caches"""
+    return {"fibonacci": _fibonacci_pair.cache_info(), "matrix powers": _companion_power.cache_info()}
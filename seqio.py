@@ -0,0 +1,310 @@
+"""Sequence file input for the biotech demos.
+
+Small inputs are streamed record by record with `iter_fasta`. Large files
+go through `IndexedFasta`: one scan writes a samtools-compatible .fai
+index, the file is memory-mapped, and a region is located from the index
+by arithmetic, so only the pages holding the requested bases are read.
+"""
+import hashlib
+import mmap
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from asset_store import APP_DIR
+
+FAI_DIR = APP_DIR / ".cache" / "fai"
+SEQUENCE_SUFFIXES = (".fa", ".fasta", ".fna", ".ffn", ".faa", ".fq", ".fastq")
+OPEN_FILES_LIMIT = 8
+
+_open_files = OrderedDict()  # (path, mtime_ns, size) -> IndexedFasta, least recently used first
+_open_lock = threading.Lock()
+
+
+def iter_fasta(handle):
+    """Yield (header, sequence bytes) for each record of a binary FASTA stream.
+
+    Lines are read one at a time, so only the record being assembled is
+    held in memory, never the whole file.
+    """
+    header, chunks = None, []
+    for line in handle:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(b">"):
+            if header is not None:
+                yield header, b"".join(chunks)
+            header, chunks = line[1:].decode("utf-8", "replace"), []
+        elif header is None:
+            # Plain sequence without a FASTA header
+            header, chunks = "sequence", [line]
+        else:
+            chunks.append(line)
+    if header is not None:
+        yield header, b"".join(chunks)
+
+
+def write_fasta(path, records, width=60):
+    """Write (name, sequence bytes) records as a line-wrapped FASTA file"""
+    with open(path, "wb") as handle:
+        for name, sequence in records:
+            handle.write(b">" + name.encode() + b"\n")
+            for start in range(0, len(sequence), width):
+                handle.write(sequence[start:start + width] + b"\n")
+
+
+@dataclass
+class FaiEntry:
+    """One .fai line: where a record's bases start and how its lines are wrapped"""
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_bytes: int
+    qual_offset: int = None
+
+
+def _scan_fasta(handle):
+    entries, current, short, position = [], None, False, 0
+    for line in handle:
+        size = len(line)
+        if line.startswith(b">"):
+            if current is not None:
+                entries.append(current)
+            name = line[1:].split(maxsplit=1)[0].decode("utf-8", "replace") if line[1:].strip() else ""
+            current, short = FaiEntry(name, 0, position + size, 0, 0), False
+        elif current is not None:
+            bases = len(line.rstrip(b"\r\n"))
+            if not current.line_bases:
+                current.line_bases, current.line_bytes = bases, size
+            elif short and bases:
+                raise ValueError(f"{current.name}: lines of different lengths, the file cannot be indexed")
+            elif bases != current.line_bases or size != current.line_bytes:
+                # Only the last line of a record may be shorter
+                if bases > current.line_bases:
+                    raise ValueError(f"{current.name}: lines of different lengths, the file cannot be indexed")
+                short = True
+            current.length += bases
+        elif line.strip():
+            raise ValueError("a FASTA file must start with a '>' header")
+        position += size
+    if current is not None:
+        entries.append(current)
+    return entries
+
+
+def _scan_fastq(handle):
+    entries, position = [], 0
+    while True:
+        header = handle.readline()
+        if not header.strip():
+            return entries
+        sequence, plus, quality = handle.readline(), handle.readline(), handle.readline()
+        if not header.startswith(b"@") or not plus.startswith(b"+"):
+            raise ValueError("only four-line FASTQ records can be indexed")
+        name = header[1:].split(maxsplit=1)[0].decode("utf-8", "replace")
+        bases = len(sequence.rstrip(b"\r\n"))
+        seq_offset = position + len(header)
+        qual_offset = seq_offset + len(sequence) + len(plus)
+        entries.append(FaiEntry(name, bases, seq_offset, bases, len(sequence), qual_offset))
+        position = qual_offset + len(quality)
+
+
+def _unique_names(entries):
+    """Entries unchanged; raises ValueError on a duplicate record name, as samtools faidx does"""
+    seen = set()
+    for entry in entries:
+        if entry.name in seen:
+            raise ValueError(f"duplicate record name {entry.name!r}, the file cannot be indexed")
+        seen.add(entry.name)
+    return entries
+
+
+def build_fai(path):
+    """Scan a FASTA or FASTQ file once and return its index entries"""
+    with open(path, "rb") as handle:
+        first = handle.read(1)
+        handle.seek(0)
+        if first == b"@":
+            return _unique_names(_scan_fastq(handle))
+        return _unique_names(_scan_fasta(handle))
+
+
+def write_fai(entries, path):
+    """Write index entries in samtools faidx/fqidx format"""
+    lines = []
+    for entry in entries:
+        fields = [entry.name, entry.length, entry.offset, entry.line_bases, entry.line_bytes]
+        if entry.qual_offset is not None:
+            fields.append(entry.qual_offset)
+        lines.append("\t".join(str(field) for field in fields))
+    tmp = Path(f"{path}.tmp")
+    tmp.write_text("\n".join(lines) + "\n" if lines else "")
+    tmp.replace(path)
+
+
+def read_fai(path):
+    """Read a .fai (5 columns) or FASTQ .fai (6 columns) index"""
+    entries = []
+    for line in Path(path).read_text().splitlines():
+        if line:
+            name, *numbers = line.split("\t")
+            entries.append(FaiEntry(name, *(int(number) for number in numbers)))
+    return entries
+
+
+def load_fai(path):
+    """Index entries of a sequence file, reusing a cached .fai that is newer than the file.
+
+    The index is written next to the file like samtools does; when that
+    folder is read-only it goes to the app cache instead.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = hashlib.sha1(f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()
+    candidates = [Path(f"{path}.fai"), FAI_DIR / f"{key}.fai"]
+    for candidate in candidates:
+        if candidate.exists() and candidate.stat().st_mtime_ns >= stat.st_mtime_ns:
+            return _unique_names(read_fai(candidate))
+    entries = build_fai(path)
+    for candidate in candidates:
+        try:
+            candidate.parent.mkdir(parents=True, exist_ok=True)
+            write_fai(entries, candidate)
+            break
+        except OSError:
+            continue
+    return entries
+
+
+class IndexedFasta:
+    """Random access to the records of an indexed, memory-mapped FASTA or FASTQ file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {entry.name: entry for entry in load_fai(self.path)}
+        # The mapping keeps its own descriptor, so no file handle stays open
+        with open(self.path, "rb") as handle:
+            if self.path.stat().st_size:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self._bytes = np.frombuffer(self._map, dtype=np.uint8)
+            else:
+                self._map, self._bytes = None, np.zeros(0, dtype=np.uint8)
+
+    @property
+    def names(self):
+        return list(self.entries)
+
+    @property
+    def is_fastq(self):
+        return any(entry.qual_offset is not None for entry in self.entries.values())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _slice(self, entry, offset, start, end):
+        """Bytes [start, end) of a wrapped record whose first base sits at `offset`"""
+        if self._bytes is None:
+            raise ValueError(f"{self.path.name} is closed")
+        start, end = max(0, start), min(entry.length, entry.length if end is None else end)
+        if end <= start:
+            return self._bytes[:0]
+        width, stride = entry.line_bases, entry.line_bytes
+        first_line, last_line = start // width, (end - 1) // width
+        first = offset + first_line * stride + start % width
+        if offset + last_line * stride + (end - 1) % width + 1 > len(self._bytes):
+            # Never stride past the mapping: the file is shorter than its index says
+            raise ValueError(f"{entry.name} extends past the end of {self.path.name}")
+        if first_line == last_line:
+            # Inside one line: a view straight into the mapped file
+            return self._bytes[first:first + end - start]
+        head = self._bytes[first:offset + first_line * stride + width]
+        body = as_strided(self._bytes[offset + (first_line + 1) * stride:], shape=(last_line - first_line - 1, width),
+                          strides=(stride, 1), writeable=False)
+        tail_start = offset + last_line * stride
+        tail = self._bytes[tail_start:tail_start + (end - 1) % width + 1]
+        return np.concatenate((head, body.ravel(), tail))
+
+    def region(self, name, start=0, end=None):
+        """Bases [start, end) (0-based) of a record as a uint8 array.
+
+        Regions inside one line are zero-copy views of the mapping; longer
+        regions are gathered once, skipping the line breaks.
+        """
+        entry = self.entries[name]
+        return self._slice(entry, entry.offset, start, end)
+
+    def quality(self, name, start=0, end=None):
+        """Phred+33 quality bytes [start, end) of a FASTQ record"""
+        entry = self.entries[name]
+        if entry.qual_offset is None:
+            raise ValueError(f"{name} has no qualities")
+        return self._slice(entry, entry.qual_offset, start, end)
+
+    def fetch(self, name, start=0, end=None):
+        """Region as a string"""
+        return self.region(name, start, end).tobytes().decode("ascii", "replace")
+
+    def chunks(self, name, size=1 << 20):
+        """Yield a record's bases as consecutive uint8 arrays of at most `size` bases"""
+        length = self.entries[name].length
+        for start in range(0, length, size):
+            yield self.region(name, start, start + size)
+
+    def records(self):
+        """Yield (name, sequence bytes) for every record, like `iter_fasta`"""
+        for name in self.entries:
+            yield name, self.region(name).tobytes()
+
+    def close(self):
+        """Unmap the file; later reads raise ValueError"""
+        self._bytes = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Regions handed out earlier still view the mapping; it is released with them
+                pass
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_indexed(path):
+    """Shared IndexedFasta for the current version of a file.
+
+    Readers stay open for reuse across reruns and sessions. Older versions
+    of the same file and the least recently used readers beyond
+    OPEN_FILES_LIMIT are dropped, not closed, since another session may
+    still be reading them; each is unmapped once its last user lets go.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _open_lock:
+        reader = _open_files.get(key)
+        if reader is not None:
+            _open_files.move_to_end(key)
+            return reader
+    reader = IndexedFasta(path)
+    with _open_lock:
+        if key in _open_files:
+            # Another session opened it meanwhile; this reader was never shared
+            reader.close()
+            return _open_files[key]
+        stale = [other for other in _open_files if other[0] == key[0]]
+        _open_files[key] = reader
+        while len(_open_files) - len(stale) > OPEN_FILES_LIMIT:
+            stale.append(next(other for other in _open_files if other not in stale))
+        for other in stale:
+            del _open_files[other]
+    return reader
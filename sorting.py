@@ -0,0 +1,322 @@
+"""Sorting lab: algorithms that record their execution as bounded NumPy step traces.
+
+Every algorithm works on a NumPy array and reports each step (a pass, a
+merge level, a partition round or a single insertion) to a `SortTrace`.
+The trace keeps a fixed number of frames: when it fills up it drops every
+other frame and halves its sampling rate, so memory stays flat whether the
+input has a hundred or a million elements.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+DEFAULT_FRAME_BUDGET = 200
+DEFAULT_FRAME_WIDTH = 200
+
+
+class SortTrace:
+    """Fixed-capacity step trace with cumulative compare/swap/write counters"""
+
+    def __init__(self, values, frame_budget=DEFAULT_FRAME_BUDGET, width=DEFAULT_FRAME_WIDTH):
+        n = len(values)
+        self.capacity = max(2, frame_budget)
+        self.columns = np.unique(np.linspace(0, max(n - 1, 0), min(n, width)).round().astype(np.int64))
+        self.frames = np.empty((self.capacity, len(self.columns)), dtype=values.dtype)
+        self.steps = np.empty(self.capacity, dtype=np.int64)
+        self.compares = np.empty(self.capacity, dtype=np.int64)
+        self.swaps = np.empty(self.capacity, dtype=np.int64)
+        self.writes = np.empty(self.capacity, dtype=np.int64)
+        self.size = 0
+        self.stride = 1
+        self.step = 0
+        self.total_compares = 0
+        self.total_swaps = 0
+        self.total_writes = 0
+        self.store(values[self.columns])
+
+    def store(self, frame):
+        """Keep an already sampled frame for the current step"""
+        if self.size == self.capacity:
+            kept = (self.capacity + 1) // 2
+            for buffer in (self.frames, self.steps, self.compares, self.swaps, self.writes):
+                buffer[:kept] = buffer[0:self.capacity:2]
+            self.size = kept
+            self.stride *= 2
+        i = self.size
+        self.frames[i] = frame
+        self.steps[i] = self.step
+        self.compares[i] = self.total_compares
+        self.swaps[i] = self.total_swaps
+        self.writes[i] = self.total_writes
+        self.size += 1
+
+    def advance(self, compares=0, swaps=0, writes=0):
+        """Account for one algorithm step; True when its frame falls on the sampling stride"""
+        self.step += 1
+        self.total_compares += int(compares)
+        self.total_swaps += int(swaps)
+        self.total_writes += int(writes)
+        return self.step % self.stride == 0
+
+    def record(self, values, compares=0, swaps=0, writes=0):
+        """Account for one algorithm step, sampling `values` if the frame is kept"""
+        if self.advance(compares, swaps, writes):
+            self.store(values[self.columns])
+
+    def finish(self, values):
+        """Make sure the final state is the last frame"""
+        if self.steps[self.size - 1] != self.step:
+            self.store(values[self.columns])
+
+    def frame_data(self):
+        """Views of the recorded frames and their cumulative counters"""
+        n = self.size
+        return self.frames[:n], self.steps[:n], self.compares[:n], self.swaps[:n], self.writes[:n]
+
+
+@dataclass
+class SortRun:
+    """Outcome of one sorting lab run"""
+    algorithm: str
+    size: int
+    compares: int
+    swaps: int
+    writes: int
+    seconds: float
+    steps: int
+    is_sorted: bool
+    columns: np.ndarray
+    frames: np.ndarray
+    frame_steps: np.ndarray
+    frame_compares: np.ndarray
+    frame_swaps: np.ndarray
+    frame_writes: np.ndarray
+
+
+def bubble_sort(values, trace):
+    """Bubble sort with each pass computed in one vectorized step.
+
+    During a pass the element being carried to the right is the running
+    maximum, so position j ends up holding min(cummax(a)[j], a[j + 1]).
+    """
+    n = len(values)
+    for i in range(n - 1):
+        m = n - i
+        prefix = values[:m]
+        carried = np.maximum.accumulate(prefix)
+        swapped = int(np.count_nonzero(carried[:-1] > prefix[1:]))
+        values[:m - 1] = np.minimum(carried[:-1], prefix[1:])
+        values[m - 1] = carried[-1]
+        trace.record(values, compares=m - 1, swaps=swapped, writes=2 * swapped)
+        if not swapped:
+            break
+    return values
+
+
+def insertion_sort(values, trace):
+    """Insertion sort; the shift of each insertion is a single block move"""
+    for i in range(1, len(values)):
+        key = values[i]
+        pos = int(np.searchsorted(values[:i], key, side="right"))
+        shifts = i - pos
+        if shifts:
+            values[pos + 1:i + 1] = values[pos:i].copy()
+            values[pos] = key
+        trace.record(values, compares=shifts + (pos > 0), swaps=shifts, writes=shifts + 1 if shifts else 0)
+    return values
+
+
+def merge_sort(values, trace):
+    """Bottom-up merge sort that merges every pair of runs of a level at once.
+
+    The comparison count is the one a sequential two-finger merge makes:
+    every element except the tail left over once one run is exhausted.
+    """
+    n = len(values)
+    width = 1
+    while width < n:
+        block = 2 * width
+        pairs_count = -(-n // block)
+        padded = np.full(pairs_count * block, values.max(), dtype=values.dtype)
+        padded[:n] = values
+        valid = (np.arange(pairs_count * block) < n).reshape(pairs_count, 2, width)
+        pairs = padded.reshape(pairs_count, 2, width)
+        left, right = pairs[:, 0], pairs[:, 1]
+        left_valid, right_valid = valid[:, 0], valid[:, 1]
+        len_left = left_valid.sum(axis=1)
+        len_right = right_valid.sum(axis=1)
+        rows = np.arange(pairs_count)
+        max_left = left[rows, np.maximum(len_left - 1, 0)]
+        max_right = right[rows, np.maximum(len_right - 1, 0)]
+        tail_right = ((right >= max_left[:, None]) & right_valid).sum(axis=1)
+        tail_left = ((left > max_right[:, None]) & left_valid).sum(axis=1)
+        tail = np.where(max_left <= max_right, tail_right, tail_left)
+        compares = np.where(len_right > 0, len_left + len_right - tail, 0).sum()
+
+        values[:] = np.sort(padded.reshape(pairs_count, block), axis=1).ravel()[:n]
+        trace.record(values, compares=compares, writes=n)
+        width = block
+    return values
+
+
+def quick_sort(values, trace, seed=0):
+    """Randomized three-way quicksort that partitions every open segment of a round at once"""
+    rng = np.random.default_rng(seed)
+    starts = np.array([0] if len(values) > 1 else [], dtype=np.int64)
+    ends = np.array([len(values)] if len(values) > 1 else [], dtype=np.int64)
+    while len(starts):
+        lengths = ends - starts
+        total = int(lengths.sum())
+        offsets = np.cumsum(lengths) - lengths
+        segment = np.repeat(np.arange(len(starts)), lengths)
+        positions = np.repeat(starts - offsets, lengths) + np.arange(total)
+        segment_values = values[positions]
+
+        pivots = values[starts + (rng.random(len(starts)) * lengths).astype(np.int64)]
+        pivot_of = pivots[segment]
+        category = (segment_values >= pivot_of).astype(np.int64) + (segment_values > pivot_of)
+
+        # Stable rank of each element inside its (segment, category) group
+        counts = np.bincount(segment * 3 + category, minlength=3 * len(starts)).reshape(-1, 3)
+        bases = np.cumsum(counts, axis=1) - counts
+        rank = np.empty(total, dtype=np.int64)
+        for c in range(3):
+            member = category == c
+            running = np.cumsum(member)
+            before = (running - member)[offsets]
+            rank[member] = (running - before[segment])[member] - 1
+        destination = offsets[segment] + bases[segment, category] + rank
+
+        moved = int(np.count_nonzero(destination != np.arange(total)))
+        arranged = np.empty_like(segment_values)
+        arranged[destination] = segment_values
+        values[positions] = arranged
+
+        not_less = int(counts[:, 1:].sum())
+        compares = (total - len(starts)) + (not_less - len(starts))
+        trace.record(values, compares=compares, swaps=moved // 2, writes=moved)
+
+        less_end = starts + counts[:, 0]
+        greater_start = less_end + counts[:, 1]
+        new_starts = np.concatenate([starts, greater_start])
+        new_ends = np.concatenate([less_end, ends])
+        open_segments = new_ends - new_starts > 1
+        starts, ends = new_starts[open_segments], new_ends[open_segments]
+    return values
+
+
+def heap_sort(values, trace):
+    """Heap sort; sift-down is inherently sequential so it runs on a Python list"""
+    heap = values.tolist()
+    n = len(heap)
+
+    def sift_down(root, end):
+        compares = swaps = 0
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                break
+            if child + 1 < end:
+                compares += 1
+                if heap[child] < heap[child + 1]:
+                    child += 1
+            compares += 1
+            if heap[root] >= heap[child]:
+                break
+            heap[root], heap[child] = heap[child], heap[root]
+            swaps += 1
+            root = child
+        return compares, swaps
+
+    def snapshot():
+        return np.array([heap[c] for c in trace.columns], dtype=values.dtype)
+
+    for root in range(n // 2 - 1, -1, -1):
+        compares, swaps = sift_down(root, n)
+        if trace.advance(compares, swaps, 2 * swaps):
+            trace.store(snapshot())
+    for end in range(n - 1, 0, -1):
+        heap[0], heap[end] = heap[end], heap[0]
+        compares, swaps = sift_down(0, end)
+        if trace.advance(compares, swaps + 1, 2 * (swaps + 1)):
+            trace.store(snapshot())
+    values[:] = heap
+    return values
+
+
+def radix_sort(values, trace):
+    """LSD radix sort on bytes; each pass is a stable counting sort of one digit"""
+    if not len(values):
+        return values
+    low = values.min()
+    keys = (values - low).astype(np.uint64)
+    passes = max(1, (int(keys.max()).bit_length() + 7) // 8)
+    for p in range(passes):
+        digit = ((keys >> np.uint64(8 * p)) & np.uint64(0xFF)).astype(np.uint8)
+        order = np.argsort(digit, kind="stable")
+        keys = keys[order]
+        values[:] = keys.astype(values.dtype) + low
+        trace.record(values, writes=len(values))
+    return values
+
+
+SORTING_ALGORITHMS = {
+    "Bubble Sort": (bubble_sort, 20_000),
+    "Insertion Sort": (insertion_sort, 50_000),
+    "Merge Sort": (merge_sort, 1_000_000),
+    "Quick Sort": (quick_sort, 1_000_000),
+    "Heap Sort": (heap_sort, 200_000),
+    "Radix Sort": (radix_sort, 1_000_000),
+}
+
+INPUT_DISTRIBUTIONS = ["Random", "Nearly Sorted", "Reversed", "Few Unique"]
+
+
+def make_input(size, distribution="Random", seed=0):
+    """Generate an integer array to sort"""
+    rng = np.random.default_rng(seed)
+    high = max(100, size * 10)
+    if distribution == "Nearly Sorted" and size:
+        values = np.sort(rng.integers(1, high, size))
+        swaps = max(1, size // 50)
+        i, j = rng.integers(0, size, swaps), rng.integers(0, size, swaps)
+        values[i], values[j] = values[j], values[i]
+        return values
+    if distribution == "Reversed":
+        return np.sort(rng.integers(1, high, size))[::-1].copy()
+    if distribution == "Few Unique":
+        return rng.integers(1, 9, size) * (high // 10)
+    return rng.integers(1, high, size)
+
+
+def run_sort(algorithm, values, frame_budget=DEFAULT_FRAME_BUDGET, width=DEFAULT_FRAME_WIDTH):
+    """Sort a copy of `values` with the named algorithm and return its `SortRun`"""
+    sort, max_size = SORTING_ALGORITHMS[algorithm]
+    if len(values) > max_size:
+        raise ValueError(f"{algorithm} is limited to {max_size:,} elements")
+    working = np.array(values, dtype=np.int64, copy=True)
+    trace = SortTrace(working, frame_budget=frame_budget, width=width)
+
+    started = time.perf_counter()
+    sort(working, trace)
+    seconds = time.perf_counter() - started
+    trace.finish(working)
+
+    frames, steps, compares, swaps, writes = trace.frame_data()
+    return SortRun(
+        algorithm=algorithm,
+        size=len(working),
+        compares=trace.total_compares,
+        swaps=trace.total_swaps,
+        writes=trace.total_writes,
+        seconds=seconds,
+        steps=trace.step,
+        is_sorted=bool(np.all(working[:-1] <= working[1:])),
+        columns=trace.columns,
+        frames=frames.copy(),
+        frame_steps=steps.copy(),
+        frame_compares=compares.copy(),
+        frame_swaps=swaps.copy(),
+        frame_writes=writes.copy(),
+    )
@@ -0,0 +1,86 @@
+"""Anti-diagonal Gotoh alignment against a plain O(nm) reference"""
+import numpy as np
+import pytest
+
+from alignment import align, mutate_sequence, random_sequence
+from substitution_matrices import encode, substitution_matrix
+
+NEG = float("-inf")
+
+
+def reference_score(a, b, mode, matrix, gap_open, gap_extend):
+    """Textbook Gotoh: H best score, E gap in `a` (horizontal), F gap in `b` (vertical)"""
+    alphabet, scores = substitution_matrix(matrix)
+    a_codes, b_codes = encode(a, alphabet), encode(b, alphabet)
+    n, m = len(a), len(b)
+    local = mode == "local"
+    H = np.full((n + 1, m + 1), NEG)
+    E = np.full((n + 1, m + 1), NEG)
+    F = np.full((n + 1, m + 1), NEG)
+    H[0, 0] = 0
+    for i in range(1, n + 1):
+        H[i, 0] = 0 if local else -(gap_open + (i - 1) * gap_extend)
+        F[i, 0] = NEG if local else H[i, 0]
+    for j in range(1, m + 1):
+        H[0, j] = 0 if local else -(gap_open + (j - 1) * gap_extend)
+        E[0, j] = NEG if local else H[0, j]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            E[i, j] = max(H[i, j - 1] - gap_open, E[i, j - 1] - gap_extend)
+            F[i, j] = max(H[i - 1, j] - gap_open, F[i - 1, j] - gap_extend)
+            H[i, j] = max(H[i - 1, j - 1] + scores[a_codes[i - 1], b_codes[j - 1]], E[i, j], F[i, j])
+            if local:
+                H[i, j] = max(H[i, j], 0)
+    return int(H.max() if local else H[n, m])
+
+
+def rescore(aligned_a, aligned_b, matrix, gap_open, gap_extend):
+    """Score of an alignment read back from its two gapped strings"""
+    alphabet, scores = substitution_matrix(matrix)
+    total, gap = 0, None
+    for x, y in zip(aligned_a, aligned_b):
+        if x == "-" or y == "-":
+            kind = "a" if x == "-" else "b"
+            total -= gap_extend if gap == kind else gap_open
+            gap = kind
+        else:
+            total += scores[encode(x, alphabet)[0], encode(y, alphabet)[0]]
+            gap = None
+    return int(total)
+
+
+@pytest.mark.parametrize("mode", ["global", "local"])
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_reference(mode, seed):
+    rng = np.random.default_rng(seed)
+    a = random_sequence(int(rng.integers(1, 40)), seed=seed)
+    b = mutate_sequence(a, rate=0.3, seed=seed + 100) or "A"
+    gap_open, gap_extend = int(rng.integers(2, 12)), int(rng.integers(1, 3))
+    result = align(a, b, mode, "BLOSUM62", gap_open, gap_extend)
+    assert result.score == reference_score(a, b, mode, "BLOSUM62", gap_open, gap_extend)
+    assert rescore(result.aligned_a, result.aligned_b, "BLOSUM62", gap_open, gap_extend) == result.score
+    assert result.aligned_a.replace("-", "") in a and result.aligned_b.replace("-", "") in b
+    if mode == "global":
+        assert result.aligned_a.replace("-", "") == a and result.aligned_b.replace("-", "") == b
+
+
+def test_unrelated_dna_pairs():
+    for seed in range(4):
+        a = random_sequence(25, alphabet="ACGT", seed=seed)
+        b = random_sequence(31, alphabet="ACGT", seed=seed + 50)
+        for mode in ("global", "local"):
+            result = align(a, b, mode, "DNA", 10, 1)
+            assert result.score == reference_score(a, b, mode, "DNA", 10, 1)
+
+
+def test_wide_band_equals_full():
+    a = random_sequence(60, seed=3)
+    b = mutate_sequence(a, rate=0.1, seed=4)
+    assert align(a, b, band=len(a) + len(b)).score == align(a, b).score
+
+
+def test_progress_reports_fractions():
+    a = random_sequence(400, seed=5)
+    reports = []
+    align(a, a, on_progress=reports.append)
+    assert reports and all(0 < fraction <= 1 for fraction in reports) and reports == sorted(reports)
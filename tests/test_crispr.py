@@ -0,0 +1,87 @@
+"""Guide scoring and the seed index of crispr.py"""
+import numpy as np
+import pytest
+
+from codons import encode_bases
+from crispr import (MAX_MISMATCHES, PAMS, build_index, find_sites, kmer_strings, load_index, mismatch_counts,
+                    mit_scores, query_index, reverse_complement, specificity)
+
+GUIDE = "GACGTTACCGATTGCAAGTC"
+NGG, NAG = PAMS.index("NGG"), PAMS.index("NAG")
+
+
+def pack(protospacer):
+    return find_sites(encode_bases(protospacer + "AGG"), ("NGG",))[0][0]
+
+
+def substitute(sequence, positions):
+    """`sequence` with the bases at the given 1-based positions changed"""
+    bases = list(sequence)
+    for position in positions:
+        bases[position - 1] = "ACGT"[("ACGT".index(bases[position - 1]) + 1) % 4]
+    return "".join(bases)
+
+
+def random_dna(length, seed):
+    return "".join(np.random.default_rng(seed).choice(list("ACGT"), length))
+
+
+@pytest.mark.parametrize("positions, pam, expected", [
+    ((), NGG, 1.0),
+    ((), NAG, 0.26),
+    ((1,), NGG, 1.0),
+    ((20,), NGG, 0.417),
+    # Two mismatches 19 apart: no spacing penalty, divided by 2²
+    ((1, 20), NGG, 0.417 / 4),
+    # Adjacent mismatches: mean spacing 1 gives a factor of 1 / (18/19·4 + 1)
+    ((19, 20), NGG, 0.315 * 0.417 / (72 / 19 + 1) / 4),
+])
+def test_mit_score(positions, pam, expected):
+    site = pack(substitute(GUIDE, positions))
+    assert mit_scores(pack(GUIDE), [site], [pam])[0] == pytest.approx(expected)
+
+
+def test_specificity():
+    assert specificity(np.array([1.0]), np.array([0])) == 100.0
+    assert specificity(np.array([1.0, 1.0]), np.array([0, 2])) == 50.0
+    assert specificity(np.array([1.0, 0.25, 0.25]), np.array([0, 1, 3])) == pytest.approx(100 / 1.5)
+
+
+def test_find_sites_both_strands():
+    flank = random_dna(30, seed=1).replace("GG", "GT").replace("AG", "AT")
+    sequence = flank[:10] + GUIDE + "TGG" + flank[10:]
+    sites, positions, strands, kinds = find_sites(encode_bases(sequence))
+    found = dict(zip(kmer_strings(sites), zip(positions, strands, kinds)))
+    assert found[GUIDE] == (10, 1, NGG)
+
+    sites, positions, strands, kinds = find_sites(encode_bases(reverse_complement(sequence)))
+    found = dict(zip(kmer_strings(sites), zip(positions, strands, kinds)))
+    assert found[GUIDE] == (len(sequence) - 10 - 20, -1, NGG)
+
+
+def test_mismatch_counts():
+    sites = [pack(substitute(GUIDE, range(1, count + 1))) for count in range(21)]
+    assert mismatch_counts(pack(GUIDE), sites).tolist() == list(range(21))
+
+
+def test_seed_index_matches_brute_force(tmp_path):
+    records = [("chr1", random_dna(20000, seed=2)), ("chr2", random_dna(5000, seed=3))]
+    build_index(records, tmp_path / "index")
+    index = load_index(tmp_path / "index")
+    assert index.names == ["chr1", "chr2"] and index.bases == 25000
+    rng = np.random.default_rng(4)
+    guides = [kmer_strings([index.sites[k]])[0] for k in rng.choice(len(index.sites), 20, replace=False)]
+    guides = [substitute(guide, rng.choice(np.arange(1, 21), rng.integers(0, 4), replace=False)) for guide in guides]
+    for guide in guides:
+        packed = pack(guide)
+        ids, mismatches = query_index(index, packed)
+        expected = np.flatnonzero(mismatch_counts(packed, index.sites) <= MAX_MISMATCHES)
+        assert ids.tolist() == expected.tolist()
+        assert mismatches.tolist() == mismatch_counts(packed, index.sites[expected]).tolist()
+        assert len(ids)
+
+
+def test_query_beyond_seed_guarantee(tmp_path):
+    build_index([("chr1", random_dna(1000, seed=5))], tmp_path / "index")
+    with pytest.raises(ValueError):
+        query_index(load_index(tmp_path / "index"), pack(GUIDE), MAX_MISMATCHES + 1)
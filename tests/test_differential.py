@@ -0,0 +1,38 @@
+"""Welch's t-test and Benjamini-Hochberg against reference values (computed with scipy.stats)"""
+import numpy as np
+import pytest
+
+from differential import benjamini_hochberg, t_two_sided_p, welch_t_test
+
+A = np.array([[5.1, 4.8, 5.6, 5.0, 4.9], [1.0, 2.0, 3.0, 4.0, 5.0]])
+B = np.array([[6.2, 5.9, 6.8, 6.1, 7.0], [1.5, 2.5, 2.0, 3.5, 2.5]])
+
+
+def test_welch_matches_reference():
+    t, df, p = welch_t_test(A, B)
+    np.testing.assert_allclose(t, [5.2015286811780665, -0.768221279597376], rtol=1e-12)
+    np.testing.assert_allclose(df, [6.908351933904119, 5.678748569248378], rtol=1e-12)
+    np.testing.assert_allclose(p, [0.0013034287495371029, 0.47307954061747975], rtol=1e-8)
+
+
+@pytest.mark.parametrize("t, df, expected", [
+    (2.0, 10, 0.07338803477074037),
+    (-2.0, 10, 0.07338803477074037),
+    (3.5, 4.2, 0.02299374245547738),
+    (0.0, 7, 1.0),
+])
+def test_t_two_sided_p(t, df, expected):
+    assert t_two_sided_p(t, df) == pytest.approx(expected, rel=1e-8)
+
+
+def test_constant_rows_give_nan():
+    t, df, p = welch_t_test(np.ones((1, 3)), np.ones((1, 3)))
+    assert np.isnan(p).all()
+
+
+def test_benjamini_hochberg():
+    np.testing.assert_allclose(benjamini_hochberg([0.01, 0.04, 0.03, 0.005]), [0.02, 0.04, 0.04, 0.02])
+    q = benjamini_hochberg([0.01, np.nan, 0.04])
+    assert np.isnan(q[1])
+    np.testing.assert_allclose(q[[0, 2]], [0.02, 0.04])
+    assert np.isnan(benjamini_hochberg([np.nan])).all()
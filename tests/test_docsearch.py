@@ -0,0 +1,63 @@
+"""Incremental document index rebuilds"""
+import os
+import shutil
+
+import pytest
+
+from asset_store import list_assets
+from docsearch import search, update_index
+
+
+@pytest.fixture
+def documents(tmp_path):
+    pdfs = list_assets()[:3]
+    if len(pdfs) < 2:
+        pytest.skip("needs at least two PDFs in Assets/")
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    return [shutil.copy2(pdf, folder / pdf.name) for pdf in pdfs]
+
+
+def generations(search_dir):
+    return sorted(path.name for path in search_dir.iterdir() if path.is_dir())
+
+
+def test_unchanged_files_are_not_extracted(documents, tmp_path):
+    search_dir = tmp_path / "search"
+    search_dir.mkdir()
+    index, extracted = update_index(documents, search_dir)
+    assert extracted == len(documents)
+    assert [doc["name"] for doc in index.documents] == [path.name for path in documents]
+
+    again, extracted = update_index(documents, search_dir)
+    assert extracted == 0
+    assert again.directory == index.directory
+    assert generations(search_dir) == [index.directory.name]
+
+
+def test_modified_and_removed_files(documents, tmp_path):
+    search_dir = tmp_path / "search"
+    search_dir.mkdir()
+    first, _ = update_index(documents, search_dir)
+    stat = documents[0].stat()
+    os.utime(documents[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    second, extracted = update_index(documents, search_dir)
+    assert extracted == 1
+    assert second.directory != first.directory
+    # The previous generation stays for readers that still have it open
+    assert generations(search_dir) == sorted([first.directory.name, second.directory.name])
+
+    third, extracted = update_index(documents[1:], search_dir)
+    assert extracted == 0
+    assert [doc["name"] for doc in third.documents] == [path.name for path in documents[1:]]
+    # Only the current and the previous generation are kept
+    assert generations(search_dir) == sorted([second.directory.name, third.directory.name])
+
+
+def test_titles_are_searchable(documents, tmp_path):
+    search_dir = tmp_path / "search"
+    search_dir.mkdir()
+    index, _ = update_index(documents, search_dir)
+    word = documents[0].stem.split()[0]
+    assert documents[0].name in [hit.name for hit in search(index, word)]
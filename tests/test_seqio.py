@@ -0,0 +1,86 @@
+"""FASTA/FASTQ indexing against samtools faidx/fqidx output"""
+import os
+
+import pytest
+
+from seqio import IndexedFasta, build_fai, load_fai, read_fai, write_fai
+
+FASTA = ">chr1 desc\nACGTACGTAC\nGGGGCCCCTT\nACG\n>chr2\nAAAA\n"
+# `samtools faidx` on FASTA
+FASTA_FAI = "chr1\t23\t11\t10\t11\nchr2\t4\t43\t4\t5\n"
+FASTQ = "@r1\nACGT\n+\nIIII\n@r2\nAC\n+\n#I\n"
+# `samtools fqidx` on FASTQ
+FASTQ_FAI = "r1\t4\t4\t4\t5\t11\nr2\t2\t20\t2\t3\t25\n"
+
+
+@pytest.mark.parametrize("text, expected", [(FASTA, FASTA_FAI), (FASTQ, FASTQ_FAI)])
+def test_fai_round_trip(tmp_path, text, expected):
+    path = tmp_path / "reads.fa"
+    path.write_text(text)
+    entries = build_fai(path)
+    write_fai(entries, tmp_path / "reads.fa.fai")
+    assert (tmp_path / "reads.fa.fai").read_text() == expected
+    assert read_fai(tmp_path / "reads.fa.fai") == entries
+
+
+def test_crlf_line_length(tmp_path):
+    path = tmp_path / "crlf.fa"
+    path.write_bytes(b">s\r\nACGT\r\nAC\r\n")
+    [entry] = build_fai(path)
+    assert (entry.length, entry.offset, entry.line_bases, entry.line_bytes) == (6, 4, 4, 6)
+
+
+def test_fetch_across_lines(tmp_path):
+    path = tmp_path / "genome.fa"
+    path.write_text(FASTA)
+    sequence = "ACGTACGTACGGGGCCCCTTACG"
+    with IndexedFasta(path) as reader:
+        assert reader.names == ["chr1", "chr2"]
+        assert reader.fetch("chr1") == sequence
+        for start, end in [(0, 1), (3, 7), (8, 12), (5, 21), (9, 23), (20, 40)]:
+            assert reader.fetch("chr1", start, end) == sequence[start:end]
+        assert reader.fetch("chr2", 1, 3) == "AA"
+        assert reader.fetch("chr1", 10, 10) == ""
+    with pytest.raises(ValueError):
+        reader.fetch("chr1")
+
+
+def test_fastq_quality(tmp_path):
+    path = tmp_path / "reads.fq"
+    path.write_text(FASTQ)
+    with IndexedFasta(path) as reader:
+        assert reader.is_fastq
+        assert reader.fetch("r2") == "AC"
+        assert reader.quality("r2").tobytes() == b"#I"
+
+
+def test_truncated_file_raises(tmp_path):
+    path = tmp_path / "short.fa"
+    path.write_text(FASTA)
+    # An index that claims more bases than the file holds
+    (tmp_path / "short.fa.fai").write_text(FASTA_FAI.replace("chr2\t4\t", "chr2\t40\t"))
+    with IndexedFasta(path) as reader, pytest.raises(ValueError):
+        reader.fetch("chr2")
+
+
+def test_cached_index_reused_until_file_changes(tmp_path):
+    path = tmp_path / "genome.fa"
+    path.write_text(FASTA)
+    assert [entry.name for entry in load_fai(path)] == ["chr1", "chr2"]
+    fai = tmp_path / "genome.fa.fai"
+    assert fai.read_text() == FASTA_FAI
+    # A newer index is trusted as is, without rescanning the file
+    fai.write_text("only\t1\t6\t1\t2\n")
+    os.utime(fai, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    assert [entry.name for entry in load_fai(path)] == ["only"]
+    # Once the file is newer than its index, the index is rebuilt
+    os.utime(path, ns=(fai.stat().st_mtime_ns + 10**9,) * 2)
+    assert [entry.name for entry in load_fai(path)] == ["chr1", "chr2"]
+    assert fai.read_text() == FASTA_FAI
+
+
+def test_duplicate_names_raise(tmp_path):
+    path = tmp_path / "dup.fa"
+    path.write_text(">a\nAC\n>a\nGT\n")
+    with pytest.raises(ValueError):
+        build_fai(path)
@@ -0,0 +1,159 @@
+"""Page images of the PDF documents, rasterized in the background job pool.
+
+Rasterizing a page is CPU-bound, so it runs in the worker processes of
+the shared JobScheduler (see jobs.py) instead of on the script thread.
+Images are cached on disk by content hash, page and width. A renamed copy of a file reuses its
+images, and an edited file gets new ones.
+
+`PageRenderer.request` never blocks. It returns the cached image, or
+schedules the render and reports it pending so the page can poll.
+Requests for the same image share one job, across all sessions.
+"""
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import wait
+from io import BytesIO
+from pathlib import Path
+
+import streamlit as st
+
+from asset_store import APP_DIR, load_asset
+from image_store import RENDITION_FORMAT
+
+THUMBNAIL_DIR = APP_DIR / ".cache" / "thumbnails"
+THUMBNAIL_WIDTH = 240
+PREVIEW_WIDTH = 1200
+FAILED_RETRY_SECONDS = 300
+RENDER_WAIT_SECONDS = 10
+READY, PENDING, FAILED = "ready", "pending", "failed"
+
+
+def rasterize(path, page, width, fmt):
+    """Render one page of a PDF `width` pixels wide and encode it (runs in a worker process)"""
+    import pypdfium2 as pdfium
+
+    document = pdfium.PdfDocument(path)
+    try:
+        pdf_page = document[page]
+        image = pdf_page.render(scale=width / pdf_page.get_width()).to_pil()
+    finally:
+        document.close()
+    buffer = BytesIO()
+    image.save(buffer, format=fmt, quality=85)
+    return buffer.getvalue()
+
+
+def count_pages(path):
+    """Number of pages of a PDF (runs in a worker process); ValueError when it cannot be read"""
+    import pypdfium2 as pdfium
+
+    try:
+        document = pdfium.PdfDocument(path)
+    except pdfium.PdfiumError as error:
+        # Raised as ValueError so the server need not import pdfium to catch it
+        raise ValueError(f"{Path(path).name} is not a readable PDF: {error}") from None
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+@st.cache_resource(show_spinner=False, max_entries=512)
+def _content_digest(path, mtime_ns, size):
+    """Hash a document once per process; mtime and size make edits invalidate the entry"""
+    return hashlib.sha1(load_asset(path)).hexdigest()
+
+
+def content_digest(path):
+    stat = Path(path).stat()
+    return _content_digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+class PageRenderer:
+    """In-flight and failed renders on the scheduler's pool, keyed by cache file"""
+
+    def __init__(self, scheduler, cache_dir=THUMBNAIL_DIR, fmt=RENDITION_FORMAT):
+        self.scheduler = scheduler
+        self.cache_dir = cache_dir
+        self.fmt = fmt
+        self._jobs = {}  # cache file -> Future
+        self._failed = {}  # cache file -> (error message, time it failed); retried after FAILED_RETRY_SECONDS
+        self._pages = {}  # content digest -> page count
+        self._lock = threading.Lock()
+
+    def cache_file(self, path, page, width):
+        return self.cache_dir / f"{content_digest(path)}-p{page}-w{width}.{self.fmt.lower()}"
+
+    def request(self, path, page=0, width=THUMBNAIL_WIDTH):
+        """(READY, image bytes), (PENDING, None) after scheduling the render, or (FAILED, error)"""
+        target = self.cache_file(path, page, width)
+        try:
+            return READY, target.read_bytes()
+        except OSError:
+            pass
+        with self._lock:
+            failed = self._failed.get(target)
+            if failed is not None:
+                error, failed_at = failed
+                if time.monotonic() - failed_at < FAILED_RETRY_SECONDS:
+                    return FAILED, error
+                del self._failed[target]
+            job = self._jobs.get(target)
+            if job is None:
+                job = self._jobs[target] = self.scheduler.run(rasterize, str(path), page, width, self.fmt)
+        if not job.done():
+            return PENDING, None
+        return self._collect(target, job)
+
+    def render(self, path, page=0, width=PREVIEW_WIDTH, timeout=RENDER_WAIT_SECONDS):
+        """Variant of `request` that waits up to `timeout` seconds, for an image the visitor asked for explicitly"""
+        status, data = self.request(path, page, width)
+        if status != PENDING:
+            return status, data
+        target = self.cache_file(path, page, width)
+        with self._lock:
+            job = self._jobs.get(target)
+        if job is None:
+            return self.request(path, page, width)
+        if not wait([job], timeout).done:
+            return PENDING, None
+        return self._collect(target, job)
+
+    def pages(self, path, timeout=RENDER_WAIT_SECONDS):
+        """Page count of a document, computed once per content hash.
+
+        Raises ValueError or OSError for an unreadable document, TimeoutError
+        when the pool is too busy and BrokenProcessPool when a worker died.
+        """
+        digest = content_digest(path)
+        with self._lock:
+            count = self._pages.get(digest)
+        if count is None:
+            # Not awaited under the lock; two sessions may both count a new document once
+            count = self.scheduler.run(count_pages, str(path)).result(timeout)
+            with self._lock:
+                self._pages[digest] = count
+        return count
+
+    def _collect(self, target, job):
+        """Move a finished job to the disk cache, or remember why it failed"""
+        with self._lock:
+            self._jobs.pop(target, None)
+            error = job.exception()
+            if error is not None:
+                message = f"{type(error).__name__}: {error}"
+                self._failed[target] = message, time.monotonic()
+                return FAILED, message
+        data = job.result()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Unique per thread too: two sessions can collect the same finished job at once
+            tmp = target.with_name(f"{target.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+        except OSError:
+            # A read-only deployment renders the image again on the next request
+            pass
+        return READY, data
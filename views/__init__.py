@@ -0,0 +1 @@
+"""Page scripts of the portfolio, registered with st.navigation and run only when visited"""
@@ -0,0 +1,627 @@
+"""Algorithms page: interactive biotech algorithm visualizations"""
+import streamlit as st
+from io import BytesIO
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from asset_store import APP_DIR, list_assets
+from instrumentation import instrument, span
+from playback import (
+    HIGHLIGHT_COLOR, animated_bar_figure, animated_heatmap_figure, animated_line_figure, frame_indices, reveal_frames,
+)
+from alignment import ALIGNMENT_MODES, mutate_sequence, random_sequence
+from algorithm_jobs import (
+    alignment, compare_sorts, composition_scan, layout_image, recurrence_profile, sort_experiment,
+)
+from sorting import SORTING_ALGORITHMS, INPUT_DISTRIBUTIONS
+from matrix_layouts import MATRIX_LAYOUTS
+from binomial_triangle import pascal_mod, pascal_rows, pascal_text, triangle_image
+from codons import BASES, NCBI_TABLES, analyze_records, codon_table_frame
+from seqio import SEQUENCE_SUFFIXES, iter_fasta, open_indexed, write_fasta
+from composition import MAX_K
+from downsample import downsample_series
+from protein_profile import AMINO_ACIDS, encode_batch, helical_wheel, hydropathy_windows, profile_proteins
+from recurrences import RECURRENCE_PRESETS, linear_sequence
+from views.shared import (
+    DASHBOARD_POINTS, EXAMPLE_DNA, EXAMPLE_PROTEINS, background_job, random_genome_records, spool_upload,
+    tracked_button,
+)
+
+ANIMATED_MATRIX_LIMIT = 32
+BROWSER_WINDOWS = [120, 600, 3_000, 6_000]
+DEMO_GENOME_PATH = APP_DIR / ".cache" / "demo" / "demo_genome.fa"
+SORTING_LAB_SIZES = [10, 100, 1_000, 10_000, 20_000, 50_000, 100_000, 200_000, 1_000_000]
+
+@st.fragment
+@instrument
+def create_rotating_algorithm_viz():
+    """Create an interactive rotating algorithm visualization for biotech applications.
+
+    Runs as a fragment, so changing a control reruns only the selected visualization.
+    """
+    st.markdown("### 🔬 Biotech Algorithm Visualization")
+    
+    # Algorithm selection
+    algorithm = st.selectbox(
+        "Choose Algorithm to Visualize:",
+        ["Sequence Alignment", "Sorting Lab", "Protein Pattern", "Genomic Matrix", "Gene Expression Sequence",
+         "Genome Browser", "Genome Composition"]
+    )
+    
+    if algorithm == "Sequence Alignment":
+        create_sequence_alignment()
+    elif algorithm == "Sorting Lab":
+        create_sorting_lab()
+    elif algorithm == "Protein Pattern":
+        create_number_pattern()
+    elif algorithm == "Genomic Matrix":
+        create_spiral_matrix()
+    elif algorithm == "Gene Expression Sequence":
+        create_fibonacci_sequence()
+    elif algorithm == "Genome Browser":
+        create_genome_browser()
+    elif algorithm == "Genome Composition":
+        create_genome_composition()
+
+@instrument
+def create_sorting_lab():
+    """Sorting lab with step traces played back in the browser"""
+    st.markdown('<div class="algorithm-viz">', unsafe_allow_html=True)
+    
+    if 'sort_seed' not in st.session_state:
+        st.session_state.sort_seed = 0
+    
+    lab_col1, lab_col2, lab_col3 = st.columns(3)
+    with lab_col1:
+        algorithm = st.selectbox("Sorting Algorithm:", list(SORTING_ALGORITHMS))
+    with lab_col2:
+        distribution = st.selectbox("Input Pattern:", INPUT_DISTRIBUTIONS)
+    max_size = SORTING_ALGORITHMS[algorithm][1]
+    sizes = [size for size in SORTING_LAB_SIZES if size <= max_size]
+    with lab_col3:
+        size = st.select_slider("Elements:", sizes, value=sizes[1])
+    
+    if tracked_button("🎲 New Sequence Sample", key="sort_sample"):
+        st.session_state.sort_seed += 1
+    
+    with span("sorting lab: submit sort"):
+        run = background_job("Sorting", sort_experiment, algorithm, size, distribution, st.session_state.sort_seed)
+    if run is None:
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Comparisons", f"{run.compares:,}")
+    metric_cols[1].metric("Swaps", f"{run.swaps:,}")
+    metric_cols[2].metric("Writes", f"{run.writes:,}")
+    metric_cols[3].metric("Wall Time", f"{run.seconds * 1000:.1f} ms")
+    
+    with span("sorting lab: animation"):
+        fig = animated_bar_figure(
+            run.frames, x=run.columns,
+            title=f"{algorithm} · {size:,} elements", y_title="Expression Level",
+            frame_duration=100,
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        f"▶ {run.steps:,} steps recorded as {len(run.frames)} frames of {len(run.columns)} sampled positions. "
+        f"Quadratic algorithms are capped at {SORTING_ALGORITHMS['Bubble Sort'][1]:,} (bubble) "
+        f"and {SORTING_ALGORITHMS['Insertion Sort'][1]:,} (insertion) elements."
+    )
+    
+    # The comparison stays on screen while its job runs and until the input changes
+    comparison = (size, distribution, st.session_state.sort_seed)
+    if tracked_button("⚖️ Compare All Algorithms", key="sort_compare"):
+        st.session_state.sort_comparison = comparison
+    if st.session_state.get("sort_comparison") == comparison:
+        rows = background_job("Comparing algorithms", compare_sorts, *comparison)
+        if rows:
+            st.dataframe(pd.DataFrame(rows).set_index("Algorithm"), use_container_width=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@instrument
+def create_alignment_heatmap(result):
+    """Score matrix heatmap with the traceback path drawn on top"""
+    row_step, col_step = result.preview_step
+    path = result.path[frame_indices(len(result.path), 2000)]
+    fig = go.Figure(go.Heatmap(
+        z=result.preview, colorscale="Tealgrn", colorbar={"title": "Score"},
+        x0=0, dx=col_step, y0=0, dy=row_step,
+    ))
+    fig.add_trace(go.Scatter(
+        x=path[:, 1], y=path[:, 0], mode="lines",
+        line={"color": HIGHLIGHT_COLOR, "width": 2}, name="Traceback",
+    ))
+    fig.update_yaxes(autorange="reversed", title="Sequence A")
+    fig.update_xaxes(title="Sequence B")
+    fig.update_layout(title="Alignment Score Matrix", margin={"l": 40, "r": 20, "t": 50, "b": 40})
+    return fig
+
+@instrument
+def create_sequence_alignment():
+    """Pairwise sequence alignment with affine gaps"""
+    st.markdown('<div class="algorithm-viz">', unsafe_allow_html=True)
+    
+    with st.form("alignment_form"):
+        source = st.radio("Sequences:", ["Example Proteins", "Custom Sequences", "Random Pair"], horizontal=True)
+        seq_col1, seq_col2 = st.columns(2)
+        with seq_col1:
+            custom_a = st.text_area("Sequence A", EXAMPLE_PROTEINS["Hemoglobin α (human)"])
+        with seq_col2:
+            custom_b = st.text_area("Sequence B", EXAMPLE_PROTEINS["Hemoglobin β (human)"])
+        
+        opt_col1, opt_col2, opt_col3, opt_col4 = st.columns(4)
+        with opt_col1:
+            mode_label = st.selectbox("Mode", list(ALIGNMENT_MODES))
+        with opt_col2:
+            matrix = st.selectbox("Substitution Matrix", ["BLOSUM62", "BLOSUM45", "PAM250", "DNA"])
+        with opt_col3:
+            gap_open = st.number_input("Gap Open", 1, 50, 10)
+        with opt_col4:
+            gap_extend = st.number_input("Gap Extend", 1, 20, 1)
+        
+        band_col1, band_col2, band_col3 = st.columns(3)
+        with band_col1:
+            banded = st.checkbox("Banded alignment")
+            band = st.number_input("Band width", 1, 5000, 100)
+        with band_col2:
+            random_length = st.select_slider("Random pair length", [100, 500, 1_000, 2_000, 5_000, 10_000], value=1_000)
+        with band_col3:
+            mutation_rate = st.slider("Random pair divergence", 0.0, 0.5, 0.1)
+        
+        submitted = st.form_submit_button("🧬 Align Sequences")
+    
+    if submitted or 'alignment_request' not in st.session_state:
+        if source == "Random Pair":
+            alphabet = "ACGT" if matrix == "DNA" else "ACDEFGHIKLMNPQRSTVWY"
+            seq_a = random_sequence(random_length, alphabet, seed=random_length)
+            seq_b = mutate_sequence(seq_a, mutation_rate, alphabet, seed=random_length + 1)
+        elif source == "Custom Sequences":
+            seq_a, seq_b = ("".join(text.split()).upper() for text in (custom_a, custom_b))
+        else:
+            seq_a, seq_b = EXAMPLE_PROTEINS.values()
+        st.session_state.alignment_request = (
+            seq_a, seq_b, ALIGNMENT_MODES[mode_label], matrix, int(gap_open), int(gap_extend),
+            int(band) if banded else None,
+        )
+    
+    seq_a, seq_b = st.session_state.alignment_request[:2]
+    result = None
+    if not seq_a or not seq_b:
+        st.error("❌ Please enter both sequences")
+    else:
+        with span("alignment: submit align"):
+            result = background_job("Alignment", alignment, *st.session_state.alignment_request)
+    
+    if result is not None:
+        metric_cols = st.columns(5)
+        metric_cols[0].metric("Score", result.score)
+        metric_cols[1].metric("Identity", f"{result.identity:.1%}")
+        metric_cols[2].metric("Alignment Length", f"{len(result.aligned_a):,}")
+        metric_cols[3].metric("Cells Computed", f"{result.cells:,}")
+        metric_cols[4].metric("Wall Time", f"{result.seconds * 1000:.0f} ms")
+        
+        with span("alignment: heatmap"):
+            st.plotly_chart(create_alignment_heatmap(result), use_container_width=True)
+        
+        shown = 600
+        lines = []
+        for start in range(0, min(len(result.aligned_a), shown), 60):
+            top = result.aligned_a[start:start + 60]
+            bottom = result.aligned_b[start:start + 60]
+            middle = "".join("|" if x == y and x != "-" else " " for x, y in zip(top, bottom))
+            lines.extend([top, middle, bottom, ""])
+        st.code("\n".join(lines))
+        if len(result.aligned_a) > shown:
+            st.caption(f"Showing the first {shown} of {len(result.aligned_a):,} alignment columns.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@st.cache_data(show_spinner="🧬 Translating sequences...", max_entries=8)
+def cached_translation(source_key, _records, table_id, min_length):
+    """Six-frame translation and ORF scan, cached per input, table and ORF length"""
+    return analyze_records(_records(), table_id, min_length)
+
+@instrument
+def create_codon_translation():
+    """Genetic code table and six-frame translation of DNA sequences"""
+    table_col, orf_col = st.columns([2, 1])
+    with table_col:
+        table_id = st.selectbox(
+            "Translation Table:", list(NCBI_TABLES),
+            format_func=lambda table: f"{table} · {NCBI_TABLES[table][0]}",
+        )
+    with orf_col:
+        min_length = st.number_input("Minimum ORF length (aa):", 10, 1000, 100)
+    
+    with st.expander("🧬 Codon Table", expanded=False):
+        st.dataframe(pd.DataFrame.from_dict(codon_table_frame(table_id), orient="index", columns=list(BASES)),
+                     use_container_width=True)
+        st.caption("Rows: first and third base · Columns: second base · ▶ marks start codons")
+    
+    source = st.radio("DNA Source:", ["Example Sequence", "Upload FASTA", "Random 5 Mb Genome"], horizontal=True)
+    if source == "Upload FASTA":
+        uploaded = st.file_uploader("FASTA file", type=["fasta", "fa", "fna", "ffn", "txt"])
+        if uploaded is None:
+            st.info("📂 Upload a FASTA file with one or more DNA records.")
+            return
+        source_key = uploaded.file_id
+        
+        def records():
+            uploaded.seek(0)
+            return iter_fasta(uploaded)
+    elif source == "Random 5 Mb Genome":
+        source_key = "random-genome"
+        records = random_genome_records
+    else:
+        sequence = st.text_area("DNA Sequence", EXAMPLE_DNA, height=120)
+        source_key = sequence
+        
+        def records():
+            return iter_fasta(BytesIO(sequence.encode()))
+    
+    summaries, orf_rows, frames = cached_translation(source_key, records, table_id, int(min_length))
+    if not summaries:
+        st.warning("No sequences found.")
+        return
+    
+    st.dataframe(pd.DataFrame(summaries).set_index("Record"), use_container_width=True)
+    if orf_rows:
+        st.markdown(f"**Longest open reading frames** (≥ {min_length} aa)")
+        st.dataframe(pd.DataFrame(orf_rows), use_container_width=True, hide_index=True)
+    else:
+        st.info(f"No ORFs of at least {min_length} amino acids found.")
+    st.markdown("**Six-frame translation** (first record)")
+    st.code("\n".join(f"{label}  {protein}" for label, protein in frames.items()))
+
+@st.cache_data(show_spinner="🔺 Rasterizing triangle...", max_entries=16)
+def cached_triangle_image(rows, modulus):
+    """Mod-p Pascal triangle rendered once per size and modulus"""
+    return triangle_image(pascal_mod(rows, modulus), modulus)
+
+@st.cache_data(show_spinner="🧪 Profiling proteins...", max_entries=8)
+def cached_protein_profile(source_key, _records, window, ph):
+    """Batched property table for a protein source, cached per input, window and pH"""
+    names, sequences = [], []
+    for header, sequence in _records():
+        names.append(header.split()[0] if header else f"protein_{len(names) + 1}")
+        sequences.append(sequence.decode("ascii", "replace").upper().rstrip("*"))
+    return names, sequences, profile_proteins(names, sequences, window=window, ph=ph)
+
+@instrument
+def create_protein_profiler():
+    """Hydropathy, charge, pI and helical wheels for many proteins at once"""
+    window_col, ph_col = st.columns(2)
+    with window_col:
+        window = st.slider("Hydropathy window:", 5, 21, 9, step=2)
+    with ph_col:
+        ph = st.slider("pH:", 0.0, 14.0, 7.0, step=0.5)
+    
+    source = st.radio("Protein Source:", ["Example Proteins", "Upload FASTA", "Random 5,000 Proteins"],
+                      horizontal=True)
+    if source == "Upload FASTA":
+        uploaded = st.file_uploader("Protein FASTA file", type=["fasta", "fa", "faa", "txt"])
+        if uploaded is None:
+            st.info("📂 Upload a FASTA file with one or more protein records.")
+            return
+        source_key = uploaded.file_id
+        
+        def records():
+            uploaded.seek(0)
+            return iter_fasta(uploaded)
+    elif source == "Random 5,000 Proteins":
+        source_key = "random-proteins"
+        
+        def records():
+            rng = np.random.default_rng(0)
+            residues = np.frombuffer(AMINO_ACIDS.encode(), dtype=np.uint8)
+            for index, length in enumerate(rng.integers(50, 1500, 5_000)):
+                yield f"random_{index + 1}", residues[rng.integers(0, len(residues), length)].tobytes()
+    else:
+        source_key = "examples"
+        
+        def records():
+            return ((name, sequence.encode()) for name, sequence in EXAMPLE_PROTEINS.items())
+    
+    names, sequences, table = cached_protein_profile(source_key, records, window, ph)
+    if not names:
+        st.warning("No sequences found.")
+        return
+    
+    frame = pd.DataFrame(table)
+    st.dataframe(frame, use_container_width=True, hide_index=True, height=min(400, 38 + 35 * len(frame)))
+    
+    scatter = go.Figure(go.Scattergl(
+        x=frame["GRAVY"], y=frame["pI"], mode="markers", text=frame["Protein"],
+        marker=dict(size=6, color=frame["Length"], colorscale="Tealgrn", showscale=True,
+                    colorbar=dict(title="Length")),
+        hovertemplate="%{text}<br>GRAVY %{x}<br>pI %{y}<extra></extra>",
+    ))
+    scatter.update_layout(title=f"pI vs GRAVY ({len(frame):,} proteins)", xaxis_title="GRAVY",
+                          yaxis_title="pI", height=400)
+    st.plotly_chart(scatter, use_container_width=True)
+    
+    selected = st.selectbox("Protein:", range(len(names)), format_func=lambda index: names[index])
+    sequence = sequences[selected]
+    profile_col, wheel_col = st.columns([3, 2])
+    with profile_col:
+        means = hydropathy_windows(encode_batch([sequence]), window)[0]
+        profile = go.Figure(go.Scatter(x=np.arange(1, len(means) + 1) + window // 2, y=means, mode="lines",
+                                       line=dict(color="#26A69A")))
+        profile.add_hline(y=0, line_dash="dot", line_color="gray")
+        profile.update_layout(title=f"Kyte–Doolittle profile ({window}-residue window)",
+                              xaxis_title="Residue", yaxis_title="Hydropathy", height=380)
+        st.plotly_chart(profile, use_container_width=True)
+    with wheel_col:
+        angles, values, residues = helical_wheel(sequence)
+        wheel = go.Figure(go.Scatterpolar(
+            r=[1.0] * len(angles), theta=angles, mode="markers+text", text=residues,
+            marker=dict(size=26, color=values, colorscale="RdBu_r", cmid=0, line=dict(color="white", width=1)),
+            textfont=dict(color="black"), hovertemplate="%{text}: %{marker.color}<extra></extra>",
+        ))
+        wheel.update_layout(title="Helical wheel (first 18 residues)", height=380, showlegend=False,
+                            polar=dict(radialaxis=dict(visible=False, range=[0, 1.2]),
+                                       angularaxis=dict(direction="clockwise", showticklabels=False)))
+        st.plotly_chart(wheel, use_container_width=True)
+
+@instrument
+def create_number_pattern():
+    """Interactive protein pattern visualization"""
+    st.markdown('<div class="algorithm-viz">', unsafe_allow_html=True)
+    pattern_type = st.selectbox("Choose Pattern:", ["Amino Acid Triangle", "Codon Table", "Protein Spiral"])
+    
+    if pattern_type == "Amino Acid Triangle":
+        view = st.radio("Triangle View:", ["Exact Values", "Modular Pattern"], horizontal=True)
+        if view == "Exact Values":
+            rows = st.slider("Number of rows:", 3, 30, 5)
+            st.code(pascal_text(pascal_rows(rows)))
+        else:
+            mod_col1, mod_col2 = st.columns([2, 1])
+            with mod_col1:
+                rows = st.select_slider("Number of rows:", [64, 128, 256, 512, 1024, 2048, 4096], value=512)
+            with mod_col2:
+                modulus = st.selectbox("Modulus (p):", [2, 3, 5, 7])
+            st.image(cached_triangle_image(rows, modulus),
+                     caption=f"C(n, k) mod {modulus} for {rows:,} rows", use_container_width=True)
+    
+    elif pattern_type == "Codon Table":
+        create_codon_translation()
+    
+    elif pattern_type == "Protein Spiral":
+        create_protein_profiler()
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@instrument
+def create_spiral_matrix():
+    """Genomic matrix layouts: animated for small sizes, one heatmap image for large ones"""
+    st.markdown('<div class="algorithm-viz">', unsafe_allow_html=True)
+    
+    layout_col, size_col = st.columns([1, 2])
+    with layout_col:
+        layout = st.selectbox("Matrix Layout", list(MATRIX_LAYOUTS))
+    with size_col:
+        size = st.slider("Matrix Size", 3, 2000, 8)
+    
+    if size <= ANIMATED_MATRIX_LIMIT:
+        with span("genomic matrix: animation"):
+            frames = reveal_frames(MATRIX_LAYOUTS[layout](size))
+            fig = animated_heatmap_figure(frames, title=f"Genomic Matrix · {layout}", frame_duration=300,
+                                          show_values=size <= 12)
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        image = background_job("Genomic matrix", layout_image, layout, size)
+        if image is not None:
+            st.image(image,
+                     caption=f"{layout} ordering of a {size:,} × {size:,} matrix (light = first cell, purple = last)",
+                     use_container_width=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@instrument
+def create_fibonacci_sequence():
+    """Interactive gene expression sequence visualization"""
+    st.markdown('<div class="algorithm-viz">', unsafe_allow_html=True)
+    
+    seq_col1, seq_col2 = st.columns(2)
+    with seq_col1:
+        recurrence = st.selectbox("Expression Model:", list(RECURRENCE_PRESETS))
+    with seq_col2:
+        n = st.number_input("Number of terms:", 5, 100_000, 10)
+    
+    profile = background_job("Expression sequence", recurrence_profile, recurrence, int(n))
+    if profile is None:
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    coefficients, initial = RECURRENCE_PRESETS[recurrence]
+    indices, logs, (digits, leading, trailing), ratios, errors, limit = profile
+    
+    if n <= 20:
+        st.write(f"**Gene Expression Levels:** {linear_sequence(coefficients, initial, int(n))}")
+    else:
+        last = f"{leading}…{trailing}" if digits > 2 * len(leading) else leading
+        st.write(f"**Expression level #{n - 1:,}:** {last} ({digits:,} digits)")
+    
+    finite = np.isfinite(logs)
+    fig = animated_line_figure(
+        logs[finite], x=indices[finite],
+        title=f"{recurrence} Expression Sequence", y_title="log₁₀ Expression", frame_duration=100,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Show ratio convergence towards the dominant root
+    st.write(f"**Expression Ratio:** {ratios[-1]:.6f}")
+    st.write(f"**Expected Biological Ratio:** {limit:.6f}")
+    ratio_fig = go.Figure(go.Scatter(
+        x=np.arange(1, len(errors) + 1), y=np.where(errors > 0, errors, np.nan),
+        mode="lines+markers", line={"color": HIGHLIGHT_COLOR},
+    ))
+    ratio_fig.update_yaxes(type="log", title="|ratio − limit|")
+    ratio_fig.update_xaxes(title="Term")
+    ratio_fig.update_layout(title="Ratio Convergence", margin={"l": 40, "r": 20, "t": 50, "b": 40})
+    st.plotly_chart(ratio_fig, use_container_width=True)
+    st.caption("Errors below ~1e-15 reach double precision and are not drawn.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def demo_genome_path():
+    """Path of the demo genome, written once with three random chromosomes"""
+    if not DEMO_GENOME_PATH.exists():
+        rng = np.random.default_rng(0)
+        bases = np.frombuffer(b"ACGT", dtype=np.uint8)
+        records = [(name, bases[rng.integers(0, 4, length)].tobytes())
+                   for name, length in [("chr1", 2_000_000), ("chr2", 1_500_000), ("chr3", 1_000_000)]]
+        DEMO_GENOME_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = DEMO_GENOME_PATH.with_suffix(".tmp")
+        write_fasta(tmp, records)
+        tmp.replace(DEMO_GENOME_PATH)
+    return DEMO_GENOME_PATH
+
+def select_sequence_file(key, extra_sources=()):
+    """Sequence file picker shared by the genome views; returns an IndexedFasta, the chosen extra source or None"""
+    assets = {f"Assets/{path.name}": path for path in list_assets(SEQUENCE_SUFFIXES)}
+    source = st.selectbox("Sequence File:", [*extra_sources, "Demo Genome (4.5 Mb)", "Upload FASTA/FASTQ", *assets],
+                          key=f"{key}_source")
+    if source in extra_sources:
+        return source
+    if source == "Upload FASTA/FASTQ":
+        uploaded = st.file_uploader("Sequence file", type=[suffix.lstrip(".") for suffix in SEQUENCE_SUFFIXES],
+                                    key=f"{key}_file")
+        if uploaded is None:
+            st.info("📂 Upload an uncompressed FASTA or FASTQ file.")
+            return None
+        path = spool_upload(uploaded)
+    elif source in assets:
+        path = assets[source]
+    else:
+        path = demo_genome_path()
+    
+    try:
+        with st.spinner("🗂️ Indexing sequence file..."):
+            reader = open_indexed(path)
+    except (ValueError, OSError) as exc:
+        st.error(f"Could not index {Path(path).name}: {exc}")
+        return None
+    if not len(reader):
+        st.warning("No records found.")
+        return None
+    return reader
+
+@instrument
+def create_genome_browser():
+    """Random-access region viewer over an indexed, memory-mapped FASTA/FASTQ file"""
+    st.markdown('<div class="algorithm-viz">', unsafe_allow_html=True)
+    reader = select_sequence_file("browser")
+    if reader is None:
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    record_col, window_col, start_col = st.columns([2, 1, 1])
+    with record_col:
+        name = st.selectbox("Record:", reader.names, key="browser_record",
+                            format_func=lambda record: f"{record} ({reader.entries[record].length:,} bp)")
+    entry = reader.entries[name]
+    with window_col:
+        window = st.select_slider("Window (bp):", BROWSER_WINDOWS, value=600)
+    with start_col:
+        start = st.number_input("Start:", 1, max(1, entry.length), 1, step=window)
+    
+    region = reader.region(name, start - 1, start - 1 + window)
+    text = region.tobytes().decode("ascii", "replace")
+    end = start - 1 + len(region)
+    gc = np.isin(region, np.frombuffer(b"GCgc", dtype=np.uint8)).mean() if len(region) else 0.0
+    first_line, last_line = (start - 1) // entry.line_bases, max(start - 1, end - 1) // entry.line_bases
+    
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Records", f"{len(reader):,}")
+    metric_cols[1].metric("Region", f"{start:,}–{end:,}")
+    metric_cols[2].metric("GC Content", f"{100 * gc:.1f}%")
+    metric_cols[3].metric("File Bytes Read", f"{(last_line - first_line + 1) * entry.line_bytes:,}")
+    
+    st.code("\n".join(f"{start + offset:>12,}  {text[offset:offset + 60]}" for offset in range(0, len(text), 60)))
+    if entry.qual_offset is not None:
+        quality = reader.quality(name, start - 1, end)
+        st.caption(f"Mean Phred quality: {(quality.astype(float) - 33).mean():.1f}")
+        st.code(quality.tobytes().decode("ascii", "replace"))
+    st.caption(f"Index: {reader.path.name}.fai · the region is located by offset arithmetic and read from a "
+               "memory-mapped file, so only the pages shown are touched.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@instrument
+def create_genome_composition():
+    """Sliding-window GC content, GC skew and entropy with k-mer spectra, streamed in chunks"""
+    st.markdown('<div class="algorithm-viz">', unsafe_allow_html=True)
+    simulated = "Simulated Bacterial Genome (5 Mb)"
+    reader = select_sequence_file("composition", extra_sources=(simulated,))
+    if reader is None:
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    if reader == simulated:
+        source = (None, None, None)
+    else:
+        name = st.selectbox("Record:", reader.names, key="composition_record",
+                            format_func=lambda record: f"{record} ({reader.entries[record].length:,} bp)")
+        source = (str(reader.path), reader.path.stat().st_mtime_ns, name)
+    
+    window_col, step_col, k_col = st.columns(3)
+    with window_col:
+        window = st.select_slider("Window (bp):", [100, 500, 1_000, 5_000, 10_000, 50_000], value=5_000)
+    with step_col:
+        step = st.select_slider("Step (bp):", [50, 100, 500, 1_000, 5_000, 10_000], value=1_000)
+    with k_col:
+        k = st.slider("k-mer length:", 1, MAX_K, 8)
+    
+    with span("genome composition: submit scan"):
+        result = background_job("Genome scan", composition_scan, *source, window, step, k)
+    if result is None:
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Bases", f"{result.bases:,}")
+    metric_cols[1].metric("Windows", f"{len(result.starts):,}")
+    metric_cols[2].metric("Distinct k-mers", f"{result.distinct_kmers:,} / {4 ** k:,}")
+    metric_cols[3].metric("Scan Time", f"{result.seconds:.2f} s ({result.chunks} chunks)")
+    if not len(result.starts):
+        st.warning("The sequence is shorter than one window.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    windows = pd.DataFrame({
+        "GC content": result.gc,
+        "GC skew": result.skew,
+        "Cumulative GC skew": np.nancumsum(result.skew),
+        "Entropy (bits)": result.entropy,
+    }, index=pd.Index(result.starts + 1, name="Position"))
+    chart_col1, chart_col2 = st.columns(2)
+    for column, target in [("GC content", chart_col1), ("Entropy (bits)", chart_col2),
+                           ("GC skew", chart_col1), ("Cumulative GC skew", chart_col2)]:
+        with target:
+            st.markdown(f"**{column}** ({window:,} bp windows)")
+            st.line_chart(downsample_series(windows[column], DASHBOARD_POINTS))
+    st.caption("The cumulative GC skew minimum and maximum mark the likely replication origin and terminus.")
+    
+    spectrum_col, top_col = st.columns([3, 2])
+    with spectrum_col:
+        st.markdown(f"**{k}-mer spectrum**")
+        multiplicity = pd.Series(result.multiplicity, name="Distinct k-mers")
+        multiplicity.index.name = "Occurrences"
+        st.bar_chart(multiplicity.iloc[1:].loc[lambda counts: counts > 0].head(200))
+    with top_col:
+        st.markdown(f"**Most frequent {k}-mers**")
+        st.dataframe(pd.DataFrame(result.top_kmers, columns=["k-mer", "Count"]), use_container_width=True,
+                     hide_index=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@instrument
+def render_algorithms_page():
+    """Interactive algorithms page"""
+    st.markdown('<h2 class="section-header">🧬 Biotech Algorithm Visualizations</h2>', unsafe_allow_html=True)
+    
+    create_rotating_algorithm_viz()
+
+render_algorithms_page()
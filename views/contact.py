@@ -0,0 +1,102 @@
+"""Contact page: contact links and message form"""
+import math
+
+import streamlit as st
+
+from instrumentation import instrument
+from outbox import DUPLICATE, Outbox, TokenBucket
+from views.shared import tracked_button, visitor_id
+
+@st.cache_resource(show_spinner=False)
+def contact_outbox():
+    """Process-wide outbox; its delivery worker is shared by every session"""
+    return Outbox()
+
+@st.cache_resource(show_spinner=False)
+def contact_rate_limiter():
+    """Three messages per client, refilled over ten minutes"""
+    return TokenBucket(capacity=3, period=600)
+
+def client_key():
+    """Rate-limit key: the client IP when Streamlit knows it (not on localhost), else this session"""
+    # st.context.ip_address only exists in newer Streamlit releases
+    ip = getattr(st.context, "ip_address", None)
+    return f"ip:{ip}" if isinstance(ip, str) else f"session:{visitor_id()}"
+
+@st.fragment
+@instrument
+def create_contact_buttons():
+    """Contact method buttons"""
+    # Interactive contact buttons
+    contact_methods = [
+        ("📧 Send Email", "✉️ Email client opened! (mailto:ziyadabdelaal1@gmail.com)"),
+        ("💼 LinkedIn Profile", "🔗 LinkedIn opened in new tab!"),
+        ("💻 GitHub Portfolio", "🐱 GitHub profile opened!"),
+        ("📱 Schedule Call", "📅 Calendar booking opened!")
+    ]
+    
+    for button_text, success_msg in contact_methods:
+        if tracked_button(button_text, key=f"contact_{button_text}"):
+            st.success(success_msg)
+
+@st.fragment
+@instrument
+def create_contact_form():
+    """Quick message form; submitting reruns only the form"""
+    with st.form("contact_form"):
+        name = st.text_input("Your Name")
+        email = st.text_input("Your Email")
+        subject = st.selectbox("Subject", ["Research Inquiry", "Collaboration Opportunity", "Lab Partnership", "Other"])
+        message = st.text_area("Your Message")
+        
+        submitted = st.form_submit_button("🚀 Send Message")
+        
+        if submitted:
+            if not (name and email and message):
+                st.error("❌ Please fill in all required fields")
+                return
+            
+            # A resubmitted message costs no rate-limit token
+            outbox = contact_outbox()
+            if outbox.is_duplicate(email, subject, message):
+                st.info("📬 This message was already received, no need to send it again.")
+                return
+            
+            allowed, wait = contact_rate_limiter().allow(client_key())
+            if not allowed:
+                st.warning(f"⏳ Too many messages. Please try again in {math.ceil(wait / 60)} min.")
+                return
+            
+            # Only stored here; the outbox worker delivers it in the background
+            status, _ = outbox.submit(name, email, subject, message)
+            if status == DUPLICATE:
+                st.info("📬 This message was already received, no need to send it again.")
+                return
+            st.success("🎉 Message sent successfully!")
+            st.balloons()
+            
+            # Show confirmation details
+            with st.expander("📋 Message Details"):
+                st.write(f"**Name:** {name}")
+                st.write(f"**Email:** {email}")
+                st.write(f"**Subject:** {subject}")
+                st.write(f"**Message:** {message}")
+
+@instrument
+def render_contact_page():
+    """Interactive contact page"""
+    st.markdown('<h2 class="section-header">📬 Interactive Contact Hub</h2>', unsafe_allow_html=True)
+    
+    contact_col1, contact_col2 = st.columns([1, 1])
+    
+    with contact_col1:
+        st.markdown("### 📞 Connect With Me")
+        
+        create_contact_buttons()
+    
+    with contact_col2:
+        st.markdown("### 💌 Quick Message")
+        
+        create_contact_form()
+
+render_contact_page()
@@ -0,0 +1,95 @@
+"""Credentials page: a paged thumbnail gallery of the documents in Assets/"""
+import math
+from concurrent.futures import TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+from asset_store import asset_download_button, asset_title, list_assets
+from instrumentation import instrument
+from thumbnails import FAILED, PENDING, PREVIEW_WIDTH, READY
+from views.shared import page_renderer, tracked_button
+
+GRID_COLUMNS = 3
+GRID_ROWS = 2
+POLL_SECONDS = 0.5
+
+@st.dialog("📄 Document preview", width="large")
+def show_preview(path):
+    """Full-resolution pages, rendered only when a visitor opens a document"""
+    renderer = page_renderer()
+    st.markdown(f"### {asset_title(path)}")
+    try:
+        pages = renderer.pages(path)
+    except (OSError, ValueError, TimeoutError, BrokenProcessPool):
+        pages = 1
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    
+    with st.spinner("Rendering page..."):
+        status, data = renderer.render(path, page - 1, PREVIEW_WIDTH)
+    if status == READY:
+        st.image(data, use_container_width=True)
+    elif status == PENDING:
+        # The server is busy; a click reruns only this dialog, which picks up the finished render
+        st.info("⏳ This page is still rendering.")
+        tracked_button("🔄 Check again", key=f"preview-refresh-{path.name}")
+    else:
+        st.warning("Preview unavailable for this document, but it can still be downloaded.")
+    asset_download_button(path, key=f"preview-download-{path.name}")
+
+@st.fragment(run_every=POLL_SECONDS)
+def wait_for_thumbnails(requests):
+    """Poll the pending thumbnails of this grid page and redraw it once they are all rendered"""
+    renderer = page_renderer()
+    done = sum(renderer.request(path)[0] != PENDING for path in requests)
+    if done == len(requests):
+        st.rerun()
+    st.caption(f"⏳ Rendering thumbnails… {done}/{len(requests)}")
+
+@st.fragment
+@instrument
+def create_credential_gallery():
+    """Thumbnail grid; only the current grid page is rendered and sent, the next one is prefetched"""
+    documents = list_assets()
+    if not documents:
+        st.info("📄 Add PDF documents to the Assets folder to fill the gallery.")
+        return
+    
+    per_page = GRID_COLUMNS * GRID_ROWS
+    grid_pages = math.ceil(len(documents) / per_page)
+    grid_page = st.number_input(f"Page (of {grid_pages})", min_value=1, max_value=grid_pages, value=1) \
+        if grid_pages > 1 else 1
+    start = (grid_page - 1) * per_page
+    
+    renderer = page_renderer()
+    pending = []
+    columns = st.columns(GRID_COLUMNS)
+    for i, path in enumerate(documents[start:start + per_page]):
+        with columns[i % GRID_COLUMNS]:
+            status, data = renderer.request(path)
+            if status == READY:
+                st.image(data, use_container_width=True)
+            elif status == FAILED:
+                st.caption("🖼️ Preview unavailable")
+            else:
+                pending.append(path)
+                st.caption("⏳ Rendering preview…")
+            st.markdown(f"**{asset_title(path)}**")
+            if tracked_button("🔍 View", key=f"view-{path.name}"):
+                show_preview(path)
+    
+    # Warm the next grid page in the background; nothing of it is sent yet
+    for path in documents[start + per_page:start + 2 * per_page]:
+        renderer.request(path)
+    
+    if pending:
+        wait_for_thumbnails(pending)
+
+@instrument
+def render_credentials_page():
+    """Credential gallery page"""
+    st.markdown('<h2 class="section-header">🎓 Credentials</h2>', unsafe_allow_html=True)
+    st.markdown("Certificates, transcripts and awards. Open a document to see it at full resolution.")
+    create_credential_gallery()
+
+render_credentials_page()
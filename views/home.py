@@ -0,0 +1,118 @@
+"""Home page: profile, stats, achievements and credential downloads"""
+import streamlit as st
+
+from asset_store import list_assets, asset_download_button
+from image_store import image_rendition
+from instrumentation import instrument
+from views.shared import tracked_button
+
+@instrument
+def render_document_downloads():
+    """Render download buttons for the credential documents in Assets/"""
+    documents = list_assets()
+    if not documents:
+        st.info("📄 Add PDF documents to the Assets folder to enable downloads.")
+        return
+    
+    doc_cols = st.columns(3)
+    for i, path in enumerate(documents):
+        with doc_cols[i % 3]:
+            asset_download_button(path)
+
+@st.fragment
+@instrument
+def create_stats_dashboard():
+    """Clickable stat cards"""
+    stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+    
+    stats = [
+        ("3+", "Years Research", "🔬"),
+        ("10+", "Projects Completed", "🧪"),
+        ("5+", "Lab Techniques", "🧫"),
+        ("2", "Publications", "📝")
+    ]
+    
+    for i, (stat_col, (number, text, emoji)) in enumerate(zip([stat_col1, stat_col2, stat_col3, stat_col4], stats)):
+        with stat_col:
+            if tracked_button(f"{emoji} {number}", key=f"stat_{i}"):
+                st.balloons()
+            st.markdown(f"<p style='text-align: center; margin-top: 0.5rem;'>{text}</p>", unsafe_allow_html=True)
+
+@st.fragment
+@instrument
+def create_achievements():
+    """Clickable achievement list"""
+    achievements = [
+        "🥇 Biotech Hackathon Winner 2023",
+        "📝 Published 2 research papers",
+        "🌟 Presented at 3 conferences",
+        "🧬 Developed novel CRISPR pipeline",
+        "🔬 Mentored 5 junior researchers"
+    ]
+    
+    for achievement in achievements:
+        if tracked_button(achievement, key=f"achieve_{achievement}"):
+            st.success(f"Thanks for your interest in: {achievement}")
+
+@instrument
+def render_home_page():
+    """Render the home page with animations"""
+    # Header Section with rotating element
+    st.markdown(f"""
+    <div class="main-header">
+        <div class="rotating-element" style="display: inline-block; font-size: 2rem;">🧬</div>
+        <h1>🧪 Ziyad Abdelaal</h1>
+        <h3>Biotechnology Graduate & Researcher</h3>
+        <p>Advancing healthcare through innovative biotech solutions</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Profile Picture with hover effect
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        try:
+            st.image(image_rendition("Assets/profile.jpg", width=300), width=300, caption="Profile Picture")
+        except (FileNotFoundError, OSError):
+            st.markdown("""
+            <div style="text-align: center; padding: 2rem; background-color: #F5F5F5; border-radius: 10px; margin: 1rem 0;" class="pulse-animation">
+                <div style="font-size: 4rem;">🧪</div>
+                <p style="color: #666; margin-top: 1rem;">Profile Picture</p>
+                <small style="color: #999;">Add your profile.jpg to the Assets folder</small>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Interactive Quick Stats
+    st.markdown("### 📊 Biotech Stats Dashboard")
+    create_stats_dashboard()
+
+    # About Me Section
+    st.markdown('<h2 class="section-header">🙋‍♀️ About Me</h2>', unsafe_allow_html=True)
+    
+    about_col1, about_col2 = st.columns([2, 1])
+    
+    with about_col1:
+        st.markdown("""
+        Welcome to my biotech portfolio! I'm a dedicated Biotechnology graduate with over 3 years of experience 
+        in molecular biology, bioinformatics, and genomic data analysis. My passion lies in developing innovative solutions 
+        for healthcare and advancing scientific discovery.
+
+        **🎓 Education:**
+        - Master's in Biotechnology - MIT (2022)
+        - Bachelor's in Molecular Biology - UC San Diego (2020)
+
+        **🧪 Background:**
+        I've worked in academic labs and biotech startups, contributing to projects on gene editing, 
+        protein modeling, and genomic sequencing. My expertise includes CRISPR, bioinformatics pipelines, 
+        and data-driven biological insights.
+        """)
+    
+    with about_col2:
+        st.markdown("### 🏆 Achievements")
+        create_achievements()
+
+    # Credential documents served from the process-wide asset cache
+    st.markdown('<h2 class="section-header">📂 Credentials & Documents</h2>', unsafe_allow_html=True)
+    render_document_downloads()
+
+render_home_page()
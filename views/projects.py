@@ -0,0 +1,325 @@
+"""Projects page: CRISPR designer, genomic dashboard and protein chat"""
+import streamlit as st
+import hashlib
+from io import BytesIO
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from image_store import image_rendition
+from instrumentation import instrument
+from seqio import iter_fasta
+from crispr import MAX_MISMATCHES, design_guides, off_target_hits, open_index
+from differential import differential_expression
+from downsample import downsample_series
+from expression import EXPRESSION_SUFFIXES, expression_chunks, summarize_expression, synthetic_expression
+from protein_chat import GREETING, RESPONDERS, ResponseCache, normalize_prompt
+from views.shared import DASHBOARD_POINTS, EXAMPLE_DNA, random_genome_records, tracked_button
+
+CHAT_CACHE_SIZE = 256
+VOLCANO_GENE_COUNTS = [10_000, 100_000, 1_000_000]
+
+if 'chat_history' not in st.session_state:
+    st.session_state.chat_history = [{"role": "assistant", "content": GREETING}]
+
+@st.cache_resource(show_spinner="🗂️ Building k-mer index...", max_entries=4)
+def cached_kmer_index(reference_key, _records):
+    """Memory-mapped off-target index, built on disk once per reference"""
+    return open_index(reference_key, _records)
+
+@st.cache_data(show_spinner="🎯 Designing guides...", max_entries=16)
+def cached_guides(sequence, reference_key, _index, max_mismatches):
+    """Scored guides of a target sequence against one reference index"""
+    return design_guides(sequence, _index, max_mismatches=max_mismatches)
+
+@st.fragment
+@instrument
+def create_crispr_designer():
+    """Guide RNA design with seed-index off-target search"""
+    st.markdown("### 🎯 Guide RNA Designer")
+    target_col, reference_col = st.columns(2)
+    with target_col:
+        target_source = st.radio("Target:", ["Example Sequence", "Upload FASTA"], horizontal=True, key="crispr_target")
+        if target_source == "Upload FASTA":
+            uploaded = st.file_uploader("Target FASTA", type=["fasta", "fa", "fna", "txt"], key="crispr_target_file")
+            if uploaded is None:
+                st.info("📂 Upload a FASTA file with the region to target.")
+                return
+            records = list(iter_fasta(BytesIO(uploaded.getvalue())))
+            if not records:
+                st.warning("No sequences found.")
+                return
+            _, target = records[0]
+            target = target.decode("ascii", "replace")
+        else:
+            target = st.text_area("Target DNA", EXAMPLE_DNA, height=120, key="crispr_sequence")
+            target = "".join(record.decode("ascii", "replace") for _, record in iter_fasta(BytesIO(target.encode())))
+    with reference_col:
+        reference_source = st.radio("Reference:", ["Random 5 Mb Genome", "Upload Reference FASTA"], horizontal=True,
+                                    key="crispr_reference")
+        if reference_source == "Upload Reference FASTA":
+            reference = st.file_uploader("Reference FASTA", type=["fasta", "fa", "fna", "txt"],
+                                         key="crispr_reference_file")
+            if reference is None:
+                st.info("📂 Upload the genome to search for off-targets.")
+                return
+            data = reference.getvalue()
+            reference_key = hashlib.sha1(data).hexdigest()
+            
+            def reference_records():
+                return iter_fasta(BytesIO(data))
+        else:
+            reference_key = "random-genome"
+            reference_records = random_genome_records
+        max_mismatches = st.slider("Off-target mismatches:", 0, MAX_MISMATCHES, MAX_MISMATCHES)
+    
+    index = cached_kmer_index(reference_key, reference_records)
+    guides = cached_guides(target, reference_key, index, max_mismatches)
+    st.caption(f"Index: {len(index.sites):,} NGG/NAG sites on {index.bases:,} bp across "
+               f"{len(index.names):,} record(s)")
+    if not guides:
+        st.warning("No NGG/NAG PAM sites in the target sequence.")
+        return
+    
+    frame = pd.DataFrame(guides)
+    st.dataframe(frame, use_container_width=True, hide_index=True)
+    st.caption(f"Mean off-target query: {frame['Query ms'].mean():.2f} ms per guide · "
+               "a perfect match is counted as the target site itself when scoring specificity")
+    
+    guide = st.selectbox("Inspect guide:", frame["Guide"], key="crispr_guide")
+    hits = off_target_hits(index, guide, max_mismatches)
+    if hits:
+        st.dataframe(pd.DataFrame(hits), use_container_width=True, hide_index=True)
+    else:
+        st.success(f"No sites within {max_mismatches} mismatches in the reference.")
+
+@st.cache_data(show_spinner="📊 Reading expression matrix...", max_entries=4)
+def cached_expression_summary(source_key, _chunks):
+    """Incremental summaries of an expression matrix, cached per source"""
+    return summarize_expression(_chunks())
+
+@st.fragment
+@instrument
+def create_genomic_dashboard():
+    """Expression matrix dashboard: chunked reading, per-gene summaries and LTTB-downsampled charts"""
+    source = st.radio("Expression Data:", ["Demo Matrix (20,000 genes × 300 samples)", "Upload Matrix"],
+                      horizontal=True, key="expression_source")
+    if source == "Upload Matrix":
+        uploaded = st.file_uploader("Genes × samples matrix (first column: gene id)", type=list(EXPRESSION_SUFFIXES),
+                                    key="expression_file")
+        if uploaded is None:
+            st.info("📂 Upload a CSV, TSV or Parquet expression matrix.")
+            return
+        source_key = uploaded.file_id
+        
+        def chunks():
+            uploaded.seek(0)
+            return expression_chunks(uploaded, uploaded.name)
+    else:
+        source_key = "demo-matrix"
+        chunks = synthetic_expression
+    
+    try:
+        summary = cached_expression_summary(source_key, chunks)
+    except (ValueError, OSError, ImportError) as exc:
+        # ImportError: a Parquet upload on a deployment without pyarrow
+        st.error(f"Could not read the matrix: {exc}")
+        return
+    
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Genes", f"{len(summary.genes):,}")
+    metric_cols[1].metric("Samples", f"{len(summary.library_sizes):,}")
+    metric_cols[2].metric("Chunks Read", summary.chunks)
+    metric_cols[3].metric("Read Time", f"{summary.seconds:.2f} s")
+    
+    chart_col1, chart_col2 = st.columns(2)
+    with chart_col1:
+        st.markdown("**Mean expression by gene rank**")
+        ranked = summary.genes["Mean"].sort_values(ascending=False).reset_index(drop=True)
+        ranked.index += 1
+        st.line_chart(downsample_series(ranked, DASHBOARD_POINTS))
+    with chart_col2:
+        st.markdown("**Library size per sample**")
+        sizes = summary.library_sizes.reset_index(drop=True)
+        sizes.index += 1
+        st.line_chart(downsample_series(sizes, DASHBOARD_POINTS))
+    
+    gene = st.selectbox("Highly variable gene:", summary.top_genes.index, key="expression_gene")
+    profile = summary.top_genes.loc[gene].astype(float).reset_index(drop=True)
+    profile.index += 1
+    st.line_chart(downsample_series(profile.rename(str(gene)), DASHBOARD_POINTS))
+    st.caption(f"Series longer than {DASHBOARD_POINTS:,} points are reduced with "
+               "Largest-Triangle-Three-Buckets before plotting.")
+    
+    st.dataframe(summary.genes.loc[summary.top_genes.index].round(3), use_container_width=True)
+    
+    create_differential_expression(source_key, chunks, list(summary.library_sizes.index))
+
+@st.cache_data(show_spinner="🌋 Testing genes...", max_entries=8)
+def cached_differential(source_key, _chunks, group_b):
+    """Welch tests and BH FDR for one matrix and sample grouping"""
+    return differential_expression(_chunks(), group_b)
+
+@instrument
+def create_volcano_plot(table, fdr, min_log2fc):
+    """WebGL volcano plot; only significant genes carry hover labels to keep the payload small"""
+    log2fc = table["log2FC"].to_numpy(dtype=np.float32)
+    neg_log_p = -np.log10(np.clip(table["p"].to_numpy(), 1e-300, 1.0)).astype(np.float32)
+    significant = (table["q"].to_numpy() < fdr) & (np.abs(log2fc) >= min_log2fc)
+    groups = [
+        ("Not significant", ~significant, "#BDBDBD"),
+        ("Up", significant & (log2fc > 0), "#7B1FA2"),
+        ("Down", significant & (log2fc < 0), "#26A69A"),
+    ]
+    fig = go.Figure()
+    for name, mask, color in groups:
+        labelled = name != "Not significant"
+        fig.add_trace(go.Scattergl(
+            x=log2fc[mask], y=neg_log_p[mask], mode="markers", name=f"{name} ({int(mask.sum()):,})",
+            marker=dict(size=4 if labelled else 3, color=color, opacity=0.8 if labelled else 0.4),
+            text=table.index[mask] if labelled else None,
+            hovertemplate="%{text}<br>log2FC %{x:.2f}<br>-log10 p %{y:.1f}<extra></extra>" if labelled else None,
+            hoverinfo=None if labelled else "skip",
+        ))
+    fig.add_vline(x=min_log2fc, line_dash="dot", line_color="gray")
+    fig.add_vline(x=-min_log2fc, line_dash="dot", line_color="gray")
+    fig.update_layout(title=f"Volcano plot ({len(table):,} genes)", xaxis_title="log2 fold change (B / A)",
+                      yaxis_title="-log10 p", height=500)
+    return fig
+
+@instrument
+def create_differential_expression(source_key, chunks, samples):
+    """Two-group differential expression with a WebGL volcano plot"""
+    st.markdown("### 🌋 Differential Expression")
+    data = st.radio("Data:", ["Current Matrix", "Simulated 6 vs 6 Experiment"], horizontal=True, key="de_source")
+    if data == "Simulated 6 vs 6 Experiment":
+        genes = st.select_slider("Genes:", VOLCANO_GENE_COUNTS, value=100_000, key="de_genes")
+        source_key = f"simulated-{genes}"
+        samples = [f"sample_{k + 1}" for k in range(12)]
+        
+        def chunks():
+            return synthetic_expression(genes, 12, chunk_rows=100_000)
+        split = 6
+    else:
+        if len(samples) < 4:
+            st.info("Differential expression needs at least four samples.")
+            return
+        split = st.slider("Group A = first N samples:", 2, len(samples) - 2, len(samples) // 2, key="de_split")
+    
+    threshold_col1, threshold_col2 = st.columns(2)
+    with threshold_col1:
+        fdr = st.select_slider("FDR:", [0.001, 0.01, 0.05, 0.1], value=0.05, key="de_fdr")
+    with threshold_col2:
+        min_log2fc = st.slider("Minimum |log2FC|:", 0.0, 3.0, 1.0, step=0.25, key="de_log2fc")
+    
+    try:
+        result = cached_differential(source_key, chunks, tuple(samples[split:]))
+    except ValueError as exc:
+        st.error(f"Could not test the groups: {exc}")
+        return
+    table = result.table
+    st.plotly_chart(create_volcano_plot(table, fdr, min_log2fc), use_container_width=True)
+    
+    hits = table[(table["q"] < fdr) & (table["log2FC"].abs() >= min_log2fc)]
+    st.caption(f"{len(result.group_a)} vs {len(result.group_b)} samples · {len(table):,} genes tested in "
+               f"{result.seconds:.2f} s · {len(hits):,} significant at FDR {fdr:g}")
+    st.dataframe(hits.sort_values("q").head(200).round(4), use_container_width=True)
+
+@st.cache_resource(show_spinner=False)
+def chat_response_cache():
+    """Answer cache shared by every session of this process"""
+    return ResponseCache(CHAT_CACHE_SIZE)
+
+@st.fragment
+@instrument
+def create_protein_chat():
+    """Protein modeling chat with session history, streamed answers and a shared response cache"""
+    st.markdown("### 🤖 Protein Modeling AI")
+    cache = chat_response_cache()
+    responder_col, clear_col = st.columns([3, 1])
+    with responder_col:
+        responder = st.selectbox("Responder:", list(RESPONDERS), key="chat_responder")
+    with clear_col:
+        if tracked_button("🧹 Clear Chat", key="chat_clear"):
+            st.session_state.chat_history = [{"role": "assistant", "content": GREETING}]
+    
+    for message in st.session_state.chat_history:
+        st.chat_message(message["role"]).markdown(message["content"])
+    
+    prompt = st.chat_input("Ask about protein structure, or paste a sequence...", key="chat_prompt")
+    if prompt:
+        st.session_state.chat_history.append({"role": "user", "content": prompt})
+        st.chat_message("user").markdown(prompt)
+        key = (responder, normalize_prompt(prompt))
+        with st.chat_message("assistant"):
+            answer = cache.get(key)
+            if answer is not None:
+                st.markdown(answer)
+            else:
+                tokens = RESPONDERS[responder](prompt, st.session_state.chat_history)
+                answer = st.write_stream(cache.stream(key, tokens))
+        st.session_state.chat_history.append({"role": "assistant", "content": answer})
+    
+    info = cache.info()
+    st.caption(f"Response cache: {info.currsize}/{info.maxsize} answers · {info.hits} hits · {info.misses} misses "
+               "(shared across sessions)")
+
+@st.fragment
+@instrument
+def create_project_links():
+    """Demo, code and feature buttons of the CRISPR project card"""
+    if tracked_button("🚀 View Live Demo", key="demo1"):
+        st.success("🎉 Demo launched! (This would open in a new tab)")
+        st.balloons()
+    
+    if tracked_button("📋 View Code", key="code1"):
+        st.info("📂 GitHub repository opened! (This would redirect to GitHub)")
+    
+    # Interactive feature showcase
+    if tracked_button("⚡ Show Interactive Features", key="features1"):
+        features = [
+            "✅ Real-time sequence analysis",
+            "✅ Off-target prediction",
+            "✅ Guide RNA design",
+            "✅ Visualization of cut sites"
+        ]
+        for feature in features:
+            st.write(feature)
+
+@instrument
+def render_projects_page():
+    """Render interactive projects page"""
+    st.markdown('<h2 class="section-header">🧪 Biotech Project Showcase</h2>', unsafe_allow_html=True)
+    
+    project_tabs = st.tabs(["🧬 CRISPR Tool", "📊 Genomic Dashboard", "🤖 Protein AI"])
+    
+    with project_tabs[0]:
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            try:
+                st.image(image_rendition("Assets/project1.jpg", width=300), caption="CRISPR Analysis Tool")
+            except (FileNotFoundError, OSError):
+                st.markdown("""
+                <div style="text-align: center; padding: 3rem 1rem; background-color: #F5F5F5; border-radius: 8px; margin: 1rem 0;" class="pulse-animation">
+                    <div style="font-size: 3rem;">🧬</div>
+                    <p style="color: #666; margin: 0.5rem 0;">CRISPR Analysis Tool</p>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown("### 🧬 CRISPR Analysis Tool")
+            st.markdown("**Technologies:** Python, Biopython, Streamlit, Pandas")
+            
+            create_project_links()
+        
+        create_crispr_designer()
+
+    with project_tabs[1]:
+        st.markdown("### 📊 Genomic Data Visualization")
+        create_genomic_dashboard()
+
+    with project_tabs[2]:
+        create_protein_chat()
+
+render_projects_page()
@@ -0,0 +1,126 @@
+"""Demo inputs, upload handling, analytics tracking and background jobs shared by several pages"""
+import hashlib
+import uuid
+from concurrent.futures import wait
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from analytics import CLICK, SESSION_START, EventStore
+from asset_store import APP_DIR
+from jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobScheduler
+from thumbnails import PageRenderer
+
+DASHBOARD_POINTS = 1000
+UPLOAD_DIR = APP_DIR / ".cache" / "uploads"
+JOB_INLINE_SECONDS = 0.25
+JOB_POLL_SECONDS = 0.5
+
+EXAMPLE_DNA = (
+    ">insulin_cds Human preproinsulin coding sequence\n"
+    "ATGGCCCTGTGGATGCGCCTCCTGCCCCTGCTGGCGCTGCTGGCCCTCTGGGGACCTGACCCAGCCGCAGCCTTTGTGAACCAACACCTGTGCGGCTCACACCTGGTGGAAGCTCTCTACCTAGTGTGCGGGGAACGAGGCTTCTTCTACACACCCAAGACCCGCCGGGAGGCAGAGGACCTGCAGGTGGGGCAGGTGGAGCTGGGCGGGGGCCCTGGTGCAGGCAGCCTGCAGCCCTTGGCCCTGGAGGGGTCCCTGCAGAAGCGTGGCATTGTGGAACAATGCTGTACCAGCATCTGCTCCCTCTACCAGCTGGAGAACTACTGCAACTAG"
+)
+
+EXAMPLE_PROTEINS = {
+    "Hemoglobin α (human)": "MVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHFDLSHGSAQVKGHGKKVADALTNAVAHVDDMPNALSALSDLHAHKLRVDPVNFKLLSHCLLVTLAAHLPAEFTPAVHASLDKFLASVSTVLTSKYR",
+    "Hemoglobin β (human)": "MVHLTPEEKSAVTALWGKVNVDEVGGEALGRLLVVYPWTQRFFESFGDLSTPDAVMGNPKVKAHGKKVLGAFSDGLAHLDNLKGTFATLSELHCDKLHVDPENFRLLGNVLVCVLAHHFGKEFTPPVQAAYQKVVAGVANALAHKYH",
+}
+
+def random_genome_records():
+    """Reproducible 5 Mb random genome used as demo input"""
+    genome = np.frombuffer(b"ACGT", dtype=np.uint8)[np.random.default_rng(0).integers(0, 4, 5_000_000)]
+    return iter([("random_genome", genome.tobytes())])
+
+def spool_upload(uploaded):
+    """Store an uploaded file under its content hash so it can be memory-mapped and indexed"""
+    data = uploaded.getvalue()
+    path = UPLOAD_DIR / f"{hashlib.sha1(data).hexdigest()}{Path(uploaded.name).suffix.lower()}"
+    if not path.exists():
+        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    return path
+
+@st.cache_resource(show_spinner=False)
+def analytics_store():
+    """Process-wide analytics event store; its writer thread is shared by every session"""
+    return EventStore()
+
+def visitor_id():
+    """Anonymous id of this browser session, recording the session start on first use"""
+    if "visitor_id" not in st.session_state:
+        st.session_state.visitor_id = uuid.uuid4().hex
+        analytics_store().record(SESSION_START, "", st.session_state.visitor_id)
+    return st.session_state.visitor_id
+
+def track(kind, name):
+    """Queue an analytics event; never blocks the rerun"""
+    analytics_store().record(kind, name, visitor_id())
+
+def tracked_button(label, **kwargs):
+    """st.button that records a click event when pressed"""
+    clicked = st.button(label, **kwargs)
+    if clicked:
+        track(CLICK, label)
+    return clicked
+
+@st.cache_resource(show_spinner=False)
+def job_scheduler():
+    """Process-wide job pool; its workers are shared by every session"""
+    return JobScheduler()
+
+@st.cache_resource(show_spinner=False)
+def page_renderer():
+    """Process-wide document page renderer; it rasterizes on the job pool"""
+    return PageRenderer(job_scheduler())
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(label):
+    """Progress bar and cancel button of a running job; reruns the app once the job has finished"""
+    job = st.session_state.get("jobs", {}).get(label)
+    if job is None or job.status not in (QUEUED, RUNNING):
+        st.rerun()
+    text = "waiting for a free worker" if job.status == QUEUED else job.message or "working"
+    st.progress(min(1.0, max(0.0, job.progress)), text=f"⚙️ {label}: {text} ({job.elapsed():.1f} s)")
+    if tracked_button("✖ Cancel", key=f"cancel_job_{label}"):
+        job_scheduler().cancel(job)
+        st.rerun()
+
+def background_job(label, func, *args):
+    """Result of `func(*args)` computed in the job pool, or None while it runs, after it failed or was cancelled.
+
+    The job handle is kept in session state under `label`, so reruns poll the same job, and changed
+    arguments cancel it and submit a new one. Quick jobs are waited for briefly so they render in the
+    same rerun; longer ones show a progress fragment with a cancel button.
+    """
+    scheduler = job_scheduler()
+    handles = st.session_state.setdefault("jobs", {})
+    job = handles.get(label)
+    if job is None or job.key != scheduler.key(func, args):
+        if job is not None:
+            scheduler.cancel(job)
+        job = scheduler.submit(visitor_id(), func, *args, label=label)
+        if job is None:
+            handles.pop(label, None)
+            st.warning(f"⏳ You already have {scheduler.per_owner} computations running. "
+                       "Cancel one or wait for it to finish.")
+            return None
+        handles[label] = job
+        wait([job.future], timeout=JOB_INLINE_SECONDS)
+    
+    status = job.status
+    if status == DONE:
+        return job.result()
+    if status in (FAILED, CANCELLED):
+        if status == FAILED:
+            st.error(f"❌ {label} failed: {job.error}")
+        else:
+            st.info(f"✖ {label} was cancelled.")
+        if tracked_button("🔁 Run again", key=f"retry_job_{label}"):
+            del handles[label]
+            return background_job(label, func, *args)
+        return None
+    job_progress(label)
+    return None
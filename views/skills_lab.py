@@ -0,0 +1,73 @@
+"""Skills Lab page: skill dashboard and knowledge quiz"""
+import streamlit as st
+
+from instrumentation import instrument
+from views.shared import tracked_button
+
+@st.fragment
+@instrument
+def create_interactive_skills():
+    """Interactive skills section with progress bars and animations"""
+    st.markdown('<h2 class="section-header">🧪 Biotech Skills Dashboard</h2>', unsafe_allow_html=True)
+    
+    skills_data = {
+        "Biotech Techniques": {"CRISPR": 90, "PCR": 95, "Gel Electrophoresis": 88, "Microscopy": 85},
+        "Bioinformatics": {"Python": 92, "R": 88, "Bioconductor": 85, "BLAST": 80},
+        "Data Analysis": {"Genomic Analysis": 90, "Proteomics": 88, "Statistics": 85, "Machine Learning": 82},
+        "Lab Technologies": {"NGS": 85, "Flow Cytometry": 80, "Mass Spectrometry": 82, "qPCR": 88}
+    }
+    
+    selected_category = st.selectbox("Select Skill Category:", list(skills_data.keys()))
+    
+    # Animate skill bars
+    for skill, level in skills_data[selected_category].items():
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"**{skill}**")
+            st.progress(level / 100)
+        with col2:
+            st.metric("Proficiency", f"{level}%")
+
+@st.fragment
+@instrument
+def create_quiz():
+    """Biotech knowledge quiz; answering reruns only the quiz"""
+    st.markdown("### 🎯 Biotech Knowledge Quiz")
+    
+    questions = {
+        "What is the primary function of CRISPR-Cas9?": {
+            "options": ["Protein synthesis", "Gene editing", "DNA replication", "RNA transcription"],
+            "correct": "Gene editing"
+        },
+        "Which tool is used for sequence alignment?": {
+            "options": ["BLAST", "Photoshop", "Excel", "TensorFlow"],
+            "correct": "BLAST"
+        },
+        "What does NGS stand for?": {
+            "options": ["Next-Generation Sequencing", "Neural Gene Synthesis", "Nano Growth System", "New Genomic Standard"],
+            "correct": "Next-Generation Sequencing"
+        }
+    }
+    
+    question = st.selectbox("Choose a question:", list(questions.keys()))
+    answer = st.radio("Your answer:", questions[question]["options"])
+    
+    if tracked_button("Submit Answer", key="quiz_submit"):
+        if answer == questions[question]["correct"]:
+            st.success("🎉 Correct! Well done!")
+            st.balloons()
+        else:
+            st.error(f"❌ Incorrect. The correct answer is: {questions[question]['correct']}")
+
+@instrument
+def render_skills_lab():
+    """Interactive skills laboratory"""
+    st.markdown('<h2 class="section-header">🔬 Biotech Skills Laboratory</h2>', unsafe_allow_html=True)
+    
+    create_interactive_skills()
+    
+    # Add interactive quiz section
+    st.markdown("---")
+    create_quiz()
+
+render_skills_lab()